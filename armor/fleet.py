@@ -0,0 +1,158 @@
+# armor/fleet.py
+# Frota de armaduras em struct-of-arrays (NumPy): uma coluna por atributo,
+# uma linha por armadura. Operações em lote sem laço Python por armadura.
+import math
+
+import numpy as np
+
+from armor.mark_base import MarkBase
+from armor.mark_2 import MarkII
+from armor.mark_3 import MarkIII
+from armor.mark_4 import MarkIV
+from armor.mark_5 import MarkV
+
+MODEL_CLASSES = [MarkII, MarkIII, MarkIV, MarkV]
+NUMERIC_TRAITS = ("flight_stability", "energy_efficiency", "deploy_time")
+
+# Um protótipo por modelo: os traços vêm das próprias classes
+_PROTOTYPES = [cls() for cls in MODEL_CLASSES]
+MODEL_NAMES = [p.name for p in _PROTOTYPES]
+MODEL_VERSIONS = [p.version for p in _PROTOTYPES]
+TRAIT_TABLE = {
+    trait: np.array([getattr(p, trait, math.nan) for p in _PROTOTYPES], dtype=np.float64)
+    for trait in NUMERIC_TRAITS
+}
+
+
+def model_code(model):
+    """Código do modelo a partir do nome ("Mark V"), classe ou código"""
+    if isinstance(model, str):
+        return MODEL_NAMES.index(model)
+    if isinstance(model, type):
+        return MODEL_CLASSES.index(model)
+    return int(model)
+
+
+class ArmorFleet:
+    def __init__(self, models):
+        self.model = np.asarray(models, dtype=np.uint8)
+        n = len(self.model)
+        self.energy_level = np.full(n, 100.0)
+        self.integrity = np.full(n, 100.0)
+        self.active = np.zeros(n, dtype=bool)
+        for trait, table in TRAIT_TABLE.items():
+            setattr(self, trait, table[self.model])
+
+    @classmethod
+    def build(cls, counts):
+        """ArmorFleet.build({"Mark II": 1000, MarkV: 500})"""
+        codes = [np.full(int(n), model_code(m), dtype=np.uint8) for m, n in counts.items()]
+        return cls(np.concatenate(codes) if codes else np.empty(0, dtype=np.uint8))
+
+    def __len__(self):
+        return len(self.model)
+
+    def select(self, model=None, active=None):
+        """Máscara booleana por modelo e/ou estado"""
+        mask = np.ones(len(self), dtype=bool)
+        if model is not None:
+            mask &= self.model == model_code(model)
+        if active is not None:
+            mask &= self.active == bool(active)
+        return mask
+
+    # Operações em lote (idx: None = todas, máscara booleana ou índices)
+    def activate(self, idx=None):
+        sel = slice(None) if idx is None else idx
+        changed = int(np.count_nonzero(~self.active[sel]))
+        self.active[sel] = True
+        return changed
+
+    def deactivate(self, idx=None):
+        sel = slice(None) if idx is None else idx
+        changed = int(np.count_nonzero(self.active[sel]))
+        self.active[sel] = False
+        return changed
+
+    def consume_energy(self, amount, idx=None):
+        """Mesmo comportamento do MarkBase: energia não fica negativa"""
+        if idx is None:
+            np.subtract(self.energy_level, amount, out=self.energy_level)
+            np.maximum(self.energy_level, 0.0, out=self.energy_level)
+        else:
+            self.energy_level[idx] = np.maximum(self.energy_level[idx] - amount, 0.0)
+
+    def status(self):
+        """Resumo por modelo (agregado com bincount, sem laço por armadura)"""
+        k = len(MODEL_CLASSES)
+        total = np.bincount(self.model, minlength=k)
+        active = np.bincount(self.model, weights=self.active, minlength=k)
+        energy = np.bincount(self.model, weights=self.energy_level, minlength=k)
+        integrity = np.bincount(self.model, weights=self.integrity, minlength=k)
+        depleted = np.bincount(self.model, weights=self.energy_level <= 0, minlength=k)
+        resumo = {}
+        for code in np.flatnonzero(total):
+            n = total[code]
+            resumo[MODEL_NAMES[code]] = {
+                "Armaduras": int(n),
+                "Ativas": int(active[code]),
+                "Energia média (%)": round(float(energy[code] / n), 2),
+                "Integridade média (%)": round(float(integrity[code] / n), 2),
+                "Sem energia": int(depleted[code])
+            }
+        return resumo
+
+    def view(self, index):
+        return SuitView(self, index)
+
+    def __getitem__(self, index):
+        return self.view(index)
+
+
+class SuitView(MarkBase):
+    """Uma armadura da frota com a interface do MarkBase (lê/escreve nos arrays)"""
+
+    def __init__(self, fleet, index):
+        if not -len(fleet) <= index < len(fleet):
+            raise IndexError(f"armadura {index} fora da frota ({len(fleet)})")
+        self._fleet = fleet
+        self._index = index % len(fleet)
+        code = int(fleet.model[self._index])
+        self.name = MODEL_NAMES[code]
+        self.version = MODEL_VERSIONS[code]
+        self._prototype = _PROTOTYPES[code]
+
+    @property
+    def energy_level(self):
+        return float(self._fleet.energy_level[self._index])
+
+    @energy_level.setter
+    def energy_level(self, value):
+        self._fleet.energy_level[self._index] = value
+
+    @property
+    def integrity(self):
+        return float(self._fleet.integrity[self._index])
+
+    @integrity.setter
+    def integrity(self, value):
+        self._fleet.integrity[self._index] = value
+
+    @property
+    def active(self):
+        return bool(self._fleet.active[self._index])
+
+    @active.setter
+    def active(self, value):
+        self._fleet.active[self._index] = bool(value)
+
+    def __getattr__(self, attr):
+        # Traços só existem nos modelos que os definem (como nas classes)
+        if attr in NUMERIC_TRAITS:
+            value = float(getattr(self._fleet, attr)[self._index])
+            if not math.isnan(value):
+                return value
+        elif not attr.startswith("_") and hasattr(self._prototype, attr):
+            value = getattr(self._prototype, attr)
+            return list(value) if isinstance(value, list) else value
+        raise AttributeError(f"{self.__dict__.get('name', 'armadura')} não possui '{attr}'")
@@ -0,0 +1,108 @@
+# benchmarks/harness.py
+# ============================================================
+# MINI HARNESS DE BENCHMARK (ESTILO pytest-benchmark, OFFLINE)
+# ============================================================
+# - benchmark(fn) mede várias rodadas após aquecimento
+# - Estatísticas em microssegundos: min, mediana, média, p95, ops/s
+# - Relatório JSON + comparação com limites e com baseline
+# ============================================================
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class Benchmark:
+    """Coleta resultados de vários casos de benchmark"""
+
+    def __init__(self, min_time: float = 0.2, max_rounds: int = 10000, warmup: int = 5):
+        self.min_time = min_time
+        self.max_rounds = max_rounds
+        self.warmup = warmup
+        self.results: Dict[str, Dict] = {}
+
+    def __call__(self, name: str, fn: Callable[[], object],
+                 setup: Optional[Callable[[], object]] = None,
+                 rounds: Optional[int] = None, group: str = "") -> Dict:
+        """Mede fn(); setup (opcional) roda antes de cada rodada, fora do tempo"""
+        for _ in range(self.warmup):
+            if setup:
+                setup()
+            fn()
+
+        timings: List[float] = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            deadline = time.perf_counter() + self.min_time
+            while True:
+                if setup:
+                    setup()
+                t0 = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - t0)
+                if rounds is not None:
+                    if len(timings) >= rounds:
+                        break
+                elif time.perf_counter() >= deadline or len(timings) >= self.max_rounds:
+                    break
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        timings.sort()
+        us = [t * 1e6 for t in timings]
+        result = {
+            "group": group,
+            "rounds": len(us),
+            "min_us": round(us[0], 3),
+            "median_us": round(statistics.median(us), 3),
+            "mean_us": round(statistics.fmean(us), 3),
+            "p95_us": round(us[min(len(us) - 1, int(len(us) * 0.95))], 3),
+            "max_us": round(us[-1], 3),
+            "ops_per_second": round(1e6 / statistics.fmean(us), 1) if us[0] > 0 else None
+        }
+        self.results[name] = result
+        return result
+
+    # ======================= RELATÓRIO ======================
+
+    def report(self) -> Dict:
+        return {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "results": self.results
+        }
+
+    def check(self, thresholds: Dict[str, float], baseline: Optional[Dict] = None,
+              tolerance: float = 0.25) -> List[str]:
+        """Lista de regressões: mediana acima do limite ou do baseline + tolerância"""
+        failures = []
+        for name, result in self.results.items():
+            limit = thresholds.get(name)
+            if limit is not None and result["median_us"] > limit:
+                failures.append(f"{name}: mediana {result['median_us']}us > limite {limit}us")
+            if baseline:
+                old = baseline.get("results", {}).get(name)
+                if old and result["median_us"] > old["median_us"] * (1 + tolerance):
+                    failures.append(
+                        f"{name}: mediana {result['median_us']}us > baseline "
+                        f"{old['median_us']}us (+{int(tolerance * 100)}%)")
+        return failures
+
+    def print_table(self, file=sys.stdout):
+        width = max((len(n) for n in self.results), default=10)
+        print(f"{'caso':<{width}}  {'mediana':>12}  {'p95':>12}  {'ops/s':>12}", file=file)
+        for name, r in self.results.items():
+            print(f"{name:<{width}}  {r['median_us']:>10.2f}us  {r['p95_us']:>10.2f}us  "
+                  f"{r['ops_per_second'] or 0:>12.1f}", file=file)
+
+
+def load_json(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,194 @@
+# benchmarks/loadgen.py
+# ============================================================
+# GERADOR DE CARGA DO SERVIDOR MULTISSESSÃO
+# ============================================================
+# - N conexões simultâneas (uma sessão cada), M comandos por
+#   sessão com intervalo configurável (respeita o token bucket)
+# - Latência = ida e volta medida no cliente, por comando
+# - Relatório: p50/p90/p99/p999, vazão e rejeitados
+# - --spawn sobe `davi.py --serve` num subprocesso (porta livre)
+#
+#   python -m benchmarks.loadgen --spawn --sessions 2000 --commands 10
+#   python -m benchmarks.loadgen --connect 127.0.0.1:8765
+# ============================================================
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+COMMANDS = ["status", "luz ligar 70", "emoção", "luz", "luz desligar", "ajuda",
+            "o que é relatividade", "oi", "integridade", "stauts"]
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def raise_fd_limit(wanted: int):
+    """Cada sessão é um socket (dois, com --spawn na mesma máquina)"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < wanted:
+        target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+async def open_connection(address: str):
+    if address.startswith("unix:"):
+        return await asyncio.open_unix_connection(address[len("unix:"):])
+    host, _, port = address.rpartition(":")
+    return await asyncio.open_connection(host or "127.0.0.1", int(port))
+
+
+async def client(address: str, commands: int, interval: float, start_gate: asyncio.Event,
+                 connect_slots: asyncio.Semaphore, results: Dict):
+    async with connect_slots:
+        try:
+            reader, writer = await open_connection(address)
+            hello = json.loads(await reader.readline())
+        except (OSError, ValueError):
+            results["connect_errors"] += 1
+            return
+    if "session" not in hello:
+        results["connect_errors"] += 1
+        writer.close()
+        return
+    results["connected"] += 1
+
+    await start_gate.wait()
+    # Espalha as sessões no primeiro intervalo (sem rajada sincronizada)
+    await asyncio.sleep(random.uniform(0, interval))
+    try:
+        for i in range(commands):
+            cmd = random.choice(COMMANDS)
+            t0 = time.perf_counter()
+            writer.write(json.dumps({"cmd": cmd, "id": i}).encode("utf-8") + b"\n")
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            results["latencies"].append(time.perf_counter() - t0)
+            results["server_ms"].append(reply.get("elapsed_ms", 0.0))
+            if reply.get("rejected"):
+                results["rejected"] += 1
+            if interval:
+                await asyncio.sleep(interval * random.uniform(0.8, 1.2))
+    except (OSError, ValueError):
+        results["errors"] += 1
+    finally:
+        writer.close()
+
+
+async def run_load(address: str, sessions: int, commands: int, interval: float,
+                   connect_concurrency: int = 256) -> Dict:
+    results = {"connected": 0, "connect_errors": 0, "errors": 0, "rejected": 0,
+               "latencies": [], "server_ms": []}
+    gate = asyncio.Event()
+    slots = asyncio.Semaphore(connect_concurrency)
+    tasks = [asyncio.ensure_future(client(address, commands, interval, gate, slots, results))
+             for _ in range(sessions)]
+
+    # Todas conectadas antes de medir: a carga é concorrente de verdade
+    t_connect = time.perf_counter()
+    while results["connected"] + results["connect_errors"] < sessions:
+        await asyncio.sleep(0.01)
+    connect_s = time.perf_counter() - t_connect
+
+    started = time.perf_counter()
+    gate.set()
+    await asyncio.gather(*tasks)
+    total = time.perf_counter() - started
+
+    latencies = sorted(results["latencies"])
+    server_ms = sorted(results["server_ms"])
+    done = len(latencies)
+    return {
+        "sessions": sessions,
+        "connected": results["connected"],
+        "connect_errors": results["connect_errors"],
+        "connect_seconds": round(connect_s, 3),
+        "commands": done,
+        "rejected": results["rejected"],
+        "errors": results["errors"],
+        "seconds": round(total, 3),
+        "commands_per_second": round(done / total, 1) if total > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "p999_ms": round(percentile(latencies, 0.999) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "server_p50_ms": round(percentile(server_ms, 0.50), 4),
+        "server_p99_ms": round(percentile(server_ms, 0.99), 4)
+    }
+
+
+def spawn_server(extra: List[str]):
+    """Sobe `davi.py --serve` numa porta livre; devolve (processo, endereço)"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(root, "davi.py"), "--serve", "127.0.0.1:0"] + extra,
+        cwd=root, stdout=subprocess.PIPE, text=True
+    )
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("servidor encerrou antes de ouvir")
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue  # avisos de inicialização
+        if event.get("event") == "listening":
+            return proc, event["address"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Carga no servidor multissessão do DARVIS")
+    parser.add_argument("--connect", metavar="ENDEREÇO", help="HOST:PORTA ou unix:CAMINHO")
+    parser.add_argument("--spawn", action="store_true", help="sobe um servidor próprio")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--commands", type=int, default=10, help="comandos por sessão")
+    parser.add_argument("--interval", type=float, default=0.7,
+                        help="segundos entre comandos de uma sessão (token bucket: ~1.67/s)")
+    parser.add_argument("--no-cooldown", action="store_true",
+                        help="com --spawn: servidor sem limite de taxa")
+    parser.add_argument("--disk", action="store_true", help="com --spawn: grava no HD virtual")
+    parser.add_argument("--out", help="relatório JSON")
+    args = parser.parse_args(argv)
+
+    if not args.connect and not args.spawn:
+        parser.error("use --connect ENDEREÇO ou --spawn")
+
+    raise_fd_limit(2 * args.sessions + 64)
+    proc = None
+    address = args.connect
+    if args.spawn:
+        extra = [] if args.disk else ["--no-disk"]
+        if args.no_cooldown:
+            extra.append("--no-cooldown")
+        proc, address = spawn_server(extra)
+    try:
+        report = asyncio.run(run_load(address, args.sessions, args.commands, args.interval))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    report["address"] = address
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["connected"] and not report["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
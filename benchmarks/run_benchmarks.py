@@ -0,0 +1,292 @@
+# benchmarks/run_benchmarks.py
+# ============================================================
+# BENCHMARKS DOS CAMINHOS QUENTES DO DARVIS
+# ============================================================
+# Uso (a partir da raiz do repositório):
+#   python -m benchmarks.run_benchmarks [--out bench_report.json]
+#          [--baseline antigo.json] [--tolerance 0.25] [--quick]
+#
+# - hd_write com hd_virtual.json de tamanhos crescentes
+# - despacho do processar_comando
+# - ram_allocate/ram_cleanup sob rotatividade
+# - atualizar_emocao / decay_emocao (por frame)
+# - um frame de render_hud/render_animation (driver SDL dummy),
+#   com redesenho total e com o compositor de retângulos sujos
+# - operações em lote da frota de armaduras (NumPy, se instalado)
+# - agendador: custo por frame sem nada vencido e agenda/cancela
+# - replay colunar do rastro "memory" e agregados dos "logs" (NumPy)
+#
+# Sai com código 1 se alguma mediana passar do limite em
+# benchmarks/thresholds.json ou do baseline + tolerância.
+# ============================================================
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from benchmarks.harness import Benchmark, load_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THRESHOLDS_FILE = os.path.join(ROOT, "benchmarks", "thresholds.json")
+
+COMMANDS = [
+    "oi", "status", "ligar a luz 40", "desligar a luz", "emoção",
+    "luz", "ajuda", "modo descanso", "comando desconhecido"
+]
+
+
+def write_legacy_hd(path: str, entries: int):
+    """Gera um hd_virtual.json monolítico com N logs (formato antigo)"""
+    with open(path, "w") as f:
+        f.write('{"memory": [], "logs": [\n')
+        for i in range(entries):
+            sep = "," if i else ""
+            f.write(f'{sep}{{"time": {1767577755.0 + i}, "A": {i % 7}, '
+                    f'"STATE": "IDLE", "LOAD": 0.42}}\n')
+        f.write("]}\n")
+
+
+def make_assistant(workdir: str, legacy_entries: int = 0):
+    """DarvisAssistant headless isolado num diretório temporário"""
+    import davi
+
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    if legacy_entries:
+        write_legacy_hd(davi.HD_FILE, legacy_entries)
+    return davi.DarvisAssistant(headless=True, ignore_cooldown=True)
+
+
+def bench_hd(bench: Benchmark, base: str, sizes):
+    entry = {"type": "command", "cmd": "status", "response": "ok", "cpu_load": 0.3}
+    for size in sizes:
+        darvis = make_assistant(os.path.join(base, f"hd_{size}"), size)
+        bench(f"hd_write[{size}]", lambda: darvis.hd_write(dict(entry)), group="hd")
+        darvis.hd_writer.close()
+        # Caminho síncrono do disco (o que o worker executa), já sem o worker
+        bench(f"hd_append[{size}]", lambda: darvis.hd.append(dict(entry)), group="hd")
+        darvis.hd.close()
+
+
+def bench_commands(bench: Benchmark, base: str):
+    darvis = make_assistant(os.path.join(base, "commands"))
+    cmds = itertools.cycle(COMMANDS)
+
+    def run():
+        darvis.processar_comando(next(cmds))
+        darvis.mensagens.clear()
+
+    bench("processar_comando", run, group="commands")
+    bench("router_match", lambda: darvis.router.match(next(cmds)), group="commands")
+    darvis.hd_writer.close()
+
+
+def bench_ram_and_emotion(bench: Benchmark, base: str):
+    darvis = make_assistant(os.path.join(base, "ram"))
+    counter = itertools.count()
+
+    def churn():
+        darvis.ram_allocate(24, "bench")
+        if next(counter) % 20 == 0:
+            darvis.ram_cleanup()
+
+    bench("ram_allocate_churn", churn, group="ram")
+    bench("ram_cleanup", darvis.ram_cleanup, group="ram")
+    bench("atualizar_emocao", lambda: darvis.atualizar_emocao(0.0001), group="emotion")
+    bench("decay_emocao", darvis.decay_emocao, group="emotion")
+    darvis.hd_writer.close()
+
+
+def bench_render(bench: Benchmark, base: str):
+    try:
+        import pygame
+    except ImportError:
+        print("pygame indisponível; benchmarks de render ignorados", file=sys.stderr)
+        return
+
+    darvis = make_assistant(os.path.join(base, "render"))
+    darvis.setup_graphics()
+    darvis.darvis_diz("Benchmark message one.")
+    darvis.darvis_diz("Benchmark message two.")
+
+    def frame():
+        darvis.screen.fill(darvis.colors["bg"])
+        darvis.render_animation()
+        darvis.render_hud()
+        darvis.render_messages()
+        pygame.display.flip()
+
+    def frame_composited():
+        darvis.avancar_animacao(1000 / 60)
+        darvis.compositor.present(darvis.compositor.compose())
+
+    bench("render_hud", darvis.render_hud, group="render")
+    bench("render_animation", darvis.render_animation, group="render")
+    bench("render_messages", darvis.render_messages, group="render")
+    bench("frame", frame, group="render")
+    bench("frame_composited", frame_composited, group="render")
+    darvis.hd_writer.close()
+    pygame.quit()
+
+
+def bench_fleet(bench: Benchmark, suits: int):
+    try:
+        from armor.fleet import ArmorFleet
+    except ImportError:
+        print("numpy indisponível; benchmarks da frota ignorados", file=sys.stderr)
+        return
+
+    per_model = suits // 4
+    fleet = ArmorFleet.build({"Mark II": per_model, "Mark III": per_model,
+                              "Mark IV": per_model, "Mark V": per_model})
+    active = fleet.select(model="Mark V")
+    bench(f"fleet_consume[{len(fleet)}]", lambda: fleet.consume_energy(0.01), group="fleet")
+    bench(f"fleet_activate[{len(fleet)}]", lambda: fleet.activate(active), group="fleet")
+    bench(f"fleet_status[{len(fleet)}]", fleet.status, group="fleet")
+
+
+def bench_reactor(bench: Benchmark, reactors: int):
+    try:
+        from energy.reactor_engine import ReactorBank
+    except ImportError:
+        print("numpy indisponível; benchmarks do reator ignorados", file=sys.stderr)
+        return
+
+    bank = ReactorBank(reactors)
+    bank.throttle[:] = 0.1
+    drive = bank.drive()
+    bench(f"reactor_step[{reactors}]", lambda: bank.step(1.0, drive=drive), group="reactor")
+
+    def hour():
+        adaptive = ReactorBank(reactors)
+        adaptive.throttle[:] = 0.1
+        for _ in adaptive.run(3600, method="adaptive", record_every=60):
+            pass
+
+    bench(f"reactor_hour_adaptive[{reactors}]", hour, group="reactor")
+
+
+def bench_navigation(bench: Benchmark, followers: int):
+    from navigation.pathfinding import NavGrid
+    grid = NavGrid(256, 256)
+    # Paredes alternadas (labirinto em serpentina)
+    for x in range(16, 256, 32):
+        if (x // 32) % 2 == 0:
+            grid.add_obstacle(x, 0, x + 1, 200)
+        else:
+            grid.add_obstacle(x, 56, x + 1, 255)
+
+    bench("path_jps[256]", lambda: grid.find_cells((0, 0), (255, 255), "jps"),
+          setup=grid.clear_cache, group="navigation")
+    bench("path_astar[256]", lambda: grid.find_cells((0, 0), (255, 255), "astar"),
+          setup=grid.clear_cache, group="navigation", rounds=3)
+    bench("path_cached[256]", lambda: grid.find_cells((0, 0), (255, 255), "jps"),
+          group="navigation")
+
+    try:
+        import numpy as np
+        from navigation.follow_engine import FollowerSwarm
+    except ImportError:
+        print("numpy indisponível; benchmark do enxame ignorado", file=sys.stderr)
+        return
+    rng = np.random.default_rng(7)
+    swarm = FollowerSwarm(rng.random((followers, 2)) * 100.0,
+                          max_speed=rng.uniform(2.0, 6.0, followers))
+    swarm.set_target((50.0, 50.0))
+    bench(f"swarm_step[{followers}]", lambda: swarm.step(0.05), group="navigation")
+
+
+def bench_scheduler(bench: Benchmark, tasks: int):
+    from core.scheduler import Scheduler
+    scheduler = Scheduler()
+    for i in range(tasks):
+        scheduler.every(60.0 + i % 60, lambda: None, name=f"t{i}", jitter=1.0)
+    # O que o loop de frames paga quando nada venceu
+    bench(f"scheduler_idle[{tasks}]", scheduler.run_pending, group="scheduler")
+
+    def churn():
+        scheduler.after(30.0, lambda: None, name="churn").cancel()
+
+    bench(f"scheduler_churn[{tasks}]", churn, group="scheduler")
+
+
+def bench_trace(bench: Benchmark, ops: int):
+    try:
+        import numpy as np
+        from core.hd_trace import OP_ADD, OP_SET, OP_SUB, LoadTrace, OpTrace
+    except ImportError:
+        print("numpy indisponível; benchmarks do rastro ignorados", file=sys.stderr)
+        return
+    rng = np.random.default_rng(7)
+    # Mesma mistura do hd_virtual.json: ~40% ADD, ~60% SUB, reinícios raros
+    op = rng.choice([OP_ADD, OP_SUB, OP_SET], ops, p=[0.3999, 0.6, 0.0001])
+    trace = OpTrace(op, rng.integers(1, 6, ops))
+    bench(f"trace_replay[{ops}]", trace.replay,
+          setup=lambda: setattr(trace, "_replay", None), group="trace")
+
+    samples = ops // 4
+    logs = LoadTrace(np.cumsum(rng.uniform(0.01, 1.0, samples)), rng.random(samples),
+                     rng.integers(1, 4, samples), ["IDLE", "ACTIVE", "OVERLOAD"])
+    bench(f"trace_by_state[{samples}]", logs.by_state, group="trace")
+    bench(f"trace_windows[{samples}]", lambda: logs.windows(60.0), group="trace")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos quentes do DARVIS")
+    parser.add_argument("--out", default="bench_report.json")
+    parser.add_argument("--baseline", help="relatório anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE)
+    parser.add_argument("--quick", action="store_true", help="menos rodadas e tamanhos menores")
+    parser.add_argument("--sizes", default=None,
+                        help="tamanhos do hd_virtual.json, ex.: 1000,10000,100000")
+    args = parser.parse_args(argv)
+
+    if args.sizes:
+        sizes = [int(s) for s in args.sizes.split(",")]
+    else:
+        sizes = [1000, 10000] if args.quick else [1000, 10000, 100000]
+
+    out = os.path.abspath(args.out)
+    cwd = os.getcwd()
+    base = tempfile.mkdtemp(prefix="darvis-bench-")
+    bench = Benchmark(min_time=0.05 if args.quick else 0.3)
+    try:
+        bench_hd(bench, base, sizes)
+        bench_commands(bench, base)
+        bench_ram_and_emotion(bench, base)
+        bench_render(bench, base)
+        bench_fleet(bench, 100000 if args.quick else 400000)
+        bench_reactor(bench, 1000)
+        bench_navigation(bench, 10000 if args.quick else 100000)
+        bench_scheduler(bench, 10000)
+        bench_trace(bench, 1000000 if args.quick else 4000000)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(base, ignore_errors=True)
+
+    report = bench.report()
+    thresholds = load_json(args.thresholds) if os.path.exists(args.thresholds) else {}
+    baseline = load_json(args.baseline) if args.baseline else None
+    failures = bench.check(thresholds, baseline, args.tolerance)
+    report["failures"] = failures
+
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    bench.print_table()
+    print(f"\nRelatório: {out}")
+    for failure in failures:
+        print(f"REGRESSÃO: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# core/batch.py
+# ============================================================
+# MODO BATCH / HEADLESS — REPLAY DE COMANDOS
+# ============================================================
+# - Lê comandos de um arquivo (.jsonl ou texto) ou de um iterável
+# - Processa o mais rápido possível num DarvisAssistant headless
+# - Escreve uma resposta por linha (JSON lines)
+# - Relatório final de vazão (comandos/s) e latência
+# ============================================================
+
+import json
+import time
+from typing import IO, Dict, Iterable, Iterator, Optional, Union
+
+
+def iter_commands(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Gera comandos a partir de um caminho ou de um iterável.
+
+    Em arquivos .jsonl cada linha pode ser {"cmd": ...}, {"command": ...}
+    ou uma string JSON; nos demais formatos cada linha é um comando.
+    Arquivos vazios simplesmente não geram comandos.
+    """
+    if not isinstance(source, str):
+        for cmd in source:
+            if cmd and cmd.strip():
+                yield cmd.strip()
+        return
+
+    is_jsonl = source.endswith(".jsonl")
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if is_jsonl:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    record = record.get("cmd", record.get("command"))
+                if isinstance(record, str) and record.strip():
+                    yield record
+            else:
+                yield line
+
+
+def run_batch(darvis, commands: Iterable[str], out: Optional[IO] = None) -> Dict:
+    """Processa os comandos em sequência e devolve métricas de vazão"""
+    processed = 0
+    rejected = 0
+    latencies = []
+    started = time.perf_counter()
+
+    for cmd in commands:
+        if not darvis.running:
+            break
+
+        first_msg = len(darvis.mensagens)
+        t0 = time.perf_counter()
+        resp = darvis.processar_comando(cmd)
+        elapsed = time.perf_counter() - t0
+
+        # Tudo o que o assistente "disse" durante o comando
+        said = [m.text for m in darvis.mensagens[first_msg:]]
+        del darvis.mensagens[first_msg:]
+
+        processed += 1
+        if resp is None:
+            rejected += 1
+        latencies.append(elapsed)
+
+        if out is not None:
+            out.write(json.dumps({
+                "cmd": cmd,
+                "response": resp,
+                "messages": said,
+                "elapsed_ms": round(elapsed * 1000, 4)
+            }, ensure_ascii=False) + "\n")
+
+    total = time.perf_counter() - started
+    latencies.sort()
+
+    def pct(p):
+        if not latencies:
+            return 0.0
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 4)
+
+    return {
+        "commands": processed,
+        "rejected": rejected,
+        "seconds": round(total, 4),
+        "commands_per_second": round(processed / total, 1) if total > 0 else 0.0,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99)
+    }
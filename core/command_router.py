@@ -0,0 +1,206 @@
+# core/command_router.py
+# ============================================================
+# ROTEADOR DE COMANDOS COMPILADO
+# ============================================================
+# - Intenções registradas declarativamente (grupos de frases)
+# - Todas as frases compiladas numa única trie de tokens
+# - Casamento por token: "on" não casa mais dentro de "emotion"
+# - Prioridade explícita e extração de parâmetros
+# - Custo por comando ~ O(tokens x tamanho da maior frase),
+#   independente do tamanho do vocabulário
+# - suggest(): corrige erros de digitação pelo índice de
+#   trigramas do vocabulário ("stauts" -> "status")
+# - rebind(): mesma trie com handlers de outra instância
+#   (sessões do servidor não recompilam nada)
+# ============================================================
+
+import re
+import unicodedata
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from core.fuzzy import TrigramIndex
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Minúsculas e sem acentos ("Emoção" -> "emocao")"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def first_int(tokens: Sequence[str]) -> Optional[int]:
+    """Primeiro número inteiro do comando (ex.: intensidade da luz)"""
+    for token in tokens:
+        if token.isdigit():
+            return int(token)
+    return None
+
+
+@dataclass
+class Intent:
+    name: str
+    groups: List[List[str]]
+    handler: Callable[["CommandMatch"], Optional[str]]
+    priority: int = 0
+    exact: bool = False
+    params: Dict[str, Callable[[Sequence[str]], Any]] = field(default_factory=dict)
+    full_mask: int = 0
+
+
+@dataclass
+class CommandMatch:
+    intent: Intent
+    text: str
+    tokens: List[str]
+    params: Dict[str, Any]
+    span: int = 0  # tokens cobertos pelas frases que casaram
+    similarity: float = 1.0  # < 1.0 quando veio de uma correção (suggest)
+
+    def __call__(self) -> Optional[str]:
+        return self.intent.handler(self)
+
+
+class CommandRouter:
+    """Registro de intenções + trie de frases compilada"""
+
+    def __init__(self):
+        self.intents: List[Intent] = []
+        self._trie: Dict = {}
+        self._exact: Dict[str, int] = {}
+        self._fuzzy = TrigramIndex()
+        self._compiled = False
+
+    def register(self, name: str, groups: Sequence[Sequence[str]],
+                 handler: Callable[[CommandMatch], Optional[str]], priority: int = 0,
+                 exact: bool = False, params: Optional[Dict[str, Callable]] = None) -> Intent:
+        """Registra uma intenção.
+
+        groups: cada grupo é uma lista de frases alternativas; a intenção
+        casa quando todos os grupos aparecem no comando (em qualquer ordem).
+        exact: o comando inteiro precisa ser uma das frases do único grupo.
+        """
+        intent = Intent(name, [list(g) for g in groups], handler, priority,
+                        exact, dict(params or {}))
+        self.intents.append(intent)
+        self._compiled = False
+        return intent
+
+    def compile(self):
+        """Compila todas as frases numa trie de tokens"""
+        self._trie = {}
+        self._exact = {}
+        self._fuzzy = TrigramIndex()
+        for index, intent in enumerate(self.intents):
+            intent.full_mask = (1 << len(intent.groups)) - 1
+            for bit, group in enumerate(intent.groups):
+                for phrase in group:
+                    tokens = tokenize(phrase)
+                    if not tokens:
+                        continue
+                    for token in tokens:
+                        self._fuzzy.add(token)
+                    if intent.exact:
+                        self._exact.setdefault(" ".join(tokens), index)
+                        continue
+                    node = self._trie
+                    for token in tokens:
+                        node = node.setdefault(token, {})
+                    node.setdefault(None, []).append((index, 1 << bit, len(tokens)))
+        self._compiled = True
+
+    def rebind(self, resolve: Callable[[Intent], Callable[[CommandMatch], Optional[str]]]
+               ) -> "CommandRouter":
+        """Cópia com outros handlers que reaproveita a trie compilada.
+
+        resolve(intent) devolve o novo handler (ex.: o mesmo método em
+        outra instância); trie, frases exatas e trigramas são só lidos
+        depois de compile(), então podem ser compartilhados.
+        """
+        if not self._compiled:
+            self.compile()
+        clone = CommandRouter.__new__(CommandRouter)
+        clone.intents = [replace(intent, handler=resolve(intent)) for intent in self.intents]
+        clone._trie = self._trie
+        clone._exact = self._exact
+        clone._fuzzy = self._fuzzy
+        clone._compiled = True
+        return clone
+
+    def vocabulary(self) -> List[str]:
+        """Todas as frases registradas"""
+        return [phrase for intent in self.intents for group in intent.groups for phrase in group]
+
+    def match(self, text: str) -> Optional[CommandMatch]:
+        """Melhor intenção para o texto (ou None)"""
+        if not self._compiled:
+            self.compile()
+
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+
+        exact = self._exact.get(" ".join(tokens))
+        if exact is not None:
+            return self._build(self.intents[exact], text, tokens, len(tokens))
+
+        masks: Dict[int, int] = {}
+        spans: Dict[int, int] = {}
+        for start in range(len(tokens)):
+            node = self._trie
+            for token in tokens[start:]:
+                node = node.get(token)
+                if node is None:
+                    break
+                for index, bit, length in node.get(None, ()):
+                    masks[index] = masks.get(index, 0) | bit
+                    spans[index] = spans.get(index, 0) + length
+
+        best = None
+        for index, mask in masks.items():
+            intent = self.intents[index]
+            if mask != intent.full_mask:
+                continue
+            key = (intent.priority, spans[index], -index)
+            if best is None or key > best[0]:
+                best = (key, intent)
+
+        if best is None:
+            return None
+        return self._build(best[1], text, tokens, best[0][1])
+
+    def suggest(self, text: str, threshold: float = 0.65) -> Optional[CommandMatch]:
+        """Intenção após corrigir tokens desconhecidos (None se nada casar).
+
+        Só tokens com 3+ letras fora do vocabulário são corrigidos;
+        similarity da resposta é a pior similaridade entre as correções.
+        """
+        if not self._compiled:
+            self.compile()
+
+        tokens = tokenize(text)
+        corrected = []
+        worst = 1.0
+        for token in tokens:
+            if len(token) >= 3 and not token.isdigit() and token not in self._fuzzy:
+                best = self._fuzzy.best(token, threshold)
+                if best is not None:
+                    token, score = best
+                    worst = min(worst, score)
+            corrected.append(token)
+
+        if worst == 1.0:
+            return None
+        match = self.match(" ".join(corrected))
+        if match is not None:
+            match.similarity = worst
+        return match
+
+    def _build(self, intent: Intent, text: str, tokens: List[str], span: int) -> CommandMatch:
+        params = {name: extract(tokens) for name, extract in intent.params.items()}
+        return CommandMatch(intent, text, tokens, params, span)
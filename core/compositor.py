@@ -0,0 +1,176 @@
+# core/compositor.py
+# ============================================================
+# COMPOSITOR EM CAMADAS COM RETÂNGULOS SUJOS
+# ============================================================
+# - Base estática (fundo + moldura do HUD) numa superfície própria
+# - Cada camada dinâmica tem uma área fixa e uma "chave" de estado;
+#   só é redesenhada quando a chave muda (ou sempre, se animada)
+# - Áreas sujas: restaura a base, redesenha as camadas que a
+#   tocam (recorte ativo) e devolve os retângulos para
+#   pygame.display.update(rects) em vez de display.flip()
+# - Com um FrameProfiler medindo o frame, cada camada vira a fase
+#   render_<nome> e a restauração da base fica em "fill"
+# ============================================================
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import pygame
+
+
+class Layer:
+    """Camada dinâmica: área na tela + desenho + chave de estado"""
+
+    __slots__ = ("name", "phase", "rect", "draw", "key", "always", "state", "visible")
+
+    def __init__(self, name: str, rect: pygame.Rect, draw: Callable[[Any], None],
+                 key: Optional[Callable[[], Any]] = None, always: bool = False):
+        self.name = name
+        self.phase = f"render_{name}"  # fase no profiler
+        self.rect = pygame.Rect(rect)
+        self.draw = draw
+        self.key = key
+        self.always = always
+        self.state = None
+        self.visible = True
+
+
+class LayeredCompositor:
+    """Compõe base + camadas e devolve só as regiões alteradas"""
+
+    def __init__(self, screen: pygame.Surface, dirty_rects: bool = True):
+        self.screen = screen
+        self.bounds = screen.get_rect()
+        self.base = pygame.Surface(self.bounds.size).convert()
+        self.dirty_rects = dirty_rects
+        self.layers: List[Layer] = []
+        self._by_name = {}
+        self._pending: List[pygame.Rect] = []
+        self._full = True
+        self._last_full = True
+        self.frames = 0
+        self.full_frames = 0
+        self.area_drawn = 0
+
+    # ======================= CONFIGURAÇÃO ===================
+
+    def set_base(self, draw: Callable[[pygame.Surface], None]):
+        """Redesenha a base estática (troca de tema, por exemplo)"""
+        draw(self.base)
+        self.invalidate()
+
+    def add_layer(self, name: str, rect, draw: Callable[[Any], None],
+                  key: Optional[Callable[[], Any]] = None, always: bool = False) -> Layer:
+        """Camadas são compostas na ordem em que foram adicionadas"""
+        layer = Layer(name, rect, draw, key, always)
+        self.layers.append(layer)
+        self._by_name[name] = layer
+        return layer
+
+    def set_rect(self, name: str, rect):
+        """Muda a área de uma camada; a área antiga também fica suja"""
+        layer = self._by_name[name]
+        rect = pygame.Rect(rect)
+        if rect != layer.rect:
+            self._pending.append(layer.rect)
+            layer.rect = rect
+            self._pending.append(rect)
+
+    def invalidate(self, rect=None):
+        """Marca uma área (ou a tela toda) para redesenho"""
+        if rect is None:
+            self._full = True
+        else:
+            self._pending.append(pygame.Rect(rect))
+
+    # ======================= COMPOSIÇÃO =====================
+
+    def compose(self, profiler=None) -> List[pygame.Rect]:
+        """Redesenha as áreas sujas; devolve os retângulos alterados.
+
+        profiler: FrameProfiler do loop; no frame medido fecha a fase
+        "fill" (base + bookkeeping) e uma render_<camada> por camada.
+        """
+        timing = profiler is not None and profiler.active
+        spent: Dict[str, float] = {}
+        if timing:
+            # Camada sem área suja custa zero neste frame (e entra assim)
+            spent = {layer.phase: 0.0 for layer in self.layers if layer.visible}
+
+        dirty = self._pending
+        self._pending = []
+
+        for layer in self.layers:
+            if layer.always:
+                dirty.append(layer.rect)
+            elif layer.key is not None:
+                state = layer.key()
+                if state != layer.state:
+                    layer.state = state
+                    dirty.append(layer.rect)
+
+        full = self._full or not self.dirty_rects
+        self._full = False
+        if full:
+            dirty = [self.bounds.copy()]
+            self.full_frames += 1
+        else:
+            dirty = self._merge([r.clip(self.bounds) for r in dirty if r.colliderect(self.bounds)])
+
+        screen = self.screen
+        for rect in dirty:
+            screen.set_clip(rect)
+            screen.blit(self.base, rect, rect)
+            for layer in self.layers:
+                if layer.visible and layer.rect.colliderect(rect):
+                    if timing:
+                        started = time.perf_counter()
+                        layer.draw(layer.state)
+                        spent[layer.phase] += (time.perf_counter() - started) * 1000.0
+                    else:
+                        layer.draw(layer.state)
+            self.area_drawn += rect.width * rect.height
+        screen.set_clip(None)
+
+        self.frames += 1
+        self._last_full = full
+        if timing:
+            profiler.lap_split("fill", spent)
+        return dirty
+
+    def present(self, rects: List[pygame.Rect]):
+        """Envia à janela só o que mudou (flip em redesenho total)"""
+        if self._last_full:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+    @staticmethod
+    def _merge(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """Une retângulos sobrepostos quando a união não desperdiça área"""
+        merged: List[pygame.Rect] = []
+        for rect in rects:
+            if not rect.width or not rect.height:
+                continue
+            i = 0
+            while i < len(merged):
+                other = merged[i]
+                union = rect.union(other)
+                if other.colliderect(rect) and (union.width * union.height <=
+                                                rect.width * rect.height + other.width * other.height):
+                    rect = union
+                    merged.pop(i)
+                    i = 0
+                else:
+                    i += 1
+            merged.append(rect)
+        return merged
+
+    def stats(self) -> dict:
+        screen_area = self.bounds.width * self.bounds.height
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "avg_area_pct": round(100.0 * self.area_drawn / (screen_area * self.frames), 2)
+            if self.frames else 0.0
+        }
@@ -0,0 +1,56 @@
+# core/darvis_config.py
+# ============================================================
+# DARVIS — CONSTANTES E TIPOS COMPARTILHADOS
+# ============================================================
+# - Versão, arquivos de estado e faixas emocionais
+# - Sem dependências pesadas: o modo headless importa só isto,
+#   o núcleo e os módulos leves do core
+# ============================================================
+
+from dataclasses import dataclass
+from enum import Enum
+
+APP_NAME = "DARVIS — Assistente Local"
+VERSION = "2.0.0"
+HD_FILE = "hd_virtual.json"
+HD_DIR = "hd_virtual"
+HD_SNAPSHOT_FILE = "hd_virtual.snap"
+CONFIG_FILE = "darvis_config.json"
+TTS_CACHE_DIR = "tts_cache"
+FONT_CACHE_FILE = "font_cache.json"  # nome da fonte -> arquivo resolvido
+KNOWLEDGE_DIR = "."  # fisica.json, quimica.json, ... (area/topicos/conteudos)
+KNOWLEDGE_CACHE = "knowledge_index.json"
+SESSION_SERIES_TIERS = ((60, 60),)  # sessões do servidor: só a última hora por minuto
+DREAM_RETRY_SECONDS = 5.0  # sistema ocupado: nova tentativa de sonho
+
+# ============================================================
+# ======================= TIPOS DE DADOS =====================
+# ============================================================
+
+class EmotionState(Enum):
+    CALM = "CALM"
+    CONTENT = "CONTENT"
+    SATISFIED = "SATISFIED"
+    EXCITED = "EXCITED"
+    LOW = "LOW"
+
+# Limite superior (exclusivo) de dopamina de cada faixa
+EMOTION_BANDS = [
+    (0.2, EmotionState.LOW.value),
+    (0.4, EmotionState.CALM.value),
+    (0.7, EmotionState.CONTENT.value),
+    (0.9, EmotionState.SATISFIED.value),
+    (float("inf"), EmotionState.EXCITED.value)
+]
+
+class SystemState(Enum):
+    BOOT = "BOOT"
+    ACTIVE = "ACTIVE"
+    IDLE = "IDLE"
+    SHUTDOWN = "SHUTDOWN"
+
+@dataclass
+class Message:
+    text: str
+    timestamp: float
+    duration: float = 6.0
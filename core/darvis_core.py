@@ -1 +1,1090 @@
+# core/darvis_core.py
+# ============================================================
+# DARVIS — NÚCLEO DO ASSISTENTE
+# ============================================================
+# - Estado, comandos, emoção, RAM, HD, voz e agendador
+# - Subsistemas fora do caminho da partida: HD (e seus módulos) numa
+#   thread hd-init (escritas feitas antes dela terminar ficam na fila),
+#   voz numa thread voice-init (falas anteriores esperam com o prazo),
+#   base de conhecimento na primeira pergunta; nada de pygame/pyttsx3
+#   no import
+# - A janela vem do mixin DarvisGUI (core/darvis_gui.py)
+# - StartupTimer marca as fases até o primeiro comando
+# - Relógio e acaso injetáveis (core/sim_clock.py): com o relógio
+#   virtual as tarefas rodam por fast_forward e a mesma semente
+#   reproduz a execução
+# ============================================================
 
+import json
+import math
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from core.command_router import CommandMatch, CommandRouter, first_int
+from core.darvis_config import (
+    CONFIG_FILE, DREAM_RETRY_SECONDS, EMOTION_BANDS, HD_DIR, HD_FILE, HD_SNAPSHOT_FILE,
+    KNOWLEDGE_CACHE, KNOWLEDGE_DIR, SESSION_SERIES_TIERS, TTS_CACHE_DIR, VERSION,
+    Message, SystemState
+)
+from core.darvis_gui import DarvisGUI
+from core.emotion import EmotionModel
+from core.knowledge import AREA_PREFIXES, WHAT_PREFIXES, KnowledgeBase, question_subject
+from core.profiler import FrameProfiler, StartupTimer
+from core.rate_limit import TokenBucket
+from core.scheduler import Scheduler
+from core.sim_clock import SystemClock
+from core.speech import PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_URGENT
+from core.timeseries import TimeSeriesStore
+from core.virtual_ram import POLICIES as RAM_POLICIES, VirtualRAM
+
+
+class DarvisAssistant(DarvisGUI):
+    def __init__(self, headless: bool = False, ignore_cooldown: bool = False,
+                 shared: Optional["DarvisAssistant"] = None, session_id: Optional[str] = None,
+                 startup: Optional[StartupTimer] = None, clock=None,
+                 rng: Optional[random.Random] = None):
+        self.safe_mode = True
+        self.startup = startup  # relatório de partida (fechado no primeiro comando)
+        # Sessão do servidor: HD, conhecimento e roteador vêm do host
+        self.shared = shared
+        self.session_id = session_id
+        # Relógio do host (sessões inclusive) e RNG próprio
+        self.clock = clock or (shared.clock if shared is not None else SystemClock())
+        self.rng = rng or random.Random()
+        self.headless = headless or shared is not None
+        self.ignore_cooldown = ignore_cooldown  # só para replay/carga
+        self.config = shared.config if shared is not None else self.load_config()
+        self.marcar_partida("config")
+        self.setup_constants()
+        self.setup_variables()
+        self.marcar_partida("variables")
+        self.setup_commands()
+        self.marcar_partida("commands")
+        self.initialize_systems()
+        self.marcar_partida("systems")
+    
+    def marcar_partida(self, phase: str):
+        if self.startup is not None:
+            self.startup.mark(phase)
+    
+    def setup_constants(self):
+        """Configura constantes do sistema"""
+        self.MAX_COMMAND_LENGTH = 120
+        self.RAM_TOTAL_MB = 8192
+        self.RAM_CLEANUP_THRESHOLD = 0.85  # 85% de uso
+        
+        self.respostas = {
+            "greeting": ["Hello Pedro.", "Systems secure.", "Online and ready."],
+            "status": ["All systems nominal.", "Operating within parameters."],
+            "light_on": ["Illumination activated.", "Lighting system engaged."],
+            "light_off": ["Darkness restored.", "Lighting disengaged."]
+        }
+        
+        self.sonhos = [
+            "System stable. All processes nominal.",
+            "Memory optimized. Cache performing well.",
+            "Pedro always returns. Pattern confirmed.",
+            "All systems calm. No anomalies detected.",
+            "Neural pathways clear. Ready for commands.",
+            "Learning from interactions. Growing smarter.",
+            "Security protocols active. All green.",
+            "Virtual circuits humming. Energy efficient.",
+            "Database indexed. Queries optimized.",
+            "Ambient temperature stable. Cooling nominal."
+        ]
+    
+    def setup_variables(self):
+        """Inicializa variáveis do sistema"""
+        self.registradores = {
+            "STATE": SystemState.BOOT.value,
+            "LOAD": 0.0,
+            "UPTIME": self.clock.time(),
+            "COMMAND_COUNT": 0,
+            "ERROR_COUNT": 0
+        }
+        
+        # Emoção preguiçosa: decaimento calculado na leitura
+        self.emocao = EmotionModel(
+            0.35,
+            decay_per_second=self.config["emotion_decay_per_second"],
+            bands=EMOTION_BANDS,
+            clock=self.clock.time
+        )
+        self.ultima_amostra_emocao = 0.0
+        
+        self.luz_quarto = {"ligada": False, "intensidade": 100}
+        
+        # Alocador simulado: contabilidade exata, despejo por política
+        policy = self.config["ram_policy"]
+        self.ram = VirtualRAM(
+            self.RAM_TOTAL_MB,
+            max_blocks=self.config["ram_max_blocks"],
+            policy=policy if policy in RAM_POLICIES else "time",
+            clock=self.clock.time
+        )
+        
+        # Histórico compacto (anéis de doubles + camadas s/min/h)
+        if self.shared is None:
+            self.series = TimeSeriesStore(("dopamine", "load", "ram"))
+        else:
+            self.series = TimeSeriesStore(("dopamine", "load", "ram"), raw_capacity=60,
+                                          tiers=SESSION_SERIES_TIERS)
+        
+        # Limite de taxa próprio (token bucket) no lugar do cooldown global
+        self.rate_limiter = TokenBucket(self.config["rate_limit_per_second"],
+                                        self.config["rate_limit_burst"], clock=self.clock.time)
+        
+        self.mensagens = []
+        self.last_command_time = 0
+        self.ultimo_sonho = 0
+        
+        # Agendador único (sessões do servidor não têm: o host cuida delas)
+        self.scheduler = None
+        if self.shared is None:
+            self.scheduler = Scheduler(clock=self.clock.monotonic, rng=self.rng,
+                                       timer=self.clock.perf_counter)
+        self._tarefa_sonho = None
+        self._tarefa_limpeza = None
+        
+        # Subsistemas preguiçosos (sessões usam os do host)
+        self._hd_lock = threading.Lock()
+        self._hd = self._hd_snapshot = self._hd_index = self._hd_writer = None
+        self._hd_thread: Optional[threading.Thread] = None
+        self._hd_ready = threading.Event()
+        self._hd_error: Optional[BaseException] = None
+        self._hd_pending: List[Dict] = []  # escritas antes do HD abrir
+        self._knowledge = None
+        self._traces = None
+        self.speech = None
+        self._voz_lock = threading.Lock()
+        self._voz_thread: Optional[threading.Thread] = None
+        self._voz_pendente: List[Tuple[str, int, float]] = []  # (texto, prioridade, expira)
+        self.angle = 0
+        self.running = True
+        # Carga amostrada continuamente (frames ou tick virtual); sem isso,
+        # o status amostra na hora da consulta
+        self.carga_amostrada = False
+        self.encerrado = False  # shutdown() já rodou (chamadas repetidas não fazem nada)
+        self.last_activity = self.clock.time()
+        self.sugestao_pendente: Optional[str] = None
+        
+        # Instrumentação por frame (overlay F3, exportação F4)
+        self.profiler = FrameProfiler(
+            capacity=self.config["profile_capacity"],
+            sample_every=self.config["profile_sample_every"]
+        )
+        self.show_profiler = self.config["profile_overlay"]
+        self.profiler_lines = []
+        
+        # Permissões configuráveis
+        self.permissoes = {
+            "voice": True,
+            "disk": True,
+            "light_control": True,
+            "dreams": True,
+            "learning": False  # Futuro: aprendizado básico
+        }
+    
+    def load_config(self) -> Dict:
+        """Carrega configurações do arquivo"""
+        default_config = {
+            "volume": 1.0,
+            "speech_rate": 145,
+            "voice": "en-us",
+            "theme": "dark",
+            "auto_cleanup": True,
+            "dream_interval": 45,
+            "animation_speed": 1.0,
+            "hd_segment_entries": 500,
+            "hd_max_segments": 2,
+            "hd_fsync_every": 32,
+            "hd_queue_size": 1024,
+            "profile_sample_every": 1,  # 0 desliga; N mede 1 a cada N frames
+            "profile_capacity": 600,
+            "profile_overlay": False,
+            "dirty_rects": True,  # False: redesenho total + flip a cada frame
+            "fps_active": 60,
+            "fps_idle": 10,  # taxa reduzida em SystemState.IDLE
+            "idle_after": 60,  # segundos sem atividade até IDLE
+            "tts_queue_size": 8,
+            "tts_cache": True,  # WAV das frases fixas (sonhos/respostas)
+            "ram_policy": "time",  # "time" (mais antigo) ou "lru" (menos usado)
+            "ram_max_blocks": 50,
+            "ram_max_age": 60,  # segundos; limpeza agressiva usa metade
+            "emotion_decay_per_second": 0.018,  # antes: 0.0003 por frame a 60 FPS
+            "fuzzy_threshold": 0.65,  # similaridade mínima para "did you mean"
+            "rate_limit_per_second": 1 / 0.6,  # mesmo ritmo do antigo cooldown de 0.6 s
+            "rate_limit_burst": 3,  # comandos seguidos permitidos antes do limite
+            "server_max_sessions": 10000,
+            "server_idle_timeout": 900,  # segundos sem comando até encerrar a sessão
+            "sim_tick_seconds": 5.0  # tempo virtual: passo de carga/estado/emoção
+        }
+        
+        if os.path.exists(CONFIG_FILE):
+            try:
+                with open(CONFIG_FILE, 'r') as f:
+                    user_config = json.load(f)
+                    default_config.update(user_config)
+            except:
+                pass
+        
+        return default_config
+    
+    def save_config(self):
+        """Salva configurações no arquivo"""
+        try:
+            with open(CONFIG_FILE, 'w') as f:
+                json.dump(self.config, f, indent=2)
+        except:
+            pass
+    
+    # ============================================================
+    # ======================= INICIALIZAÇÃO ======================
+    # ============================================================
+    
+    def initialize_systems(self):
+        """Inicializa todos os subsistemas"""
+        if self.shared is not None:
+            self.share_systems(self.shared)
+            return
+        
+        # HD e voz abrem em threads próprias já na partida (ver start_hd e
+        # start_voice); base de conhecimento no primeiro uso
+        
+        # Modo headless: sem voz, sem janela e sem leitura do stdin
+        if self.headless:
+            self.permissoes["voice"] = False
+            self.input_queue = queue.Queue()
+        else:
+            self.start_voice()
+            self.setup_graphics()
+            self.setup_input_thread()
+        
+        # Tarefas periódicas no agendador único
+        self.start_scheduler()
+        self.start_hd()
+    
+    def share_systems(self, host: "DarvisAssistant"):
+        """Sessão: HD, índices e conhecimento vêm do host (sem threads)"""
+        self.permissoes["voice"] = False
+        self.permissoes["disk"] = host.permissoes["disk"]
+    
+    def open_session(self, session_id: str) -> "DarvisAssistant":
+        """Nova sessão isolada (emoção, RAM, luz, limite de taxa) sobre este host"""
+        session = type(self)(ignore_cooldown=self.ignore_cooldown, shared=self,
+                             session_id=session_id,
+                             rng=random.Random(self.rng.getrandbits(64)))
+        session.registradores["STATE"] = SystemState.ACTIVE.value
+        return session
+    
+    def start_voice(self):
+        """Sonda pyttsx3/espeak na thread voice-init: a saudação do primeiro
+        frame não paga a inicialização do motor no thread da janela"""
+        if self.permissoes["voice"] and self._voz_thread is None:
+            self._voz_thread = threading.Thread(target=self.setup_voice, name="voice-init",
+                                                daemon=True)
+            self._voz_thread.start()
+    
+    def setup_voice(self):
+        """Configura o sistema de voz (thread voice-init, ver start_voice)"""
+        try:
+            import pyttsx3
+            from core.speech import SpeechWorker
+            
+            self.engine = pyttsx3.init(driverName="espeak")
+            self.engine.setProperty("rate", self.config["speech_rate"])
+            self.engine.setProperty("volume", self.config["volume"])
+            
+            # Encontrar voz apropriada
+            voices = self.engine.getProperty("voices")
+            target_voice = self.config["voice"]
+            
+            for v in voices:
+                if target_voice in v.id.lower():
+                    self.engine.setProperty("voice", v.id)
+                    break
+            
+            # Worker único de fala; áudio das frases fixas em cache
+            speech = SpeechWorker(
+                self.engine,
+                max_queue=self.config["tts_queue_size"],
+                cache_dir=TTS_CACHE_DIR if self.config["tts_cache"] else None,
+                cache_tag=f"{self.engine.getProperty('voice')}|{self.config['speech_rate']}|{self.config['volume']}"
+            )
+            with self._voz_lock:
+                # Falas feitas durante a abertura, na ordem e com o prazo restante
+                now = time.time()
+                for texto, priority, expires in self._voz_pendente:
+                    if expires > now:
+                        speech.say(texto, priority, expires - now)
+                self._voz_pendente = []
+                self.speech = speech
+            fixed = list(self.sonhos)
+            for frases in self.respostas.values():
+                fixed.extend(frases)
+            speech.precache(fixed)
+        except Exception as e:
+            print(f"Voz desativada: {e}")
+            with self._voz_lock:
+                self.permissoes["voice"] = False
+                self._voz_pendente = []
+    
+    def start_scheduler(self):
+        """Registra as tarefas periódicas no agendador"""
+        s = self.scheduler
+        s.every(30, self.ram_maintenance, name="ram_maintenance", jitter=1.0)
+        s.every(60, self.autosave, name="autosave", jitter=1.0)
+        
+        # Tempo virtual: sem thread e sem frames; quem avança o relógio
+        # (fast_forward) executa tudo, inclusive o trabalho do loop da janela
+        if self.clock.virtual:
+            self.carga_amostrada = True
+            s.every(self.config["sim_tick_seconds"], self.tick_simulado, name="sim_tick")
+            self._tarefa_sonho = s.after(self.config["dream_interval"], self.tarefa_sonho,
+                                         name="sonhar")
+            return
+        
+        # Headless: sem loop de frames, o agendador dorme na própria thread
+        # (emoção, sonhos e mensagens só existem com a janela)
+        if self.headless:
+            s.start()
+            return
+        self.carga_amostrada = True  # run() chama cpu_load() a cada frame
+        s.every(1.0, self.decay_emocao, name="decay_emocao")
+        self._tarefa_sonho = s.after(self.config["dream_interval"], self.tarefa_sonho,
+                                     name="sonhar")
+    
+    # ============================================================
+    # ======================= SEGURANÇA ==========================
+    # ============================================================
+    
+    def validar_comando(self, comando: str) -> Optional[Tuple[Optional[CommandMatch],
+                                                              Optional[CommandMatch]]]:
+        """Valida se o comando é seguro e permitido; devolve (intenção,
+        sugestão) já roteadas para o despacho (None = rejeitado)"""
+        if not comando or not comando.strip():
+            return None
+        
+        comando = comando.strip()
+        
+        # Verificar comprimento
+        if len(comando) > self.MAX_COMMAND_LENGTH:
+            self.darvis_diz("Command rejected. Input too long.", PRIORITY_LOW)
+            return None
+        
+        # Verificar limite de taxa (token bucket da sessão)
+        if not self.ignore_cooldown and not self.rate_limiter.allow():
+            self.darvis_diz("Command rate limited. Please wait.", PRIORITY_LOW)
+            return None
+        
+        # Roteia uma única vez: o despacho reaproveita o resultado
+        match = self.router.match(comando)
+        sugestao = None
+        if match is None:
+            sugestao = self.router.suggest(comando, self.config["fuzzy_threshold"])
+            # Modo seguro: erros de digitação passam adiante (viram "did you mean")
+            if self.safe_mode and sugestao is None:
+                self.darvis_diz("Command not recognized in safe mode.", PRIORITY_LOW)
+                return None
+        
+        return match, sugestao
+    
+    def verificar_hd(self, start: Optional[int] = None, end: Optional[int] = None) -> Dict:
+        """Verifica a cadeia de hash do HD virtual (intervalo de seqs)"""
+        return self.hd.verify(start, end)
+    
+    # ============================================================
+    # ======================= VOZ ================================
+    # ============================================================
+    
+    def falar(self, texto: str, priority: int = PRIORITY_NORMAL, ttl: float = 6.0):
+        """Enfileira o texto no worker de fala (descartado após ttl segundos)"""
+        if not self.permissoes["voice"]:
+            return
+        with self._voz_lock:
+            if self.speech is None:
+                if self.permissoes["voice"]:
+                    # Motor ainda abrindo: nunca espera no thread da janela
+                    self._voz_pendente.append((texto, priority, time.time() + ttl))
+                    self.start_voice()
+                return
+        self.speech.say(texto, priority, ttl)
+    
+    # ============================================================
+    # ======================= RAM VIRTUAL ========================
+    # ============================================================
+    
+    def ram_allocate(self, mb: int, reason: str, reuse: bool = False) -> int:
+        """Aloca memória RAM virtual; devolve o id do bloco.
+        reuse=True: o mesmo motivo reaproveita (e toca) o bloco ainda vivo"""
+        # Verificar se precisa limpar memória
+        if self.ram.used_mb > self.RAM_CLEANUP_THRESHOLD * self.RAM_TOTAL_MB:
+            self.ram_cleanup(aggressive=True)
+        
+        # Limite de blocos e falta de espaço são resolvidos pelo alocador
+        if reuse:
+            block_id = self.ram.acquire(mb, reason)
+        else:
+            block_id = self.ram.allocate(mb, reason)
+        self.series.record("ram", self.clock.time(), self.ram.used_mb / self.RAM_TOTAL_MB)
+        return block_id
+    
+    def ram_cleanup(self, aggressive: bool = False):
+        """Limpa memória RAM (despeja blocos reais, sem ajustar o total à mão)"""
+        max_age = self.config["ram_max_age"]
+        if aggressive:
+            # Limpeza agressiva: metade da idade e volta a metade do limiar
+            self.ram.evict_older_than(max_age / 2)
+            self.ram.shrink_to(self.RAM_TOTAL_MB * self.RAM_CLEANUP_THRESHOLD / 2)
+        else:
+            # Limpeza normal: mantém apenas blocos dos últimos max_age segundos
+            self.ram.evict_older_than(max_age)
+        self.series.record("ram", self.clock.time(), self.ram.used_mb / self.RAM_TOTAL_MB)
+    
+    def ram_maintenance(self):
+        """Manutenção da RAM (tarefa do agendador, a cada 30 s)"""
+        if self.ram_usage_percent() > 70:
+            self.ram_cleanup()
+    
+    def ram_usage_percent(self) -> float:
+        """Retorna porcentagem de uso da RAM"""
+        return self.ram.usage_percent()
+    
+    # ============================================================
+    # ======================= CPU ================================
+    # ============================================================
+    
+    def cpu_load(self):
+        """Calcula carga da CPU simulada"""
+        now = self.clock.time()
+        base = self.rng.uniform(0.1, 0.4)
+        ram_factor = self.ram.used_mb / self.RAM_TOTAL_MB
+        
+        # Fatores adicionais
+        message_factor = len(self.mensagens) * 0.02
+        time_factor = math.sin(now / 10) * 0.05
+        
+        load = base + ram_factor * 0.5 + message_factor + time_factor
+        self.registradores["LOAD"] = round(min(1.0, load), 3)
+        self.series.record("load", now, self.registradores["LOAD"])
+    
+    # ============================================================
+    # ======================= EMOÇÕES ============================
+    # ============================================================
+    
+    def atualizar_emocao(self, delta: float):
+        """Atualiza estado emocional"""
+        now = self.clock.time()
+        transicoes = self.emocao.adjust(delta, now)
+        self.series.record("dopamine", now, self.emocao.value_at(now))
+        self.ultima_amostra_emocao = now
+        if transicoes:
+            self.registrar_transicoes(transicoes)
+        
+        self.ram_allocate(2, "emotion_update")
+    
+    def registrar_transicoes(self, transicoes):
+        """Trocas de faixa emocional (agendadas ou por estímulo) vão para o HD"""
+        for at, anterior, nova in transicoes:
+            self.hd_write({
+                "type": "emotion",
+                "from": anterior,
+                "to": nova,
+                "at": at,
+                "dopamine": round(self.emocao.value_at(at), 4)
+            })
+    
+    def emotion_snapshot(self) -> Dict:
+        """Cópia serializável do estado emocional (sem histórico)"""
+        return self.emocao.snapshot()
+    
+    def get_emotion_state(self) -> str:
+        """Retorna estado emocional atual"""
+        return self.emocao.state
+    
+    def decay_emocao(self):
+        """Decaimento natural: só dispara transições vencidas e amostra 1x/s"""
+        now = self.clock.time()
+        if now >= self.emocao.next_transition:
+            self.registrar_transicoes(self.emocao.poll(now))
+        if now - self.ultima_amostra_emocao >= 1.0:
+            self.series.record("dopamine", now, self.emocao.value_at(now))
+            self.ultima_amostra_emocao = now
+    
+    # ============================================================
+    # ======================= LUZ ================================
+    # ============================================================
+    
+    def ligar_luz(self, intensidade: int = 100) -> str:
+        """Liga a luz do quarto"""
+        if not self.permissoes["light_control"]:
+            return "Light control disabled."
+        
+        self.luz_quarto["ligada"] = True
+        self.luz_quarto["intensidade"] = max(0, min(100, intensidade))
+        self.atualizar_emocao(0.05)
+        return f"Room light activated at {intensidade}% intensity."
+    
+    def desligar_luz(self) -> str:
+        """Desliga a luz do quarto"""
+        if not self.permissoes["light_control"]:
+            return "Light control disabled."
+        
+        self.luz_quarto["ligada"] = False
+        self.atualizar_emocao(0.02)
+        return "Room light deactivated."
+    
+    def ajustar_luz(self, intensidade: int) -> str:
+        """Ajusta intensidade da luz"""
+        if not self.luz_quarto["ligada"]:
+            return "Light is off. Turn it on first."
+        
+        intensidade = max(0, min(100, intensidade))
+        self.luz_quarto["intensidade"] = intensidade
+        return f"Light intensity adjusted to {intensidade}%."
+    
+    # ============================================================
+    # ======================= HD =================================
+    # ============================================================
+    
+    def hd_init(self):
+        """Inicializa HD virtual (na thread hd-init, ver start_hd)"""
+        from core.hd_index import HDIndex
+        from core.hd_snapshot import open_snapshot
+        from core.hd_storage import HDStorage, migrate_legacy_hd
+        from core.hd_writer import HDWriter
+        
+        hd = HDStorage(
+            HD_DIR,
+            version=VERSION,
+            segment_entries=self.config["hd_segment_entries"],
+            max_segments=self.config["hd_max_segments"],
+            fsync_every=self.config["hd_fsync_every"]
+        )
+        
+        # Snapshot colunar do HD antigo: mmap em vez de parsear o JSON
+        snapshot = None
+        try:
+            snapshot = open_snapshot(HD_FILE, HD_SNAPSHOT_FILE)
+        except Exception as e:
+            print(f"Erro ao abrir snapshot do HD: {e}")
+        
+        # Migração única do HD monolítico antigo
+        if not hd.meta["migrated_from"] and os.path.exists(HD_FILE):
+            try:
+                migrate_legacy_hd(HD_FILE, hd, snapshot)
+            except Exception as e:
+                print(f"Erro ao migrar HD: {e}")
+        
+        # Índices em memória sobre a janela retida
+        index = HDIndex(
+            capacity=self.config["hd_segment_entries"] * self.config["hd_max_segments"]
+        )
+        index.add_many(hd.iter_entries())
+        
+        # Worker único de escrita: o loop principal só enfileira
+        writer = HDWriter(hd, max_queue=self.config["hd_queue_size"])
+        self._hd, self._hd_snapshot, self._hd_index = hd, snapshot, index
+        with self._hd_lock:
+            # Escritas feitas durante a abertura entram na ordem em que chegaram
+            for entry in self._hd_pending:
+                index.add(entry)
+                writer.submit(entry)
+            self._hd_pending = []
+            # Por último: _hd_writer pronto = HD aberto (ver hd_write)
+            self._hd_writer = writer
+    
+    def start_hd(self):
+        """Abre o HD em segundo plano (snapshot, migração e índice somam
+        centenas de ms); frames e o loop do servidor não esperam por isso"""
+        owner = self.shared or self
+        with owner._hd_lock:
+            owner._spawn_hd()
+    
+    def _spawn_hd(self):
+        # Chamado com _hd_lock: uma única thread de abertura
+        if self._hd_thread is None:
+            self._hd_thread = threading.Thread(target=self._hd_open, name="hd-init", daemon=True)
+            self._hd_thread.start()
+    
+    def _hd_open(self):
+        try:
+            self.hd_init()
+        except BaseException as e:
+            self._hd_error = e
+            print(f"Erro ao abrir o HD: {e}")
+        finally:
+            self._hd_ready.set()
+    
+    def ensure_hd(self) -> "DarvisAssistant":
+        """Espera o HD aberto (leituras: status, integridade, rastros);
+        devolve quem o possui (a própria instância ou, numa sessão, o host)"""
+        owner = self.shared or self
+        if owner._hd_writer is None:
+            owner.start_hd()
+            owner._hd_ready.wait()
+            if owner._hd_error is not None:
+                raise RuntimeError("HD virtual indisponível") from owner._hd_error
+        return owner
+    
+    def hd_errors_sidecar(self) -> int:
+        """Erros já gravados (stats.json) + os que esperam o HD abrir"""
+        from core.hd_storage import STATS_FILE
+        
+        total = 0
+        try:
+            with open(os.path.join(HD_DIR, STATS_FILE), "r") as f:
+                total = int(json.load(f)["stats"]["total_errors"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        with self._hd_lock:
+            return total + sum(1 for entry in self._hd_pending if "error" in entry)
+    
+    @property
+    def hd(self) -> "HDStorage":
+        return self.ensure_hd()._hd
+    
+    @property
+    def hd_snapshot(self):
+        return self.ensure_hd()._hd_snapshot
+    
+    @property
+    def hd_index(self) -> "HDIndex":
+        return self.ensure_hd()._hd_index
+    
+    @property
+    def hd_writer(self) -> "HDWriter":
+        return self.ensure_hd()._hd_writer
+    
+    def hd_close(self):
+        """Espera a abertura em curso e drena a fila de escrita"""
+        if self._hd_thread is not None:
+            self._hd_thread.join()
+        if self._hd_writer is not None:
+            self._hd_writer.close()
+    
+    @property
+    def knowledge(self) -> KnowledgeBase:
+        """Base de conhecimento do host, carregada na primeira pergunta"""
+        owner = self.shared or self
+        if owner._knowledge is None:
+            # Índice em cache, refeito se algum JSON mudar
+            owner._knowledge = KnowledgeBase(KNOWLEDGE_DIR, KNOWLEDGE_CACHE)
+        return owner._knowledge
+    
+    def hd_write(self, entry: Dict):
+        """Escreve entrada no HD virtual"""
+        if not self.permissoes["disk"]:
+            return
+        
+        now = self.clock.time()
+        entry["timestamp"] = now
+        entry["datetime"] = datetime.fromtimestamp(now).isoformat()
+        if self.session_id is not None:
+            entry["session"] = self.session_id
+        
+        owner = self.shared or self
+        if owner._hd_writer is None:
+            with owner._hd_lock:
+                if owner._hd_writer is None:
+                    # HD ainda abrindo: guarda e segue (hd_init repassa em ordem)
+                    owner._hd_pending.append(entry)
+                    owner._spawn_hd()
+                    return
+        owner._hd_index.add(entry)
+        owner._hd_writer.submit(entry)
+    
+    def autosave(self):
+        """Salva o estado (tarefa do agendador, a cada 60 s)"""
+        self.hd_write({
+            "type": "autosave",
+            "ram_usage": self.ram.used_mb,
+            "emotion": self.emotion_snapshot(),
+            "state": self.registradores.copy()
+        })
+    
+    # ============================================================
+    # ======================= SONHOS =============================
+    # ============================================================
+    
+    def sonhar(self) -> bool:
+        """Processa 'sonhos' do sistema (só ocioso); True se sonhou.
+
+        LOAD >= 0.35 adia o sonho: é o mesmo teste que o loop original
+        fazia a cada frame antes de chamar sonhar(); o agendador refaz
+        a tentativa a cada DREAM_RETRY_SECONDS em vez de a cada frame.
+        """
+        if not self.permissoes["dreams"] or self.registradores["LOAD"] >= 0.35:
+            return False
+        
+        sonho = self.rng.choice(self.sonhos)
+        self.falar(sonho, PRIORITY_LOW)
+        self.ram_allocate(16, "dream")
+        
+        self.hd_write({
+            "type": "dream",
+            "dream": sonho,
+            "emotion_state": self.emocao.state
+        })
+        
+        self.ultimo_sonho = self.clock.time()
+        return True
+    
+    def tarefa_sonho(self):
+        """Tarefa do agendador: sonha a cada dream_interval; ocupado, tenta em breve"""
+        delay = self.config["dream_interval"] if self.sonhar() else DREAM_RETRY_SECONDS
+        self.scheduler.reschedule(self._tarefa_sonho, delay)
+    
+    # ============================================================
+    # ======================= MENSAGENS ==========================
+    # ============================================================
+    
+    def darvis_diz(self, texto: str, priority: int = PRIORITY_NORMAL):
+        """Adiciona mensagem para exibição (e fala enquanto estiver na tela)"""
+        mensagem = Message(
+            text=texto,
+            timestamp=self.clock.time(),
+            duration=6.0
+        )
+        self.mensagens.append(mensagem)
+        self.falar(texto, priority, ttl=mensagem.duration)
+        self.agendar_limpeza(mensagem.duration)
+    
+    def agendar_limpeza(self, delay: float):
+        """Uma limpeza pendente por vez, no vencimento da mensagem mais antiga"""
+        # Headless/sessões: quem consome as mensagens é o batch/servidor
+        if self.scheduler is None or self.headless:
+            return
+        if self._tarefa_limpeza is None:
+            self._tarefa_limpeza = self.scheduler.after(delay, self.limpar_mensagens_antigas,
+                                                        name="message_cleanup")
+        elif not self._tarefa_limpeza.active:
+            self.scheduler.reschedule(self._tarefa_limpeza, delay)
+    
+    def limpar_mensagens_antigas(self):
+        """Remove mensagens antigas"""
+        current_time = self.clock.time()
+        self.mensagens = [m for m in self.mensagens 
+                         if current_time - m.timestamp < m.duration]
+        if self.mensagens:
+            proxima = min(m.timestamp + m.duration for m in self.mensagens)
+            self.agendar_limpeza(proxima - current_time)
+    
+    # ============================================================
+    # ======================= IA =================================
+    # ============================================================
+    
+    def setup_commands(self):
+        """Registra as intenções de comando no roteador compilado"""
+        if self.shared is not None:
+            # Mesma trie do host, handlers desta sessão
+            self.router = self.shared.router.rebind(
+                lambda intent: getattr(self, intent.handler.__name__))
+            self.COMANDOS_PERMITIDOS = self.shared.COMANDOS_PERMITIDOS
+            return
+        
+        r = CommandRouter()
+        r.register("shutdown", [["desligar", "shutdown", "sair", "exit"]],
+                   self.cmd_shutdown, priority=100, exact=True)
+        r.register("confirm", [["sim", "yes", "confirmar", "confirm"]],
+                   self.cmd_confirm, priority=90, exact=True)
+        r.register("light_on", [["luz", "light"], ["ligar", "acender", "ligada", "on", "activate"]],
+                   self.cmd_light_on, priority=50, params={"intensity": first_int})
+        r.register("light_off", [["luz", "light"], ["desligar", "apagar", "desligada", "off", "deactivate"]],
+                   self.cmd_light_off, priority=50)
+        r.register("light_status", [["luz", "light"]], self.cmd_light_status, priority=40)
+        r.register("status", [["status", "sistema", "system"]], self.cmd_status, priority=30)
+        r.register("emotion", [["emoção", "emotion", "sentimento"]], self.cmd_emotion, priority=30)
+        r.register("idle", [["descansar", "modo descanso", "idle"]], self.cmd_idle, priority=30)
+        r.register("integrity", [["integridade", "integrity"]], self.cmd_integrity, priority=30)
+        r.register("trace", [["rastro", "trace", "replay"]], self.cmd_trace, priority=30)
+        r.register("help", [["ajuda", "help", "comandos"]], self.cmd_help, priority=20)
+        r.register("greeting", [["oi", "olá", "hello", "hi"]], self.cmd_greeting, priority=10)
+        # Perguntas só quando nenhum comando casa ("what is the system status" é status)
+        r.register("knowledge_area", [AREA_PREFIXES], self.cmd_knowledge_area, priority=6,
+                   params={"subject": lambda t: question_subject(t, AREA_PREFIXES)})
+        r.register("knowledge_what", [WHAT_PREFIXES], self.cmd_knowledge_what, priority=5,
+                   params={"subject": lambda t: question_subject(t, WHAT_PREFIXES)})
+        r.compile()
+        self.router = r
+        self.COMANDOS_PERMITIDOS = r.vocabulary()
+    
+    def processar_comando(self, cmd: str) -> Optional[str]:
+        """Processa comando do usuário; devolve a resposta (None se rejeitado)"""
+        if self.startup is not None:
+            return self.primeiro_comando(cmd)
+        # Qualquer entrada (mesmo rejeitada) tira o sistema do IDLE
+        self.marcar_atividade()
+        rota = self.validar_comando(cmd)
+        if rota is None:
+            return None
+        match, sugestao = rota
+        
+        self.last_command_time = self.clock.time()
+        
+        cmd_original = cmd
+        cmd = cmd.lower().strip()
+        
+        # Comando repetido reusa a área de trabalho (na política lru, fica quente)
+        self.ram_allocate(24, f"command_{cmd[:20]}", reuse=True)
+        self.registradores["COMMAND_COUNT"] += 1
+        
+        try:
+            # Sugestão só vale para o comando seguinte
+            if match is None or match.intent.name != "confirm":
+                self.sugestao_pendente = None
+            if match is not None:
+                resp = match()
+                if resp is None:
+                    return None
+            elif sugestao is not None:
+                self.sugestao_pendente = sugestao.text
+                resp = f"Did you mean '{sugestao.text}'? Say 'sim' to confirm."
+            else:
+                resp = f"Command executed: {cmd_original}"
+                self.atualizar_emocao(0.02)
+            
+            self.darvis_diz(resp)
+            
+            # Registrar no HD
+            self.hd_write({
+                "type": "command",
+                "cmd": cmd_original,
+                "response": resp,
+                "ram_usage": self.ram.used_mb,
+                "emotion": self.emotion_snapshot(),
+                "cpu_load": self.registradores["LOAD"]
+            })
+            return resp
+            
+        except Exception as e:
+            error_msg = f"Command processing error: {str(e)}"
+            self.darvis_diz(error_msg, PRIORITY_URGENT)
+            self.registradores["ERROR_COUNT"] += 1
+            self.hd_write({
+                "type": "error",
+                "cmd": cmd_original,
+                "error": str(e),
+                "timestamp": self.clock.time()
+            })
+            return error_msg
+    
+    def primeiro_comando(self, cmd: str) -> Optional[str]:
+        """Primeiro comando: fecha o relatório de partida"""
+        startup, self.startup = self.startup, None
+        resp = self.processar_comando(cmd)
+        startup.mark("first_command")
+        startup.finish()
+        return resp
+    
+    # ======================= INTENÇÕES ======================
+    
+    def cmd_confirm(self, match: CommandMatch) -> Optional[str]:
+        """Executa a última sugestão de "did you mean" """
+        pendente, self.sugestao_pendente = self.sugestao_pendente, None
+        sugestao = self.router.match(pendente) if pendente else None
+        if sugestao is None:
+            return "Nothing to confirm."
+        return sugestao()
+    
+    def cmd_greeting(self, match: CommandMatch) -> str:
+        return f"{self.rng.choice(self.respostas['greeting'])} How can I assist?"
+    
+    def cmd_light_on(self, match: CommandMatch) -> str:
+        intensity = match.params["intensity"]
+        return self.ligar_luz() if intensity is None else self.ligar_luz(intensity)
+    
+    def cmd_light_off(self, match: CommandMatch) -> str:
+        return self.desligar_luz()
+    
+    def cmd_light_status(self, match: CommandMatch) -> str:
+        return f"Light is {'ON' if self.luz_quarto['ligada'] else 'OFF'}"
+    
+    def cmd_status(self, match: CommandMatch) -> str:
+        # Headless/sessões: ninguém amostra a carga em segundo plano
+        if not self.carga_amostrada:
+            self.cpu_load()
+        cpu_load = self.registradores['LOAD']
+        ram_percent = self.ram_usage_percent()
+        owner = self.shared or self
+        if owner._hd_writer is not None:
+            errors = f"Errors (1h): {self.hd_index.count(type='error', since=self.clock.time() - 3600)}"
+        else:
+            # HD ainda abrindo: não espera a thread hd-init, usa o sidecar
+            errors = f"Errors (total): {owner.hd_errors_sidecar()} (HD loading)"
+        return (f"CPU: {cpu_load:.1%} | RAM: {ram_percent:.1f}% | Emotion: {self.emocao.state}"
+                f" | {errors}")
+    
+    def cmd_emotion(self, match: CommandMatch) -> str:
+        emotion = self.emocao.snapshot()
+        return f"Current emotional state: {emotion['state']} (Dopamine: {emotion['dopamine']:.2f})"
+    
+    def cmd_idle(self, match: CommandMatch) -> str:
+        self.atualizar_emocao(0.1)
+        if self.registradores["STATE"] == SystemState.ACTIVE.value:
+            self.registradores["STATE"] = SystemState.IDLE.value
+        return "Entering idle mode. Systems will conserve energy."
+    
+    def cmd_integrity(self, match: CommandMatch) -> str:
+        result = self.verificar_hd()
+        if result["ok"]:
+            resp = f"HD integrity OK. {result['checked']} records verified."
+            if result["unverified"]:
+                resp += f" {result['unverified']} unverified (no anchor)."
+            return resp
+        return f"HD integrity FAILED at record {result['first_bad']} ({result['reason']})."
+    
+    def traces(self):
+        """Rastros memory/logs do HD antigo (NumPy sobre o snapshot; uma vez no host)"""
+        owner = self.shared or self
+        if owner._traces is None:
+            snapshot = self.hd_snapshot
+            if snapshot is None:
+                return None
+            from core.hd_trace import LoadTrace, OpTrace
+            owner._traces = (OpTrace.from_snapshot(snapshot), LoadTrace.from_snapshot(snapshot))
+        return owner._traces
+    
+    def cmd_trace(self, match: CommandMatch) -> str:
+        try:
+            traces = self.traces()
+        except ImportError:
+            return "Trace replay needs numpy."
+        if traces is None:
+            return "No legacy memory trace available."
+        ops, logs = traces
+        summary, check = ops.summary(), ops.verify()
+        if check["ok"]:
+            verdict = f"{check['verified']} labelled ops consistent"
+        else:
+            verdict = f"{check['mismatches']} of {check['verified']} labelled ops mismatch"
+        resp = (f"Memory trace: {summary['ops']} ops replayed, final A={summary.get('final')}, "
+                f"{summary.get('resets', 0)} resets, {verdict}, "
+                f"{check['inferred']} inferred from A (unverified).")
+        if len(logs):
+            states = logs.by_state()
+            top = max(states, key=lambda name: states[name]["samples"])
+            share = states[top]["samples"] / len(logs)
+            resp += f" Logs: {len(logs)} samples, mostly {top} ({share:.0%}), mean load {logs.load.mean():.2f}."
+        return resp
+    
+    def cmd_knowledge_what(self, match: CommandMatch) -> str:
+        results = self.buscar_conhecimento(match)
+        if isinstance(results, str):
+            return results
+        best = results[0]
+        kind, name, path = best["kind"], best["name"], best["path"]
+        if kind == "area":
+            resp = f"{name} covers: {', '.join(best['children'])}."
+        elif kind == "topic":
+            resp = f"{name} is a topic of {path[0]}: {', '.join(best['children'])}."
+        else:
+            resp = f"{name} is a subject of {path[1]} ({path[0]})."
+        return resp + self.ver_tambem(results)
+    
+    def cmd_knowledge_area(self, match: CommandMatch) -> str:
+        results = self.buscar_conhecimento(match)
+        if isinstance(results, str):
+            return results
+        best = results[0]
+        if best["kind"] == "area":
+            return f"{best['name']} is itself an area of knowledge." + self.ver_tambem(results)
+        return f"{best['name']} is covered by {' > '.join(best['path'][:-1])}." + self.ver_tambem(results)
+    
+    def buscar_conhecimento(self, match: CommandMatch):
+        """Resultados ranqueados ou a resposta de erro (str)"""
+        subject = " ".join(match.params["subject"])
+        if not subject:
+            return "What should I look up? Try: o que é relatividade"
+        results = self.knowledge.search(subject, limit=3)
+        if not results:
+            return f"I have no knowledge about '{subject}'."
+        return results
+    
+    def ver_tambem(self, results: List[Dict]) -> str:
+        """Outros resultados relevantes (>= 30% da pontuação do primeiro)"""
+        others = [r["name"] for r in results[1:] if r["score"] >= 0.3 * results[0]["score"]]
+        return f" See also: {', '.join(others)}." if others else ""
+    
+    def cmd_help(self, match: CommandMatch) -> str:
+        return ("Available commands: status, luz ligar/desligar, descansar, emoção, integridade, rastro, "
+                "o que é <assunto>, qual área <assunto>, desligar")
+    
+    def cmd_shutdown(self, match: CommandMatch) -> None:
+        self.darvis_diz("Initiating shutdown sequence. Goodbye.", PRIORITY_URGENT)
+        self.shutdown()
+    
+    # ============================================================
+    # ======================= ESTADO =============================
+    # ============================================================
+    
+    def marcar_atividade(self):
+        """Entrada do usuário: volta (ou permanece) em ACTIVE"""
+        self.last_activity = self.clock.time()
+        if self.registradores["STATE"] == SystemState.IDLE.value:
+            self.registradores["STATE"] = SystemState.ACTIVE.value
+    
+    def atualizar_estado(self):
+        """ACTIVE -> IDLE após idle_after segundos sem atividade"""
+        if self.registradores["STATE"] != SystemState.ACTIVE.value:
+            return
+        if self.clock.time() - self.last_activity >= self.config["idle_after"]:
+            self.registradores["STATE"] = SystemState.IDLE.value
+    
+    def tick_simulado(self):
+        """Tempo virtual: o que o loop da janela faz a cada frame"""
+        self.atualizar_estado()
+        self.cpu_load()
+        self.decay_emocao()
+    
+    def shutdown(self):
+        """Desliga o sistema de forma segura (idempotente: o fim de run()
+        chama de novo depois de ESC, 'desligar' ou 'quit' no terminal)"""
+        if self.encerrado:
+            return
+        self.encerrado = True
+        self.running = False
+        self.registradores["STATE"] = SystemState.SHUTDOWN.value
+        
+        # Para o agendador na hora (nenhuma thread dormindo 60 s)
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        
+        # Sessão: encerra só ela; HD e voz pertencem ao host
+        if self.shared is not None:
+            self.hd_write({
+                "type": "session_end",
+                "final_emotion": self.emotion_snapshot(),
+                "commands": self.registradores["COMMAND_COUNT"]
+            })
+            return
+        
+        # Salvar estado final
+        self.hd_write({
+            "type": "shutdown",
+            "final_state": self.registradores.copy(),
+            "final_emotion": self.emotion_snapshot(),
+            "total_runtime": self.clock.time() - self.registradores["UPTIME"],
+            "tasks": self.scheduler.stats()
+        })
+        
+        # Drenar fila de escrita antes de sair
+        self.hd_close()
+        
+        # Despedida (URGENT) ainda é falada; o resto da fila é descartado
+        if self._voz_thread is not None:
+            self._voz_thread.join(2.0)
+        if self.speech is not None:
+            self.speech.close()
+        
+        # Salvar configurações
+        self.save_config()
+        
+        if self.headless:
+            return
+        self.close_graphics()
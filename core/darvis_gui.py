@@ -0,0 +1,420 @@
+# core/darvis_gui.py
+# ============================================================
+# DARVIS — JANELA, HUD E LOOP DE FRAMES
+# ============================================================
+# - Mixin do DarvisAssistant com tudo que depende do pygame
+# - pygame (e o cache de textos/compositor, que o importam) só
+#   é carregado em setup_graphics(): o modo headless não paga
+#   os ~250 ms de import
+# - Fontes abertas pelo arquivo já resolvido (FontCache), sem
+#   varrer as fontes do sistema a cada partida
+# ============================================================
+
+import math
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from core.darvis_config import APP_NAME, FONT_CACHE_FILE, VERSION, EmotionState, SystemState
+
+pygame = None  # carregado por load_pygame()
+
+
+def load_pygame():
+    """Importa o pygame na primeira janela (módulo global deste arquivo)"""
+    global pygame
+    if pygame is None:
+        import pygame as _pygame
+        pygame = _pygame
+    return pygame
+
+
+class DarvisGUI:
+    """Janela do assistente; espera os atributos do DarvisAssistant"""
+    
+    # ============================================================
+    # ======================= JANELA =============================
+    # ============================================================
+    
+    def setup_graphics(self):
+        """Configura o sistema gráfico"""
+        load_pygame()
+        from core.text_cache import AlphaSurfacePool, FontCache, TextCache
+        
+        pygame.init()
+        self.screen = pygame.display.set_mode((900, 540))
+        pygame.display.set_caption(f"{APP_NAME} v{VERSION}")
+        self.frame_clock = pygame.time.Clock()
+        
+        # Fontes pelo arquivo já resolvido (varredura só para nomes novos)
+        self.fonts = FontCache(FONT_CACHE_FILE)
+        self.font_mono = self.fonts.get("Consolas", 16)
+        self.font_title = self.fonts.get("Arial", 24, bold=True)
+        self.font_small = self.fonts.get("Consolas", 14)
+        
+        # Cores do tema
+        self.colors = self.get_theme_colors()
+        
+        # Cache de textos e fundo alfa reaproveitado
+        self.text_cache = TextCache(max_entries=512)
+        self.alpha_pool = AlphaSurfacePool(900, 22)
+        
+        # Rótulos estáticos do HUD renderizados uma única vez
+        self.hud_title = self.font_title.render("DARVIS SYSTEM STATUS", True, self.colors["accent"])
+        self.hud_labels = [
+            self.font_mono.render(label, True, self.colors["text"])
+            for label in ("• CPU Load: ", "• RAM Usage: ", "• RAM Frag: ", "• Emotion: ", "• Dopamine: ",
+                          "• Light: ", "• Uptime: ", "• Commands: ", "• Safe Mode: ")
+        ]
+        self.hud_rect = pygame.Rect(10, 10, 350, 40 + 22 * len(self.hud_labels))
+        self.spark_rect = pygame.Rect(10, self.hud_rect.bottom + 8, 350, 80)
+        
+        self.setup_compositor()
+    
+    def setup_compositor(self):
+        """Camadas da janela: base estática + regiões dinâmicas"""
+        from core.compositor import LayeredCompositor
+        
+        comp = LayeredCompositor(self.screen, dirty_rects=self.config["dirty_rects"])
+        comp.set_base(self.render_base)
+        
+        cx, cy = 450, 270
+        comp.add_layer("animation", (cx - 118, cy - 118, 236, 236),
+                       lambda _: self.render_animation(), always=True)
+        comp.add_layer("hud", self.hud_rect,
+                       self.render_hud_values, key=self.hud_values)
+        comp.add_layer("sparkline", self.spark_rect,
+                       self.render_sparklines, key=lambda: self.series.version("load"))
+        comp.add_layer("messages", (0, 400, 900, 124),
+                       self.render_messages, key=self.mensagens_visiveis)
+        comp.add_layer("fps", (850, 8, 50, 20),
+                       self.render_fps, key=lambda: f"FPS: {self.frame_clock.get_fps():.1f}")
+        comp.add_layer("profiler", (560, 30, 330, 28),
+                       self.render_profiler_overlay, key=self.profiler_overlay_key)
+        self.compositor = comp
+    
+    def render_base(self, surface):
+        """Fundo e moldura do HUD (estáticos)"""
+        surface.fill(self.colors["bg"])
+        self.draw_rounded_rect(surface, self.colors["hud_bg"], self.hud_rect, 8)
+        surface.blit(self.hud_title, (20, 15))
+        info_y = 50
+        for label in self.hud_labels:
+            surface.blit(label, (20, info_y))
+            info_y += 22
+        
+        # Painel do histórico (legenda fixa)
+        self.draw_rounded_rect(surface, self.colors["hud_bg"], self.spark_rect, 8)
+        x = self.spark_rect.x + 10
+        for text, color in self.spark_legend():
+            label = self.font_small.render(text, True, color)
+            surface.blit(label, (x, self.spark_rect.y + 5))
+            x += label.get_width() + 12
+    
+    def get_theme_colors(self) -> Dict:
+        """Retorna paleta de cores baseada no tema"""
+        if self.config["theme"] == "dark":
+            return {
+                "bg": (18, 28, 45),
+                "text": (220, 230, 255),
+                "accent": (100, 150, 255),
+                "warning": (255, 180, 100),
+                "success": (100, 255, 180),
+                "error": (255, 100, 100),
+                "hud_bg": (30, 40, 60, 180)
+            }
+        else:  # light theme
+            return {
+                "bg": (240, 245, 255),
+                "text": (30, 40, 60),
+                "accent": (60, 100, 200),
+                "warning": (200, 120, 50),
+                "success": (50, 180, 100),
+                "error": (200, 50, 50),
+                "hud_bg": (220, 230, 245, 200)
+            }
+    
+    def setup_input_thread(self):
+        """Configura thread para entrada de comandos"""
+        self.input_queue = queue.Queue()
+        threading.Thread(target=self.input_thread, daemon=True).start()
+    
+    # ============================================================
+    # ======================= INPUT ==============================
+    # ============================================================
+    
+    def input_thread(self):
+        """Thread para capturar entrada do usuário"""
+        while self.running:
+            try:
+                user_input = input("\nVocê > ")
+                if user_input.lower() == 'quit':
+                    self.running = False
+                    break
+                self.input_queue.put(user_input)
+            except (EOFError, KeyboardInterrupt):
+                self.running = False
+                break
+            except:
+                time.sleep(0.1)
+    
+    # ============================================================
+    # ======================= GRÁFICOS ===========================
+    # ============================================================
+    
+    def get_emotion_color(self) -> Tuple[int, int, int]:
+        """Retorna cor baseada no estado emocional"""
+        state = self.emocao.state
+        if state == EmotionState.LOW.value:
+            return (150, 150, 200)
+        elif state == EmotionState.CALM.value:
+            return (100, 150, 255)
+        elif state == EmotionState.CONTENT.value:
+            return (100, 200, 100)
+        elif state == EmotionState.SATISFIED.value:
+            return (255, 200, 100)
+        else:  # EXCITED
+            return (255, 100, 150)
+    
+    def render_hud(self):
+        """Renderiza o HUD do sistema (moldura + valores)"""
+        self.draw_rounded_rect(self.screen, self.colors["hud_bg"], self.hud_rect, 8)
+        self.screen.blit(self.hud_title, (20, 15))
+        info_y = 50
+        for label in self.hud_labels:
+            self.screen.blit(label, (20, info_y))
+            info_y += 22
+        self.render_hud_values()
+    
+    def hud_values(self) -> Tuple[str, ...]:
+        """Valores do HUD; a tupla é a chave de redesenho da camada"""
+        dopamine = self.emocao.dopamine
+        return (
+            f"{self.registradores['LOAD']:.1%}",
+            f"{self.ram.used_mb}/{self.RAM_TOTAL_MB} MB ({self.ram_usage_percent():.1f}%)",
+            f"{self.ram.fragmentation():.1%} / {sum(self.ram.evictions.values())} evicted",
+            self.emocao.band_for(dopamine),
+            f"{dopamine:.3f}",
+            'ON' if self.luz_quarto['ligada'] else 'OFF',
+            self.format_uptime(),
+            str(self.registradores['COMMAND_COUNT']),
+            'ON' if self.safe_mode else 'OFF'
+        )
+    
+    def render_hud_values(self, values: Optional[Tuple[str, ...]] = None):
+        """Só os valores do HUD (rótulos ficam na base estática)"""
+        info_y = 50
+        for label, value in zip(self.hud_labels, values or self.hud_values()):
+            text = self.text_cache.render(self.font_mono, value, self.colors["text"])
+            self.screen.blit(text, (20 + label.get_width(), info_y))
+            info_y += 22
+    
+    def spark_legend(self) -> List[Tuple[str, Tuple[int, int, int]]]:
+        return [("Last 2 min:", self.colors["text"]),
+                ("dopamine", self.colors["success"]),
+                ("load", self.colors["accent"]),
+                ("ram", self.colors["warning"])]
+    
+    def render_sparklines(self, state=None):
+        """Médias por segundo dos últimos 2 minutos (0..1)"""
+        area = self.spark_rect.inflate(-20, -34).move(0, 10)
+        points = 120
+        step = area.width / (points - 1)
+        for (_, color), name in zip(self.spark_legend()[1:], ("dopamine", "load", "ram")):
+            values = self.series.sparkline(name, points)
+            if len(values) < 2:
+                continue
+            x0 = area.right - step * (len(values) - 1)
+            line = [(x0 + i * step, area.bottom - min(1.0, max(0.0, v)) * area.height)
+                    for i, v in enumerate(values)]
+            pygame.draw.lines(self.screen, color, False, line, 1)
+    
+    def avancar_animacao(self, dt_ms: float):
+        """Avança a animação pelo tempo real (mesma velocidade em qualquer FPS)"""
+        self.angle += 0.02 * self.config["animation_speed"] * (dt_ms / (1000 / 60))
+    
+    def render_animation(self):
+        """Renderiza animação central"""
+        cx, cy = 450, 270
+        
+        # Partículas orbitais
+        for i in range(6):
+            angle_offset = self.angle + (i * math.pi / 3)
+            radius = 90 + math.sin(self.angle * 2 + i) * 10
+            x = int(cx + math.cos(angle_offset) * radius)
+            y = int(cy + math.sin(angle_offset) * radius)
+            
+            # Cor baseada na emoção
+            color = self.get_emotion_color()
+            
+            # Partícula com glow
+            pygame.draw.circle(self.screen, color, (x, y), 8)
+            pygame.draw.circle(self.screen, (*color, 100), (x, y), 15, 2)
+        
+        # Centro
+        pygame.draw.circle(self.screen, (255, 255, 255), (cx, cy), 5)
+    
+    def mensagens_visiveis(self) -> Tuple[Tuple[str, int], ...]:
+        """(texto, alfa do fundo) das últimas 5 mensagens ainda visíveis"""
+        now = self.clock.time()
+        visible = []
+        for msg in reversed(self.mensagens[-5:]):
+            if now - msg.timestamp < msg.duration:
+                # Calcular transparência baseada no tempo restante
+                time_left = msg.duration - (now - msg.timestamp)
+                alpha = min(255, int(time_left * 50))
+                visible.append((msg.text, alpha // 2))
+        return tuple(visible)
+    
+    def render_messages(self, visible: Optional[Tuple[Tuple[str, int], ...]] = None):
+        """Renderiza mensagens do sistema"""
+        y_pos = 500
+        if visible is None:
+            visible = self.mensagens_visiveis()
+        for text, bg_alpha in visible:
+            # Renderizar com fundo
+            text_surface = self.text_cache.render(self.font_mono, text, (255, 255, 200))
+            bg_rect = pygame.Rect(10, y_pos - 2, text_surface.get_width() + 10, 22)
+            
+            # Fundo semi-transparente (superfície reaproveitada)
+            bg_surface, area = self.alpha_pool.filled(bg_rect.size, (20, 30, 50, bg_alpha))
+            self.screen.blit(bg_surface, bg_rect, area)
+            
+            self.screen.blit(text_surface, (15, y_pos))
+            y_pos -= 24
+    
+    def draw_rounded_rect(self, surface, color, rect, radius):
+        """Desenha retângulo com cantos arredondados"""
+        pygame.draw.rect(surface, color, rect, border_radius=radius)
+    
+    def format_uptime(self) -> str:
+        """Formata tempo de atividade"""
+        seconds = int(self.clock.time() - self.registradores["UPTIME"])
+        
+        if seconds < 60:
+            return f"{seconds}s"
+        elif seconds < 3600:
+            minutes = seconds // 60
+            return f"{minutes}m {seconds % 60}s"
+        else:
+            hours = seconds // 3600
+            minutes = (seconds % 3600) // 60
+            return f"{hours}h {minutes}m"
+    
+    # ============================================================
+    # ======================= LOOP PRINCIPAL =====================
+    # ============================================================
+    
+    def render_fps(self, text: Optional[str] = None):
+        """Contador de FPS (debug)"""
+        text = text or f"FPS: {self.frame_clock.get_fps():.1f}"
+        surface = self.text_cache.render(self.font_small, text, (150, 150, 150))
+        self.screen.blit(surface, (850, 10))
+    
+    def profiler_overlay_key(self):
+        """Linhas atuais do overlay (None se oculto); ajusta a área da camada"""
+        if not (self.show_profiler and self.profiler.enabled):
+            return None
+        # Percentis recalculados a cada 30 frames medidos, não a cada frame
+        if not self.profiler_lines or self.profiler.sampled % 30 == 0:
+            self.profiler_lines = self.profiler.overlay_lines()
+        self.compositor.set_rect("profiler", (560, 30, 330, 18 * len(self.profiler_lines) + 10))
+        return tuple(self.profiler_lines)
+    
+    def render_profiler_overlay(self, lines: Optional[Tuple[str, ...]]):
+        """Overlay com p50/p95/p99 (ms) de cada fase do frame"""
+        if not lines:
+            return
+        
+        rect = pygame.Rect(560, 30, 330, 18 * len(lines) + 10)
+        self.draw_rounded_rect(self.screen, self.colors["hud_bg"], rect, 6)
+        y = rect.y + 5
+        for line in lines:
+            text = self.text_cache.render(self.font_small, line, self.colors["text"])
+            self.screen.blit(text, (rect.x + 8, y))
+            y += 18
+    
+    def export_profile(self) -> str:
+        """Exporta os tempos por fase para um arquivo JSON"""
+        path = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        self.profiler.export(path)
+        self.darvis_diz(f"Profile exported to {path}.")
+        return path
+    
+    def run(self):
+        """Loop principal do aplicativo"""
+        self.darvis_diz(f"System online. Version {VERSION}. Safe mode active.")
+        self.registradores["STATE"] = SystemState.ACTIVE.value
+        prof = self.profiler
+        comp = self.compositor
+        expose_events = {getattr(pygame, name) for name in ("VIDEOEXPOSE", "WINDOWEXPOSED")
+                         if hasattr(pygame, name)}
+        
+        while self.running:
+            # Taxa adaptativa: quiosque ocioso gasta menos CPU
+            dt = self.frame_clock.tick(self.frame_rate())
+            prof.begin_frame()
+            
+            # Atualizar sistemas
+            self.atualizar_estado()
+            self.cpu_load()
+            prof.lap("cpu_load")
+            # Emoção, sonhos e limpeza de mensagens: só o que venceu
+            self.scheduler.run_pending()
+            prof.lap("scheduler")
+            
+            # Processar eventos
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.shutdown()
+                    return
+                elif event.type in expose_events:
+                    comp.invalidate()
+                elif event.type == pygame.KEYDOWN:
+                    self.marcar_atividade()
+                    if event.key == pygame.K_ESCAPE:
+                        self.shutdown()
+                        return
+                    elif event.key == pygame.K_F3:
+                        self.show_profiler = not self.show_profiler
+                    elif event.key == pygame.K_F4:
+                        self.export_profile()
+            prof.lap("event_pump")
+            
+            # Processar comandos da fila
+            while not self.input_queue.empty():
+                try:
+                    cmd = self.input_queue.get_nowait()
+                    self.processar_comando(cmd)
+                except queue.Empty:
+                    break
+            prof.lap("command_queue")
+            
+            # Renderização: só as regiões alteradas
+            self.avancar_animacao(dt)
+            prof.lap("animation_step")
+            # Uma fase por camada (render_animation, render_hud, ...) + "fill"
+            rects = comp.compose(prof)
+            comp.present(rects)
+            prof.lap("display_update")
+            prof.end_frame()
+            if self.startup is not None:
+                self.startup.mark("first_frame")
+                self.startup.finish()
+                self.startup = None
+        
+        # 'quit'/EOF no terminal só baixam running: drena o HD e fecha a janela
+        self.shutdown()
+    
+    def frame_rate(self) -> int:
+        if self.registradores["STATE"] == SystemState.IDLE.value:
+            return self.config["fps_idle"]
+        return self.config["fps_active"]
+    
+    def close_graphics(self):
+        """Fecha a janela e encerra o processo (fim do modo gráfico)"""
+        pygame.quit()
+        sys.exit()
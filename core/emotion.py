@@ -0,0 +1,110 @@
+# core/emotion.py
+# ============================================================
+# MODELO EMOCIONAL PREGUIÇOSO (DECAIMENTO EM FORMA FECHADA)
+# ============================================================
+# - Guarda só (valor, instante da última mudança)
+# - Leitura calcula o decaimento linear analiticamente:
+#     v(t) = max(piso, v0 - taxa * (t - t0))
+#   -> nada roda por frame e o resultado não depende do FPS
+# - Faixas (LOW, CALM, ...) por limites superiores; a próxima
+#   troca de faixa por decaimento tem hora marcada e só é
+#   disparada por poll() quando essa hora chega
+# ============================================================
+
+import math
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# (instante, faixa anterior, faixa nova)
+Transition = Tuple[float, str, str]
+
+
+class EmotionModel:
+    """Dopamina com decaimento contínuo e transições de faixa agendadas"""
+
+    def __init__(self, value: float, decay_per_second: float,
+                 bands: Sequence[Tuple[float, str]], now: Optional[float] = None,
+                 clock: Callable[[], float] = time.time,
+                 floor: float = 0.0, ceiling: float = 1.0):
+        self.clock = clock
+        self.rate = max(0.0, float(decay_per_second))
+        self.bands = list(bands)
+        self.floor = floor
+        self.ceiling = ceiling
+        self.last_update = self.clock() if now is None else now
+        self._value = min(ceiling, max(floor, value))
+        self._state = self.band_for(self._value)
+        self.next_transition = self._schedule()
+
+    # ======================= LEITURA ========================
+
+    def value_at(self, t: float) -> float:
+        if t <= self.last_update or not self.rate:
+            return self._value
+        return max(self.floor, self._value - self.rate * (t - self.last_update))
+
+    @property
+    def dopamine(self) -> float:
+        return self.value_at(self.clock())
+
+    @property
+    def state(self) -> str:
+        return self.band_for(self.dopamine)
+
+    def band_for(self, value: float) -> str:
+        for upper, name in self.bands:
+            if value < upper:
+                return name
+        return self.bands[-1][1]
+
+    def _lower_bound(self, state: str) -> float:
+        lower = self.floor
+        for upper, name in self.bands:
+            if name == state:
+                return lower
+            lower = upper
+        return lower
+
+    def _schedule(self) -> float:
+        """Hora em que o decaimento cruza o limite inferior da faixa atual"""
+        lower = self._lower_bound(self._state)
+        if not self.rate or lower <= self.floor:
+            return math.inf
+        return self.last_update + (self._value - lower) / self.rate
+
+    # ======================= EVENTOS ========================
+
+    def poll(self, now: Optional[float] = None) -> List[Transition]:
+        """Transições de faixa vencidas até now (normalmente nenhuma: O(1))"""
+        now = self.clock() if now is None else now
+        fired: List[Transition] = []
+        while now >= self.next_transition:
+            at = self.next_transition
+            previous = self._state
+            self._state = self.band_for(self._lower_bound(previous) - 1e-12)
+            fired.append((at, previous, self._state))
+            # Reagenda a partir do limite recém-cruzado
+            lower = self._lower_bound(self._state)
+            if lower <= self.floor:
+                self.next_transition = math.inf
+            else:
+                self.next_transition = self.last_update + (self._value - lower) / self.rate
+        return fired
+
+    def adjust(self, delta: float, now: Optional[float] = None) -> List[Transition]:
+        """Soma delta ao valor atual; devolve as transições ocorridas"""
+        now = self.clock() if now is None else now
+        fired = self.poll(now)
+        self._value = min(self.ceiling, max(self.floor, self.value_at(now) + delta))
+        self.last_update = now
+        state = self.band_for(self._value)
+        if state != self._state:
+            fired.append((now, self._state, state))
+            self._state = state
+        self.next_transition = self._schedule()
+        return fired
+
+    def snapshot(self, now: Optional[float] = None) -> dict:
+        now = self.clock() if now is None else now
+        value = self.value_at(now)
+        return {"dopamine": value, "state": self.band_for(value), "last_update": self.last_update}
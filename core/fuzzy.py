@@ -0,0 +1,97 @@
+# core/fuzzy.py
+# ============================================================
+# CASAMENTO TOLERANTE A ERROS (ÍNDICE DE TRIGRAMAS)
+# ============================================================
+# - Cada palavra do vocabulário vira trigramas com bordas ("$$lu")
+# - Candidatos = palavras que dividem trigramas com a consulta,
+#   contados num único passe pelas listas invertidas
+# - Só os melhores candidatos passam pela distância de edição
+#   (Damerau/OSA: "stauts" -> "status" custa 1)
+# - Custo ~ O(trigramas da consulta x lista média), não
+#   O(vocabulário x distância de edição)
+# ============================================================
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def trigrams(word: str) -> Set[str]:
+    padded = f"$${word}$$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Distância de Damerau-Levenshtein restrita (transposição = 1)"""
+    if a == b:
+        return 0
+    if not a or not b:
+        return len(a) or len(b)
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if (prev2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def similarity(a: str, b: str) -> float:
+    """1.0 = iguais; 0.0 = nada em comum"""
+    longest = max(len(a), len(b))
+    return 1.0 - edit_distance(a, b) / longest if longest else 1.0
+
+
+class TrigramIndex:
+    """Índice invertido trigrama -> palavras"""
+
+    def __init__(self, words: Iterable[str] = (), candidates: int = 8):
+        self.max_candidates = candidates
+        self.words: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._grams: Dict[str, List[int]] = {}
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        if word in self._ids:
+            return
+        word_id = len(self.words)
+        self.words.append(word)
+        self._ids[word] = word_id
+        for gram in trigrams(word):
+            self._grams.setdefault(gram, []).append(word_id)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._ids
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def best(self, word: str, threshold: float = 0.65) -> Optional[Tuple[str, float]]:
+        """Palavra mais parecida com similaridade >= threshold (ou None)"""
+        if word in self._ids:
+            return word, 1.0
+
+        shared: Dict[int, int] = {}
+        for gram in trigrams(word):
+            for word_id in self._grams.get(gram, ()):
+                shared[word_id] = shared.get(word_id, 0) + 1
+        if not shared:
+            return None
+
+        ranked = heapq.nlargest(self.max_candidates, shared.items(), key=lambda item: item[1])
+        best = None
+        for word_id, _ in ranked:
+            candidate = self.words[word_id]
+            # Filtro barato: diferença de tamanho já estoura o limite
+            if 1.0 - abs(len(candidate) - len(word)) / max(len(candidate), len(word)) < threshold:
+                continue
+            score = similarity(word, candidate)
+            if score >= threshold and (best is None or score > best[1]):
+                best = (candidate, score)
+        return best
@@ -0,0 +1,256 @@
+# core/hd_chain.py
+# ============================================================
+# HD VIRTUAL — CADEIA DE HASH COM CHECKPOINTS MERKLE
+# ============================================================
+# - Cada registro compromete o hash anterior:
+#     hash_n = SHA256(hash_{n-1} || seq_n || corpo_n)
+# - O corpo é a própria linha JSON gravada (sem sort_keys, sem
+#   segunda serialização); o sufixo ,"seq":N,"hash":"..."} é
+#   anexado ao texto já pronto
+# - A cada N registros grava-se um checkpoint com a raiz Merkle
+#   das folhas do bloco; verify(intervalo) só relê os blocos
+#   que tocam a janela
+# - Rotação: o hash do último registro descartado vira a âncora
+#   do primeiro retido (state["anchor"]); sem âncora, o primeiro
+#   registro é contado como não verificado, não como verificado
+# - Cauda: a janela que chega a next_seq precisa terminar em
+#   next_seq-1 com hash == head; bloco aberto no fim das linhas falha
+# ============================================================
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+GENESIS = "0" * 64
+_SEQ_MARK = '"seq":'
+_HASH_MARK = ',"hash":"'
+
+
+def chain_digest(prev: str, seq: int, body: str) -> str:
+    h = hashlib.sha256(bytes.fromhex(prev))
+    h.update(seq.to_bytes(8, "big"))
+    h.update(body.encode("utf-8"))
+    return h.hexdigest()
+
+
+def merkle_root(leaves: List[str]) -> str:
+    """Raiz Merkle (hex) de uma lista de folhas hex"""
+    if not leaves:
+        return GENESIS
+    level = [bytes.fromhex(leaf) for leaf in leaves]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest()
+                 for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+
+def split_line(line: str) -> Optional[Tuple[str, int, str]]:
+    """Separa (corpo, seq, hash) de uma linha selada; None se não selada"""
+    line = line.rstrip("\n")
+    cut = line.rfind(_SEQ_MARK)
+    if cut < 1 or not line.endswith('"}') or line[cut - 1] not in ",{":
+        return None
+    seq_text, sep, digest = line[cut + len(_SEQ_MARK):-2].partition(_HASH_MARK)
+    if not sep or len(digest) != 64:
+        return None
+    try:
+        seq = int(seq_text)
+    except ValueError:
+        return None
+    body = line[:cut - 1] + "}" if line[cut - 1] == "," else "{}"
+    return body, seq, digest
+
+
+class HashChain:
+    """Estado da cadeia + checkpoints; usado pelo único escritor do HD"""
+
+    def __init__(self, state: Dict, checkpoint_path: str, checkpoint_every: int = 128):
+        self.state = state
+        state.setdefault("next_seq", 0)
+        state.setdefault("head", GENESIS)
+        state.setdefault("leaves", [])
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = max(2, int(checkpoint_every))
+        self._lock = threading.Lock()
+        self.checkpoints: List[Dict] = self._load_checkpoints()
+
+    # ======================= ESCRITA ========================
+
+    def seal(self, body: str) -> Tuple[str, int, str]:
+        """Encadeia o corpo JSON; devolve (linha, seq, hash)"""
+        seq = self.state["next_seq"]
+        digest = chain_digest(self.state["head"], seq, body)
+        sep = "" if body == "{}" else ","
+        line = f'{body[:-1]}{sep}{_SEQ_MARK}{seq}{_HASH_MARK}{digest}"}}'
+        self.state["next_seq"] = seq + 1
+        self.state["head"] = digest
+        self.state["leaves"].append(digest)
+        if len(self.state["leaves"]) >= self.checkpoint_every:
+            self._checkpoint()
+        return line, seq, digest
+
+    def recover(self, lines: Iterable[str]):
+        """Reaplica linhas gravadas depois do último sidecar salvo"""
+        for line in lines:
+            parts = split_line(line)
+            if parts is None or parts[1] < self.state["next_seq"]:
+                continue
+            _, seq, digest = parts
+            self.state["next_seq"] = seq + 1
+            self.state["head"] = digest
+            self.state["leaves"].append(digest)
+            if len(self.state["leaves"]) >= self.checkpoint_every:
+                self._checkpoint()
+
+    def _checkpoint(self):
+        leaves = self.state["leaves"]
+        end = self.state["next_seq"]
+        prev = self.checkpoints[-1]["digest"] if self.checkpoints else GENESIS
+        record = {
+            "start": end - len(leaves),
+            "end": end,
+            "root": merkle_root(leaves),
+            "head": self.state["head"]
+        }
+        record["digest"] = hashlib.sha256(
+            (prev + record["root"] + record["head"]).encode()).hexdigest()
+        with self._lock:
+            self.checkpoints.append(record)
+        with open(self.checkpoint_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        self.state["leaves"] = []
+
+    def anchor(self, seq: int, prev_hash: str):
+        """Hash do registro seq-1 (descartado): ancora a janela que começa em seq"""
+        self.state["anchor"] = {"seq": seq, "prev": prev_hash}
+
+    def prune(self, first_seq: int):
+        """Descarta checkpoints anteriores à janela retida"""
+        with self._lock:
+            keep = [c for c in self.checkpoints if c["end"] >= first_seq]
+            if len(keep) == len(self.checkpoints):
+                return
+            self.checkpoints = keep
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w") as f:
+            for record in keep:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp, self.checkpoint_path)
+
+    def _load_checkpoints(self) -> List[Dict]:
+        checkpoints = []
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "r") as f:
+                for line in f:
+                    try:
+                        checkpoints.append(json.loads(line))
+                    except ValueError:
+                        continue
+        return checkpoints
+
+    # ======================= VERIFICAÇÃO ====================
+
+    def block_bounds(self, start: int, end: int) -> Tuple[int, int]:
+        """Expande [start, end) para cobrir blocos de checkpoint inteiros"""
+        with self._lock:
+            checkpoints = list(self.checkpoints)
+        lo, hi = start, end
+        # Recua até uma fronteira de checkpoint para ancorar a janela
+        containing = [c["start"] for c in checkpoints if c["start"] <= start < c["end"]]
+        ends = [c["end"] for c in checkpoints if c["end"] <= start]
+        if containing:
+            lo = containing[0]
+        elif ends:
+            lo = max(ends)
+        for c in checkpoints:
+            if c["start"] < end <= c["end"]:
+                hi = c["end"]
+        return lo, hi
+
+    def verify(self, lines: Iterable[str], start: int, end: int) -> Dict:
+        """Verifica registros com seq em [start, end) a partir das linhas dadas.
+
+        checked: hash recalculado a partir de uma âncora confiável;
+        unverified: sem âncora (corpo não conferido); unsealed: conferidos
+        só pela cadeia, fora de um bloco Merkle completo. Se a janela vai
+        até next_seq, o último registro tem de ser next_seq-1 com o hash
+        igual a state["head"] (cauda truncada ou reescrita falha).
+        """
+        with self._lock:
+            checkpoints = {c["start"]: c for c in self.checkpoints}
+            by_end = {c["end"]: c for c in self.checkpoints}
+        anchor = self.state.get("anchor") or {}
+        next_seq, head = self.state["next_seq"], self.state["head"]
+
+        result = {"ok": True, "checked": 0, "unverified": 0, "unsealed": 0, "blocks": 0,
+                  "first_bad": None, "reason": None, "anchored": False}
+
+        def fail(seq, reason):
+            result.update(ok=False, first_bad=seq, reason=reason)
+            return result
+
+        prev_seq, prev_hash = None, None
+        block: Optional[Dict] = None
+        leaves: List[str] = []
+        sealed_to = start  # primeiro seq depois do último bloco Merkle conferido
+
+        for line in lines:
+            parts = split_line(line)
+            if parts is None:
+                continue
+            body, seq, digest = parts
+            if seq >= end and block is None:
+                break
+
+            # Âncora do primeiro registro: gênese, último descartado ou checkpoint
+            if prev_seq is None:
+                if seq == 0:
+                    prev_hash = GENESIS
+                elif seq == anchor.get("seq"):
+                    prev_hash = anchor["prev"]
+                elif seq in by_end:
+                    prev_hash = by_end[seq]["head"]
+                if prev_hash is not None:
+                    result["anchored"] = True
+            elif seq != prev_seq + 1:
+                return fail(seq, "sequence gap")
+
+            if prev_hash is not None and chain_digest(prev_hash, seq, body) != digest:
+                return fail(seq, "hash mismatch")
+            counted = start <= seq < end
+            if counted:
+                result["checked" if prev_hash is not None else "unverified"] += 1
+
+            # Raízes Merkle dos blocos completos
+            if block is None and seq in checkpoints:
+                block, leaves = checkpoints[seq], []
+            if block is None:
+                if counted and prev_hash is not None:
+                    result["unsealed"] += 1
+            else:
+                leaves.append(digest)
+                if seq + 1 == block["end"]:
+                    if merkle_root(leaves) != block["root"] or digest != block["head"]:
+                        return fail(block["start"], "checkpoint mismatch")
+                    result["blocks"] += 1
+                    sealed_to = max(sealed_to, block["end"])
+                    block = None
+
+            prev_seq, prev_hash = seq, digest
+            if block is None and seq + 1 >= end:
+                break
+
+        # Linhas acabaram no meio de um bloco com checkpoint gravado
+        if block is not None:
+            return fail(block["start"], "truncated block")
+        # A janela chega à cabeça: o fim das linhas tem de ser o fim da cadeia
+        if start < next_seq <= end:
+            if prev_seq != next_seq - 1:
+                return fail(start if prev_seq is None else prev_seq + 1, "truncated tail")
+            if prev_hash != head:
+                return fail(sealed_to, "head mismatch")
+        return result
@@ -0,0 +1,249 @@
+# core/hd_index.py
+# ============================================================
+# HD VIRTUAL — ÍNDICES SECUNDÁRIOS E CONSULTAS
+# ============================================================
+# - Índices por type, timestamp, emotion_state e cmd
+# - Varredura por intervalo de tempo via busca binária
+# - Contadores mantidos incrementalmente (agregados em O(1))
+# - Janela limitada, igual à retenção dos segmentos
+# ============================================================
+
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+def entry_type(entry: Dict) -> str:
+    """Tipo da entrada (inclui os formatos antigos do hd_virtual.json)"""
+    if "type" in entry:
+        return entry["type"]
+    if "dream" in entry:
+        return "dream"
+    if "cmd" in entry or "command" in entry:
+        return "command"
+    if "LOAD" in entry:
+        return "sample"
+    return "unknown"
+
+
+def entry_time(entry: Dict) -> float:
+    return float(entry.get("timestamp", entry.get("time", 0.0)))
+
+
+def entry_emotion_state(entry: Dict) -> Optional[str]:
+    if "emotion_state" in entry:
+        return entry["emotion_state"]
+    emotion = entry.get("emotion")
+    if isinstance(emotion, dict):
+        return emotion.get("state")
+    return None
+
+
+def entry_cmd(entry: Dict) -> Optional[str]:
+    cmd = entry.get("cmd", entry.get("command"))
+    if isinstance(cmd, str):
+        return cmd.lower().strip()
+    return None
+
+
+class _Postings:
+    """Lista ordenada de seqs com remoção preguiçosa do início"""
+
+    __slots__ = ("seqs", "head")
+
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.head = 0
+
+    def append(self, seq: int):
+        self.seqs.append(seq)
+
+    def evict_below(self, low: int):
+        self.head = bisect_left(self.seqs, low, self.head)
+        if self.head > 1024 and self.head * 2 > len(self.seqs):
+            del self.seqs[:self.head]
+            self.head = 0
+
+    def range(self, lo: int, hi: int) -> range:
+        """Posições (em self.seqs) com lo <= seq < hi"""
+        start = bisect_left(self.seqs, lo, self.head)
+        end = bisect_left(self.seqs, hi, start)
+        return range(start, end)
+
+    def __len__(self) -> int:
+        return len(self.seqs) - self.head
+
+
+class HDIndex:
+    """Índices em memória sobre as entradas retidas do HD virtual"""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = max(1, int(capacity))
+        self._lock = threading.Lock()
+
+        # Armazenamento principal: seq -> posição (seq - base)
+        self._entries: List[Dict] = []
+        self._times: List[float] = []
+        self._base = 0
+        self._head = 0
+
+        self._by_type: Dict[str, _Postings] = {}
+        self._by_state: Dict[str, _Postings] = {}
+        self._by_cmd: Dict[str, _Postings] = {}
+        self.type_counts = Counter()
+
+    # ======================= ESCRITA ========================
+
+    @property
+    def next_seq(self) -> int:
+        return self._base + len(self._entries)
+
+    @property
+    def low_seq(self) -> int:
+        return self._base + self._head
+
+    def add(self, entry: Dict) -> int:
+        """Indexa uma entrada e devolve seu número de sequência"""
+        with self._lock:
+            return self._add(entry)
+
+    def add_many(self, entries: Iterable[Dict]):
+        with self._lock:
+            for entry in entries:
+                self._add(entry)
+
+    def _add(self, entry: Dict) -> int:
+        seq = self.next_seq
+        t = entry_time(entry)
+        # Mantém o eixo de tempo monotônico para a busca binária
+        if self._times and t < self._times[-1]:
+            t = self._times[-1]
+        self._entries.append(entry)
+        self._times.append(t)
+
+        kind = entry_type(entry)
+        self._postings(self._by_type, kind).append(seq)
+        self.type_counts[kind] += 1
+
+        state = entry_emotion_state(entry)
+        if state:
+            self._postings(self._by_state, state).append(seq)
+
+        cmd = entry_cmd(entry)
+        if cmd:
+            self._postings(self._by_cmd, cmd).append(seq)
+
+        if self.next_seq - self.low_seq > self.capacity:
+            self._evict(self.next_seq - self.capacity)
+        return seq
+
+    @staticmethod
+    def _postings(index: Dict[str, _Postings], key: str) -> _Postings:
+        postings = index.get(key)
+        if postings is None:
+            postings = index[key] = _Postings()
+        return postings
+
+    def _evict(self, low: int):
+        """Descarta entradas com seq < low"""
+        while self.low_seq < low:
+            entry = self._entries[self._head]
+            self._entries[self._head] = None
+            self._head += 1
+
+            kind = entry_type(entry)
+            self.type_counts[kind] -= 1
+            if not self.type_counts[kind]:
+                del self.type_counts[kind]
+            # Cada seq só aparece nas postings das suas próprias chaves
+            for index, key in ((self._by_type, kind),
+                               (self._by_state, entry_emotion_state(entry)),
+                               (self._by_cmd, entry_cmd(entry))):
+                postings = index.get(key) if key else None
+                if postings is not None:
+                    postings.evict_below(self.low_seq)
+                    if not postings:
+                        del index[key]
+
+        if self._head > 1024 and self._head * 2 > len(self._entries):
+            del self._entries[:self._head]
+            del self._times[:self._head]
+            self._base += self._head
+            self._head = 0
+
+    # ======================= CONSULTAS ======================
+
+    def _seq_range(self, since: Optional[float], until: Optional[float]):
+        """Converte [since, until) em intervalo de seqs"""
+        lo, hi = self._head, len(self._entries)
+        if since is not None:
+            lo = bisect_left(self._times, since, lo, hi)
+        if until is not None:
+            hi = bisect_left(self._times, until, lo, hi)
+        return self._base + lo, self._base + hi
+
+    def _candidates(self, type, emotion_state, cmd):
+        """Escolhe a menor lista de postings entre os filtros dados"""
+        lists = []
+        for index, key in ((self._by_type, type),
+                           (self._by_state, emotion_state),
+                           (self._by_cmd, cmd.lower().strip() if cmd else None)):
+            if key is not None:
+                lists.append(index.get(key, _Postings()))
+        if not lists:
+            return None
+        return min(lists, key=len)
+
+    def query(self, type: Optional[str] = None, emotion_state: Optional[str] = None,
+              cmd: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, limit: Optional[int] = None,
+              newest_first: bool = False) -> List[Dict]:
+        """Entradas que satisfazem todos os filtros, em ordem de escrita"""
+        with self._lock:
+            return list(self._iter(type, emotion_state, cmd, since, until, limit, newest_first))
+
+    def _iter(self, type, emotion_state, cmd, since, until, limit, newest_first) -> Iterator[Dict]:
+        lo, hi = self._seq_range(since, until)
+        postings = self._candidates(type, emotion_state, cmd)
+        if postings is None:
+            seqs = range(lo, hi)
+        else:
+            positions = postings.range(lo, hi)
+            seqs = (postings.seqs[i] for i in (reversed(positions) if newest_first else positions))
+        if postings is None and newest_first:
+            seqs = reversed(seqs)
+
+        cmd_key = cmd.lower().strip() if cmd else None
+        found = 0
+        for seq in seqs:
+            if limit is not None and found >= limit:
+                return
+            entry = self._entries[seq - self._base]
+            if type is not None and entry_type(entry) != type:
+                continue
+            if emotion_state is not None and entry_emotion_state(entry) != emotion_state:
+                continue
+            if cmd_key is not None and entry_cmd(entry) != cmd_key:
+                continue
+            found += 1
+            yield entry
+
+    def count(self, type: Optional[str] = None, emotion_state: Optional[str] = None,
+              cmd: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None) -> int:
+        """Conta entradas; com um único filtro indexado custa O(log n)"""
+        with self._lock:
+            filters = [f for f in (type, emotion_state, cmd) if f is not None]
+            lo, hi = self._seq_range(since, until)
+            if not filters:
+                return hi - lo
+            if len(filters) == 1:
+                return len(self._candidates(type, emotion_state, cmd).range(lo, hi))
+            return sum(1 for _ in self._iter(type, emotion_state, cmd, since, until, None, False))
+
+    def latest(self, type: Optional[str] = None, n: int = 1) -> List[Dict]:
+        return self.query(type=type, limit=n, newest_first=True)
+
+    def __len__(self) -> int:
+        return self.next_seq - self.low_seq
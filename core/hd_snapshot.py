@@ -0,0 +1,324 @@
+# core/hd_snapshot.py
+# ============================================================
+# HD VIRTUAL — SNAPSHOT COLUNAR BINÁRIO (MMAP)
+# ============================================================
+# - Converte "memory"/"logs" do hd_virtual.json em colunas tipadas
+# - Inteiros em int64, reais em float64, textos com dicionário
+# - Sem perdas: coluna mista int/float guarda uma máscara de
+#   inteiros (1 volta como 1, não 1.0); null é um valor (código
+#   "null" no dicionário), distinto de campo ausente
+# - Lido via mmap no boot: nenhuma entrada é parseada até ser usada
+# - Reconstruído só quando o JSON de origem muda (tamanho/mtime)
+# ============================================================
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.hd_stream import iter_hd_entries, read_hd_header
+
+MAGIC = b"DRVSNAP1"
+FORMAT = 2  # snapshots de outro formato são reconstruídos
+ALIGN = 8
+
+INT_MISSING = -(2 ** 63)
+FLOAT_MISSING = float("nan")
+STR_MISSING = 0  # código 0 = campo ausente
+FLOAT_EXACT_INT = 2 ** 53  # inteiros maiores não cabem num float64 sem perda
+_ABSENT = object()
+
+
+def _pad(n: int) -> int:
+    return (ALIGN - n % ALIGN) % ALIGN
+
+
+class _ColumnBuilder:
+    """Coluna em construção; promove int -> float e str -> json conforme necessário"""
+
+    __slots__ = ("kind", "values", "vocab", "seen", "ints")
+
+    def __init__(self, rows: int):
+        self.kind = "int"
+        self.values = array("q", [INT_MISSING]) * rows
+        self.vocab: Dict[str, int] = {}
+        self.seen = 0
+        self.ints: Optional[array] = None  # coluna float: 1 = valor era int
+
+    def _code(self, text: str) -> int:
+        code = self.vocab.get(text)
+        if code is None:
+            code = self.vocab[text] = len(self.vocab) + 1
+        return code
+
+    def _to_float(self):
+        """int -> float marcando os inteiros (inteiro sem float64 exato: json)"""
+        if any(v != INT_MISSING and abs(v) >= FLOAT_EXACT_INT for v in self.values):
+            self._to_text("json")
+            return
+        self.ints = array("B", (0 if v == INT_MISSING else 1 for v in self.values))
+        self.values = array("d", (FLOAT_MISSING if v == INT_MISSING else float(v)
+                                  for v in self.values))
+        self.kind = "float"
+
+    def _to_text(self, kind: str):
+        """Converte para códigos de dicionário ("str" puro ou "json" misto)"""
+        old_kind, old, old_vocab = self.kind, self.values, self.vocab
+        self.kind = kind
+        self.vocab = {}
+        self.values = array("I")
+        if old_kind == "str":
+            texts = sorted(old_vocab, key=old_vocab.get)
+            remap = [STR_MISSING] + [self._code(json.dumps(t, ensure_ascii=False)) for t in texts]
+            self.values = array("I", (remap[v] for v in old))
+            return
+        ints, self.ints = self.ints, None
+        for i, v in enumerate(old):
+            if old_kind == "int":
+                missing = v == INT_MISSING
+            else:
+                missing = v != v
+                v = int(v) if ints[i] else v
+            self.values.append(STR_MISSING if missing else self._code(json.dumps(v)))
+
+    def missing(self):
+        if self.kind == "int":
+            self.values.append(INT_MISSING)
+        elif self.kind == "float":
+            self.values.append(FLOAT_MISSING)
+            self.ints.append(0)
+        else:
+            self.values.append(STR_MISSING)
+
+    def append(self, value: Any):
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        # Sem representação exata na coluna numérica: vai como JSON
+        if is_number and isinstance(value, float):
+            is_number = value == value
+        elif is_number:
+            limit = FLOAT_EXACT_INT if self.kind == "float" else 2 ** 63
+            is_number = value != INT_MISSING and abs(value) < limit
+
+        if self.kind in ("int", "float") and not is_number:
+            if isinstance(value, str) and not self.seen:
+                self._to_text("str")
+            else:
+                self._to_text("json")
+        elif self.kind == "str" and not isinstance(value, str):
+            self._to_text("json")
+
+        if isinstance(value, float) and self.kind == "int":
+            self._to_float()
+
+        if self.kind == "json":
+            self.values.append(self._code(json.dumps(value, ensure_ascii=False)))
+        elif self.kind == "str":
+            self.values.append(self._code(value))
+        else:
+            if self.kind == "float":
+                self.ints.append(isinstance(value, int))
+            self.values.append(value)
+        self.seen += 1
+
+
+def build_snapshot(json_path: str, snapshot_path: str,
+                   sections=("memory", "logs")) -> Dict:
+    """Converte o hd_virtual.json num snapshot colunar (uma passada, streaming)"""
+    tables: Dict[str, Dict[str, _ColumnBuilder]] = {name: {} for name in sections}
+    rows = {name: 0 for name in sections}
+
+    for section, entry in iter_hd_entries(json_path, sections):
+        columns = tables[section]
+        if not isinstance(entry, dict):
+            entry = {"value": entry}
+        for key, value in entry.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = _ColumnBuilder(rows[section])
+            column.append(value)
+        for key, column in columns.items():
+            if key not in entry:
+                column.missing()
+        rows[section] += 1
+
+    stat = os.stat(json_path)
+    header = {
+        "format": FORMAT,
+        "source": {"size": stat.st_size, "mtime": stat.st_mtime},
+        "byteorder": sys.byteorder,
+        "meta": read_hd_header(json_path),
+        "sections": {}
+    }
+
+    # Layout: MAGIC | u32 tamanho do cabeçalho | cabeçalho JSON | colunas alinhadas
+    blobs: List[bytes] = []
+    offset = 0
+    for section in sections:
+        section_info = {"rows": rows[section], "columns": {}}
+        for key, column in tables[section].items():
+            data = column.values.tobytes()
+            info = {"kind": column.kind, "typecode": column.values.typecode,
+                    "offset": offset, "length": len(data)}
+            if column.kind in ("str", "json"):
+                info["vocab"] = sorted(column.vocab, key=column.vocab.get)
+            blobs.append(data + b"\0" * _pad(len(data)))
+            offset += len(data) + _pad(len(data))
+            if column.kind == "float" and any(column.ints):
+                # Máscara de inteiros (uint8 por linha) logo após a coluna
+                mask = column.ints.tobytes()
+                info["int_mask"] = {"offset": offset, "length": len(mask)}
+                blobs.append(mask + b"\0" * _pad(len(mask)))
+                offset += len(mask) + _pad(len(mask))
+            section_info["columns"][key] = info
+        header["sections"][section] = section_info
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    prefix = len(MAGIC) + 4 + len(header_bytes)
+    header_bytes += b" " * _pad(prefix)
+
+    tmp = snapshot_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, snapshot_path)
+    return header
+
+
+class HDSnapshot:
+    """Visão somente leitura (mmap) de um snapshot colunar"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Arquivo vazio não pode ser mapeado
+            self._file.close()
+            raise ValueError(f"Snapshot vazio: {path}")
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Snapshot inválido: {path}")
+        (header_len,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(bytes(self._mmap[start:start + header_len]))
+        self._data_start = start + header_len
+        if self.header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError("Snapshot gerado com outra ordem de bytes")
+        self._view = memoryview(self._mmap)
+
+    @property
+    def meta(self) -> Dict:
+        return self.header["meta"]
+
+    def rows(self, section: str) -> int:
+        return self.header["sections"][section]["rows"]
+
+    def columns(self, section: str) -> List[str]:
+        return list(self.header["sections"][section]["columns"])
+
+    def column_info(self, section: str, name: str) -> Dict:
+        return self.header["sections"][section]["columns"][name]
+
+    def column(self, section: str, name: str) -> memoryview:
+        """Coluna crua, sem cópia (int64, float64 ou códigos de dicionário uint32)"""
+        info = self.column_info(section, name)
+        start = self._data_start + info["offset"]
+        return self._view[start:start + info["length"]].cast(info["typecode"])
+
+    def vocab(self, section: str, name: str) -> List[str]:
+        """Dicionário da coluna de texto; o código i corresponde a vocab[i - 1]"""
+        return self.column_info(section, name).get("vocab", [])
+
+    def int_mask(self, section: str, name: str) -> Optional[memoryview]:
+        """Coluna float mista: 1 onde o valor original era inteiro (None se não há)"""
+        mask = self.column_info(section, name).get("int_mask")
+        if mask is None:
+            return None
+        start = self._data_start + mask["offset"]
+        return self._view[start:start + mask["length"]]
+
+    def _decode(self, info: Dict, raw, is_int: bool = False) -> Any:
+        """Valor original; _ABSENT para campo ausente (null é um valor)"""
+        kind = info["kind"]
+        if kind == "int":
+            return _ABSENT if raw == INT_MISSING else raw
+        if kind == "float":
+            if raw != raw:
+                return _ABSENT
+            return int(raw) if is_int else raw
+        if raw == STR_MISSING:
+            return _ABSENT
+        text = info["vocab"][raw - 1]
+        return json.loads(text) if kind == "json" else text
+
+    def iter_rows(self, section: str) -> Iterator[Dict]:
+        """Reconstrói as entradas originais, uma por vez"""
+        infos = self.header["sections"][section]["columns"]
+        cols = [(name, info, self.column(section, name), self.int_mask(section, name))
+                for name, info in infos.items()]
+        for i in range(self.rows(section)):
+            entry = {}
+            for name, info, col, ints in cols:
+                value = self._decode(info, col[i], ints is not None and ints[i])
+                if value is not _ABSENT:
+                    entry[name] = value
+            yield entry
+
+    def close(self):
+        try:
+            if getattr(self, "_view", None) is not None:
+                self._view.release()
+                self._view = None
+            if not self._mmap.closed:
+                self._mmap.close()
+        except BufferError:
+            # Ainda há colunas em uso; o mmap é liberado pelo coletor
+            pass
+        self._file.close()
+
+
+def snapshot_is_fresh(json_path: str, snapshot_path: str) -> bool:
+    """True se o snapshot corresponde à versão atual do JSON"""
+    if not os.path.exists(snapshot_path):
+        return False
+    try:
+        with open(snapshot_path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return False
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len))
+    except (OSError, ValueError, struct.error):
+        return False
+    if header.get("format") != FORMAT:
+        return False
+    stat = os.stat(json_path)
+    source = header.get("source", {})
+    return source.get("size") == stat.st_size and source.get("mtime") == stat.st_mtime
+
+
+def open_snapshot(json_path: str, snapshot_path: str) -> Optional[HDSnapshot]:
+    """Abre o snapshot, reconstruindo-o se o JSON de origem mudou"""
+    if not os.path.exists(json_path):
+        return HDSnapshot(snapshot_path) if os.path.exists(snapshot_path) else None
+    if not snapshot_is_fresh(json_path, snapshot_path):
+        build_snapshot(json_path, snapshot_path)
+    return HDSnapshot(snapshot_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python -m core.hd_snapshot <hd_virtual.json> <hd_virtual.snap>")
+        sys.exit(1)
+
+    info = build_snapshot(sys.argv[1], sys.argv[2])
+    for name, section in info["sections"].items():
+        print(f"{name}: {section['rows']} entradas, {len(section['columns'])} colunas")
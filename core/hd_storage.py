@@ -0,0 +1,399 @@
+# core/hd_storage.py
+# ============================================================
+# HD VIRTUAL — MOTOR DE ARMAZENAMENTO EM SEGMENTOS
+# ============================================================
+# - Log append-only em segmentos JSON-lines (seg-000001.jsonl, ...)
+# - fsync em lote (a cada N entradas ou T segundos)
+# - Rotação de segmentos substitui o antigo logs[-500:]
+# - Estatísticas num sidecar pequeno (stats.json)
+# - Registros encadeados por hash (ver core/hd_chain.py)
+# - verify() repetida sem mudança nos arquivos reaproveita o
+#   último resultado (muitas sessões pedindo "integridade")
+# ============================================================
+
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from core.hd_chain import HashChain, split_line
+from core.hd_stream import iter_hd_array, read_hd_header
+
+SEGMENT_PREFIX = "seg-"
+SEGMENT_SUFFIX = ".jsonl"
+STATS_FILE = "stats.json"
+CHECKPOINT_FILE = "checkpoints.jsonl"
+
+
+def _segment_name(segment_id: int) -> str:
+    return f"{SEGMENT_PREFIX}{segment_id:06d}{SEGMENT_SUFFIX}"
+
+
+def _count_lines(path: str) -> int:
+    """Conta linhas completas de um segmento"""
+    count = 0
+    with open(path, "rb") as f:
+        for _ in f:
+            count += 1
+    return count
+
+
+class HDStorage:
+    """Log append-only segmentado; cada escrita custa O(entrada)"""
+
+    def __init__(self, directory: str, version: str = "",
+                 segment_entries: int = 500, max_segments: int = 2,
+                 fsync_every: int = 32, fsync_interval: float = 1.0,
+                 checkpoint_every: int = 128):
+        self.directory = directory
+        self.segment_entries = max(1, int(segment_entries))
+        self.max_segments = max(1, int(max_segments))
+        self.fsync_every = max(1, int(fsync_every))
+        self.fsync_interval = fsync_interval
+
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.time()
+        self._verified = None  # ((start, end, impressão dos arquivos), resultado)
+        self._closed_counts: Dict[int, int] = {}  # linhas reais dos segmentos fechados
+
+        os.makedirs(directory, exist_ok=True)
+        self.meta = self._load_meta(version)
+        self.segments = self._scan_segments()
+        if not self.segments:
+            self.segments = [1]
+        self._segment_count = self._current_segment_lines()
+
+        self.chain = HashChain(self.meta.setdefault("chain", {}),
+                               os.path.join(directory, CHECKPOINT_FILE),
+                               checkpoint_every)
+        # Linhas gravadas após o último sidecar salvo (queda antes do sync)
+        self.chain.recover(self._iter_segment_lines(self.segments[-1]))
+
+    # ======================= SIDECAR ========================
+
+    def _load_meta(self, version: str) -> Dict:
+        """Carrega (ou cria) o sidecar de estatísticas"""
+        meta = {
+            "version": version,
+            "created": datetime.now().isoformat(),
+            "migrated_from": None,
+            "total_entries": 0,
+            "stats": {
+                "total_commands": 0,
+                "total_dreams": 0,
+                "total_errors": 0
+            }
+        }
+        path = os.path.join(self.directory, STATS_FILE)
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    stored = json.load(f)
+                meta.update(stored)
+            except (OSError, ValueError):
+                pass
+        return meta
+
+    def _save_meta(self):
+        """Grava o sidecar de forma atômica"""
+        path = os.path.join(self.directory, STATS_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp, path)
+
+    @property
+    def stats(self) -> Dict:
+        return self.meta["stats"]
+
+    @property
+    def pending(self) -> int:
+        """Entradas escritas ainda sem fsync"""
+        return self._pending
+
+    # ======================= SEGMENTOS ======================
+
+    def _scan_segments(self) -> List[int]:
+        ids = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                try:
+                    ids.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(ids)
+
+    def segment_path(self, segment_id: int) -> str:
+        return os.path.join(self.directory, _segment_name(segment_id))
+
+    def _current_segment_lines(self) -> int:
+        path = self.segment_path(self.segments[-1])
+        if not os.path.exists(path):
+            return 0
+        return _count_lines(path)
+
+    def _open_current(self):
+        if self._file is None:
+            self._file = open(self.segment_path(self.segments[-1]), "a", encoding="utf-8")
+        return self._file
+
+    def _rotate(self):
+        """Fecha o segmento atual, abre o próximo e aplica retenção"""
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        self._closed_counts[self.segments[-1]] = self._segment_count
+        self.segments.append(self.segments[-1] + 1)
+        self._segment_count = 0
+
+        dropped = []
+        while len(self.segments) > self.max_segments:
+            dropped.append(self.segments.pop(0))
+            self._closed_counts.pop(dropped[-1], None)
+        if not dropped:
+            return
+
+        # Âncora gravada antes de apagar: o primeiro registro retido
+        # continua verificável sem o segmento anterior
+        last = self._last_record(dropped[-1])
+        if last is not None:
+            self.chain.anchor(last[1] + 1, last[2])
+            self._save_meta()
+        for segment_id in dropped:
+            try:
+                os.remove(self.segment_path(segment_id))
+            except OSError:
+                pass
+
+        first_seq = self._first_seq(self.segments[0])
+        if first_seq is None and last is not None:
+            first_seq = last[1] + 1
+        if first_seq is not None:
+            self.chain.prune(first_seq)
+
+    # ======================= ESCRITA ========================
+
+    def _count_stats(self, entry: Dict):
+        stats = self.meta["stats"]
+        if "cmd" in entry:
+            stats["total_commands"] += 1
+        if "dream" in entry:
+            stats["total_dreams"] += 1
+        if "error" in entry:
+            stats["total_errors"] += 1
+
+    def append(self, entry: Dict):
+        """Acrescenta uma entrada ao log"""
+        self.append_many([entry])
+
+    def append_many(self, entries: Iterable[Dict]):
+        """Acrescenta várias entradas com um único flush"""
+        for entry in entries:
+            if self._segment_count >= self.segment_entries:
+                self._rotate()
+            body = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+            line, seq, digest = self.chain.seal(body)
+            entry["seq"] = seq
+            entry["hash"] = digest
+            self._open_current().write(line + "\n")
+            self._segment_count += 1
+            self._pending += 1
+            self.meta["total_entries"] += 1
+            self._count_stats(entry)
+
+        if self._file is not None:
+            self._file.flush()
+
+        if (self._pending >= self.fsync_every
+                or time.time() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def sync(self):
+        """Força fsync do segmento atual e grava o sidecar"""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._save_meta()
+        self._pending = 0
+        self._last_sync = time.time()
+
+    def close(self):
+        """Sincroniza e fecha o segmento aberto"""
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ======================= LEITURA ========================
+
+    def _iter_segment_lines(self, segment_id: int) -> Iterator[str]:
+        try:
+            with open(self.segment_path(segment_id), "r", encoding="utf-8") as f:
+                yield from f
+        except OSError:
+            # Segmento removido pela rotação durante a leitura
+            return
+
+    def _first_seq(self, segment_id: int) -> Optional[int]:
+        for line in self._iter_segment_lines(segment_id):
+            parts = split_line(line)
+            if parts is not None:
+                return parts[1]
+        return None
+
+    def _last_record(self, segment_id: int) -> Optional[tuple]:
+        last = None
+        for line in self._iter_segment_lines(segment_id):
+            parts = split_line(line)
+            if parts is not None:
+                last = parts
+        return last
+
+    def iter_entries(self) -> Iterator[Dict]:
+        """Percorre as entradas retidas, da mais antiga para a mais nova"""
+        if self._file is not None:
+            self._file.flush()
+        for segment_id in list(self.segments):
+            for line in self._iter_segment_lines(segment_id):
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Linha truncada por queda de energia
+                    continue
+
+    def iter_lines(self, start: int, end: int) -> Iterator[str]:
+        """Linhas seladas com seq em [start, end), pulando segmentos inteiros"""
+        segments = list(self.segments)
+        firsts = [self._first_seq(s) for s in segments]
+        for i, segment_id in enumerate(segments):
+            following = next((f for f in firsts[i + 1:] if f is not None), None)
+            if following is not None and following <= start:
+                continue
+            for line in self._iter_segment_lines(segment_id):
+                parts = split_line(line)
+                if parts is None or parts[1] < start:
+                    continue
+                if parts[1] >= end:
+                    return
+                yield line
+
+    def verify(self, start: Optional[int] = None, end: Optional[int] = None) -> Dict:
+        """Verifica a cadeia de hash no intervalo de seqs [start, end)"""
+        if self._file is not None:
+            self._file.flush()
+        if start is None:
+            start = self._first_seq(self.segments[0]) or 0
+        if end is None:
+            end = self.chain.state["next_seq"]
+        lo, hi = self.chain.block_bounds(start, end)
+        key = (start, end, self._fingerprint())
+        if self._verified is None or self._verified[0] != key:
+            self._verified = (key, self.chain.verify(self.iter_lines(lo, hi), start, end))
+        return dict(self._verified[1])
+
+    def _fingerprint(self) -> tuple:
+        """(tamanho, mtime) dos segmentos e checkpoints: muda com qualquer escrita"""
+        paths = [self.segment_path(s) for s in self.segments] + [self.chain.checkpoint_path]
+        stamps = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stamps.append((path, st.st_size, st.st_mtime_ns))
+            except OSError:
+                stamps.append((path, None, None))
+        return tuple(stamps)
+
+    def __len__(self) -> int:
+        """Entradas retidas: linhas reais de cada segmento (um segmento
+        fechado pode ter menos que segment_entries, ex.: migração retomada)"""
+        total = self._segment_count
+        for segment_id in self.segments[:-1]:
+            count = self._closed_counts.get(segment_id)
+            if count is None:
+                path = self.segment_path(segment_id)
+                count = _count_lines(path) if os.path.exists(path) else 0
+                self._closed_counts[segment_id] = count
+            total += count
+        return total
+
+
+# ============================================================
+# ======================= MIGRAÇÃO ===========================
+# ============================================================
+
+def migrate_legacy_hd(json_path: str, storage: HDStorage, snapshot=None) -> int:
+    """Importa os logs do hd_virtual.json monolítico (uma única vez).
+
+    Antes de importar grava no sidecar o seq inicial ("migrating"); se o
+    processo cair no meio, a próxima chamada retoma do que já está nos
+    segmentos (next_seq - seq inicial) em vez de importar tudo de novo.
+    Contadores do cabeçalho antigo (se houver) somam-se aos do HD; os
+    logs importados já contados não entram duas vezes.
+    """
+    if storage.meta.get("migrated_from"):
+        return 0
+    name = os.path.basename(json_path)
+
+    # Lê do snapshot mmap se houver; senão, do JSON em streaming
+    if snapshot is not None:
+        header = snapshot.meta
+        logs = snapshot.iter_rows("logs")
+    else:
+        header = read_hd_header(json_path)
+        logs = iter_hd_array(json_path, "logs")
+
+    progress = storage.meta.get("migrating")
+    if progress and progress.get("source") == name:
+        # Retomada: entradas já seladas (recover() refez next_seq) não se repetem
+        done = storage.chain.state["next_seq"] - progress["start_seq"]
+        storage.meta["total_entries"] = progress["total_entries"] + done
+        logs = itertools.islice(logs, done, None)
+    else:
+        done = 0
+        storage.meta["migrating"] = {
+            "source": name,
+            "start_seq": storage.chain.state["next_seq"],
+            "total_entries": storage.meta["total_entries"],
+            "stats": dict(storage.stats)
+        }
+        storage.sync()
+
+    before = storage.meta["total_entries"]
+    storage.append_many(logs)
+    migrated = done + storage.meta["total_entries"] - before
+
+    # Cabeçalho antigo conta tudo o que já houve (os logs retidos são uma
+    # parte): HD anterior + o maior entre o importado e o cabeçalho
+    legacy_stats = header.get("stats")
+    if isinstance(legacy_stats, dict):
+        before_stats = storage.meta["migrating"].get("stats", {})
+        for key in storage.stats:
+            legacy = legacy_stats.get(key)
+            if isinstance(legacy, int) and not isinstance(legacy, bool):
+                base = before_stats.get(key, 0)
+                storage.stats[key] = base + max(storage.stats[key] - base, legacy)
+
+    if header.get("created"):
+        storage.meta["created"] = header["created"]
+    storage.meta["migrated_from"] = name
+    storage.meta.pop("migrating", None)
+    storage.sync()
+    return migrated
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Uso: python -m core.hd_storage <hd_virtual.json> <diretorio_hd>")
+        sys.exit(1)
+
+    hd = HDStorage(sys.argv[2])
+    migrated = migrate_legacy_hd(sys.argv[1], hd)
+    hd.close()
+    print(f"{migrated} entradas migradas para {sys.argv[2]}")
@@ -0,0 +1,167 @@
+# core/hd_stream.py
+# ============================================================
+# HD VIRTUAL — LEITOR INCREMENTAL DO hd_virtual.json
+# ============================================================
+# - Percorre "memory"/"logs" uma entrada por vez (geradores)
+# - Memória constante: só um bloco de leitura + uma entrada
+# - Arrays que não interessam são pulados sem materializar
+# ============================================================
+
+import json
+from typing import Any, Dict, Iterator, Tuple
+
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = _WHITESPACE + ",]}"
+_decoder = json.JSONDecoder()
+
+
+class HDStreamError(ValueError):
+    pass
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _Reader:
+    """Buffer deslizante sobre o arquivo com raw_decode incremental"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Descarta o que já foi consumido para manter o buffer pequeno
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Próximo caractere não branco (sem consumir)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise HDStreamError(f"Esperado '{char}' na posição {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decodifica um valor JSON completo a partir da posição atual"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # Números cortados pelo fim do bloco parecem completos
+                if self.eof or not _is_number(value) or (
+                        end < len(self.buf) and self.buf[end] in _DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill():
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                self.pos = end
+                return value
+
+    def array(self) -> Iterator[Any]:
+        """Itera os elementos de um array, um por vez"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise HDStreamError(f"Esperado ',' ou ']' na posição {self.pos}")
+
+
+def _iter_members(reader: _Reader) -> Iterator[Tuple[str, _Reader]]:
+    """Itera chaves do objeto raiz; o consumidor lê (ou pula) cada valor"""
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        reader.peek()
+        start = reader.pos, reader.buf
+        yield key, reader
+        # Se o consumidor não leu o valor, pula sem materializar arrays
+        if (reader.pos, reader.buf) == start:
+            _skip_value(reader)
+        char = reader.peek()
+        reader.pos += 1
+        if char == "}":
+            return
+        if char != ",":
+            raise HDStreamError(f"Esperado ',' ou '}}' na posição {reader.pos}")
+
+
+def _skip_value(reader: _Reader):
+    if reader.peek() == "[":
+        for _ in reader.array():
+            pass
+    else:
+        reader.value()
+
+
+def iter_hd_array(path: str, key: str, chunk_size: int = 65536) -> Iterator[Any]:
+    """Gera as entradas de um array de topo ("memory" ou "logs")"""
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f, chunk_size)
+        for name, member in _iter_members(reader):
+            if name == key:
+                if member.peek() != "[":
+                    raise HDStreamError(f"'{key}' não é um array")
+                yield from member.array()
+                return
+
+
+def iter_hd_entries(path: str, sections: Tuple[str, ...] = ("memory", "logs"),
+                    chunk_size: int = 65536) -> Iterator[Tuple[str, Any]]:
+    """Gera (seção, entrada) para todas as seções pedidas, em uma passada"""
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f, chunk_size)
+        for name, member in _iter_members(reader):
+            if name in sections and member.peek() == "[":
+                for entry in member.array():
+                    yield name, entry
+
+
+def read_hd_header(path: str, chunk_size: int = 65536) -> Dict[str, Any]:
+    """Lê os membros de topo que não são arrays (version, created, stats...)"""
+    header = {}
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f, chunk_size)
+        for name, member in _iter_members(reader):
+            if member.peek() != "[":
+                header[name] = member.value()
+    return header
+
+
+def count_hd_array(path: str, key: str) -> int:
+    """Conta as entradas de um array sem guardá-las"""
+    count = 0
+    for _ in iter_hd_array(path, key):
+        count += 1
+    return count
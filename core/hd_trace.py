@@ -0,0 +1,341 @@
+# core/hd_trace.py
+# ============================================================
+# HD VIRTUAL — REPLAY COLUNAR DO RASTRO DE OPERAÇÕES (NUMPY)
+# ============================================================
+# - "memory" {A, B, ACTION}: acumulador A depois de aplicar B
+#     ADD -> A = A + B      SUB -> A = A - B
+#     SET -> A = argumento  (reinício do acumulador, nova sessão)
+# - Registros sem ACTION: operação inferida do próprio A
+#   (A - A anterior = +B -> ADD, -B -> SUB, senão SET); essas
+#   linhas (e todo SET, cujo argumento é o próprio A) batem com o
+#   replay por construção: verify() só chama de verificadas as
+#   linhas rotuladas e conta as inferidas à parte
+# - Replay vetorizado: soma acumulada por segmento (cada SET
+#   abre um), sem laço Python por operação; corridas de uma
+#   mesma operação por run-length + np.add.reduceat
+# - "logs" {time, A, STATE, LOAD}: agregados por estado, por
+#   janela de tempo e por intervalo (searchsorted)
+# - Colunas lidas do snapshot mmap via numpy.frombuffer (sem cópia)
+#
+#   python -m core.hd_trace [hd_virtual.json] [hd_virtual.snap]
+# ============================================================
+
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.hd_snapshot import INT_MISSING, HDSnapshot, open_snapshot
+
+OP_NONE, OP_ADD, OP_SUB, OP_SET = 0, 1, 2, 3
+OP_NAMES = ("NONE", "ADD", "SUB", "SET")
+OP_CODES = {name: code for code, name in enumerate(OP_NAMES)}
+# Sinal da variação por código: delta = SIGN[op] * arg (uma leitura de tabela)
+SIGN = np.array([0, 1, -1, 0], dtype=np.int64)
+
+
+# ======================= COLUNAS ============================
+
+def numeric_column(snapshot: HDSnapshot, section: str,
+                   name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """(valores, presentes) de uma coluna numérica, sem copiar o mmap"""
+    rows = snapshot.rows(section)
+    if name not in snapshot.columns(section):
+        return np.zeros(rows), np.zeros(rows, dtype=bool)
+    info = snapshot.column_info(section, name)
+    if info["kind"] not in ("int", "float"):
+        raise ValueError(f"coluna não numérica: {section}.{name} ({info['kind']})")
+    values = np.frombuffer(snapshot.column(section, name), dtype=np.dtype(info["typecode"]))
+    present = values != INT_MISSING if info["kind"] == "int" else ~np.isnan(values)
+    return values, present
+
+
+def text_column(snapshot: HDSnapshot, section: str,
+                name: str) -> Tuple[np.ndarray, List[str]]:
+    """(códigos, nomes) de uma coluna de texto; código i = nomes[i - 1], 0 = ausente"""
+    rows = snapshot.rows(section)
+    if name not in snapshot.columns(section):
+        return np.zeros(rows, dtype=np.uint32), []
+    info = snapshot.column_info(section, name)
+    if info["kind"] not in ("str", "json"):
+        raise ValueError(f"coluna não textual: {section}.{name} ({info['kind']})")
+    codes = np.frombuffer(snapshot.column(section, name), dtype=np.dtype(info["typecode"]))
+    names = info["vocab"]
+    if info["kind"] == "json":
+        names = [str(json.loads(v)) for v in names]
+    return codes, names
+
+
+def _runs(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Início e comprimento de cada corrida de valores iguais"""
+    if not len(values):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    return starts, np.diff(np.append(starts, len(values)))
+
+
+# ======================= OPERAÇÕES ==========================
+
+class OpTrace:
+    """Rastro de operações do acumulador (uma linha por operação)"""
+
+    def __init__(self, op: np.ndarray, arg: np.ndarray, recorded: Optional[np.ndarray] = None,
+                 recorded_mask: Optional[np.ndarray] = None, initial: int = 0,
+                 inferred: Optional[np.ndarray] = None):
+        self.op = np.asarray(op, dtype=np.int8)
+        self.arg = np.asarray(arg, dtype=np.int64)
+        self.recorded = recorded  # A gravado (para conferir o replay)
+        self.recorded_mask = recorded_mask
+        # Operação/argumento tirados do próprio A gravado (nada a conferir)
+        self.inferred = inferred
+        self.initial = int(initial)
+        self._replay: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.op)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: HDSnapshot, section: str = "memory") -> "OpTrace":
+        a, has_a = numeric_column(snapshot, section, "A")
+        b, has_b = numeric_column(snapshot, section, "B")
+        codes, names = text_column(snapshot, section, "ACTION")
+        a = np.where(has_a, a, 0).astype(np.int64)
+        b = np.where(has_b, b, 0).astype(np.int64)
+
+        # Nome da ação -> código da operação (desconhecida = NONE)
+        table = np.array([OP_NONE] + [OP_CODES.get(n.upper(), OP_NONE) for n in names],
+                         dtype=np.int8)
+        op = table[codes]
+
+        # O que A registrou: continuação do anterior ou reinício do zero
+        prev = np.concatenate(([0], a[:-1]))
+        diff = a - prev
+        signed = SIGN.take(op) * b
+        # Ação gravada, mas A recomeçou do zero (sessão nova): vira SET
+        restarted = (signed != 0) & has_a & (diff != signed) & (a == signed)
+        inferred = np.where(diff == b, OP_ADD, np.where(diff == -b, OP_SUB, OP_SET))
+        unlabeled = (op == OP_NONE) & has_a & has_b
+        op = np.where(unlabeled, inferred, op).astype(np.int8)
+        op[restarted] = OP_SET
+        arg = np.where(op == OP_SET, a, b)
+        return cls(op, arg, recorded=a, recorded_mask=has_a,
+                   inferred=unlabeled | (op == OP_SET))
+
+    def deltas(self) -> np.ndarray:
+        """Variação de cada operação (0 em SET e NONE)"""
+        return SIGN.take(self.op) * self.arg
+
+    def replay(self) -> np.ndarray:
+        """Valor do acumulador depois de cada operação"""
+        if self._replay is not None:
+            return self._replay
+        acc = np.cumsum(self.deltas())
+        # Cada SET abre um segmento: soma-se a cada linha a correção do
+        # seu segmento (valor do SET menos a soma acumulada até ele)
+        sets = np.flatnonzero(self.op == OP_SET)
+        base = np.concatenate(([self.initial], self.arg[sets] - acc[sets]))
+        lengths = np.diff(np.concatenate(([0], sets, [len(acc)])))
+        acc += np.repeat(base, lengths)
+        self._replay = acc
+        return acc
+
+    def verify(self) -> Dict:
+        """Compara o replay com o A gravado nas linhas rotuladas.
+
+        verified: linhas cuja operação veio do ACTION gravado;
+        inferred: linhas com A gravado mas operação deduzida dele
+        (consistentes por construção, não contam como verificadas).
+        """
+        if self.recorded is None:
+            return {"ok": True, "verified": 0, "inferred": 0, "mismatches": 0,
+                    "first_bad": None}
+        mask = self.recorded_mask
+        if mask is None:
+            mask = np.ones(len(self), dtype=bool)
+        derived = self.inferred
+        if derived is None:
+            derived = np.zeros(len(self), dtype=bool)
+        labelled = mask & ~derived
+        bad = np.flatnonzero((self.replay() != self.recorded) & labelled)
+        return {
+            "ok": not len(bad),
+            "verified": int(np.count_nonzero(labelled)),
+            "inferred": int(np.count_nonzero(mask & derived)),
+            "mismatches": int(len(bad)),
+            "first_bad": int(bad[0]) if len(bad) else None
+        }
+
+    def runs(self) -> Dict[str, Dict]:
+        """Corridas por operação: quantas, a maior e a variação líquida total"""
+        starts, lengths = _runs(self.op)
+        if not len(starts):
+            return {}
+        net = np.add.reduceat(self.deltas(), starts)
+        kinds = self.op[starts]
+        result = {}
+        for code in np.unique(kinds):
+            sel = kinds == code
+            result[OP_NAMES[code]] = {
+                "runs": int(np.count_nonzero(sel)),
+                "ops": int(lengths[sel].sum()),
+                "longest": int(lengths[sel].max()),
+                "net": int(net[sel].sum())
+            }
+        return result
+
+    def summary(self) -> Dict:
+        acc = self.replay()
+        if not len(acc):
+            return {"ops": 0}
+        return {
+            "ops": len(self),
+            "final": int(acc[-1]),
+            "min": int(acc.min()),
+            "max": int(acc.max()),
+            "resets": int(np.count_nonzero(self.op == OP_SET)),
+            "by_op": self.runs()
+        }
+
+
+# ======================= CARGA / ESTADO =====================
+
+class LoadTrace:
+    """Amostras {time, STATE, LOAD} ordenadas pelo tempo"""
+
+    def __init__(self, t: np.ndarray, load: np.ndarray, state: np.ndarray,
+                 states: List[str], max_gap: float = 60.0):
+        t = np.asarray(t, dtype=np.float64)
+        load = np.asarray(load, dtype=np.float64)
+        state = np.asarray(state, dtype=np.int64)
+        valid = ~np.isnan(t) & ~np.isnan(load)
+        t, load, state = t[valid], load[valid], state[valid]
+        if len(t) > 1 and np.any(t[1:] < t[:-1]):
+            order = np.argsort(t, kind="stable")
+            t, load, state = t[order], load[order], state[order]
+        self.t = t
+        self.load = load
+        self.state = state
+        self.states = list(states)
+        # Tempo de cada amostra até a próxima; intervalos maiores que
+        # max_gap são o sistema desligado e não contam
+        dt = np.diff(t, append=t[-1] if len(t) else 0.0)
+        dt[dt > max_gap] = 0.0
+        self.dt = dt
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: HDSnapshot, section: str = "logs",
+                      max_gap: float = 60.0) -> "LoadTrace":
+        t, has_t = numeric_column(snapshot, section, "time")
+        load, has_load = numeric_column(snapshot, section, "LOAD")
+        state, names = text_column(snapshot, section, "STATE")
+        keep = has_t & has_load
+        return cls(t[keep], load[keep], state[keep], names, max_gap)
+
+    def state_name(self, code: int) -> str:
+        return self.states[code - 1] if code > 0 else "UNKNOWN"
+
+    def _group_stats(self, codes: np.ndarray, load: np.ndarray,
+                     dt: np.ndarray) -> Dict[str, Dict]:
+        k = len(self.states) + 1
+        counts = np.bincount(codes, minlength=k)
+        sums = np.bincount(codes, weights=load, minlength=k)
+        seconds = np.bincount(codes, weights=dt, minlength=k)
+        result = {}
+        # Poucos estados: p95 e máximo por np.partition (O(n) por estado, sem ordenar)
+        for code in np.flatnonzero(counts):
+            n = int(counts[code])
+            rank = int(0.95 * (n - 1))
+            group = np.partition(load[codes == code], (rank, n - 1))
+            result[self.state_name(code)] = {
+                "samples": n,
+                "mean_load": round(float(sums[code] / n), 4),
+                "max_load": round(float(group[n - 1]), 4),
+                "p95_load": round(float(group[rank]), 4),
+                "seconds": round(float(seconds[code]), 3)
+            }
+        return result
+
+    def by_state(self) -> Dict[str, Dict]:
+        """Amostras, carga média/máxima/p95 e tempo em cada estado"""
+        return self._group_stats(self.state, self.load, self.dt)
+
+    def between(self, start: Optional[float] = None, end: Optional[float] = None,
+                state: Optional[str] = None) -> Dict:
+        """Agregado das amostras em [start, end), opcionalmente de um estado"""
+        i0 = 0 if start is None else int(np.searchsorted(self.t, start, "left"))
+        i1 = len(self.t) if end is None else int(np.searchsorted(self.t, end, "left"))
+        load, codes, dt = self.load[i0:i1], self.state[i0:i1], self.dt[i0:i1]
+        if state is not None:
+            code = self.states.index(state) + 1 if state in self.states else -1
+            sel = codes == code
+            load, codes, dt = load[sel], codes[sel], dt[sel]
+        if not len(load):
+            return {"samples": 0}
+        return {
+            "samples": int(len(load)),
+            "mean_load": round(float(load.mean()), 4),
+            "max_load": round(float(load.max()), 4),
+            "seconds": round(float(dt.sum()), 3),
+            "states": {name: s["samples"] for name, s in
+                       self._group_stats(codes, load, dt).items()}
+        }
+
+    def windows(self, seconds: float) -> Dict[str, np.ndarray]:
+        """Janelas fixas de `seconds` (só as não vazias): início, amostras,
+        carga média e máxima e o estado dominante"""
+        if not len(self.t):
+            empty = np.zeros(0)
+            return {"start": empty, "samples": empty, "mean_load": empty,
+                    "max_load": empty, "state": np.array([], dtype=object)}
+        t0 = self.t[0]
+        bucket = ((self.t - t0) // seconds).astype(np.int64)
+        starts, counts = _runs(bucket)
+        mean = np.add.reduceat(self.load, starts) / counts
+        peak = np.maximum.reduceat(self.load, starts)
+        # Estado dominante: contagem (janela, estado) numa matriz
+        k = len(self.states) + 1
+        group = np.repeat(np.arange(len(starts)), counts)
+        table = np.bincount(group * k + self.state, minlength=len(starts) * k)
+        dominant = table.reshape(len(starts), k).argmax(axis=1)
+        names = np.array(["UNKNOWN"] + self.states, dtype=object)
+        return {
+            "start": t0 + bucket[starts] * seconds,
+            "samples": counts,
+            "mean_load": mean,
+            "max_load": peak,
+            "state": names[dominant]
+        }
+
+
+def load_traces(json_path: str, snapshot_path: str) -> Tuple[OpTrace, LoadTrace]:
+    """Rastros de memory/logs a partir do snapshot (reconstruído se preciso)"""
+    snapshot = open_snapshot(json_path, snapshot_path)
+    if snapshot is None:
+        raise FileNotFoundError(json_path)
+    return OpTrace.from_snapshot(snapshot), LoadTrace.from_snapshot(snapshot)
+
+
+if __name__ == "__main__":
+    json_path = sys.argv[1] if len(sys.argv) > 1 else "hd_virtual.json"
+    snapshot_path = sys.argv[2] if len(sys.argv) > 2 else "hd_virtual.snap"
+    ops, logs = load_traces(json_path, snapshot_path)
+    windows = logs.windows(600)
+    busiest = int(np.argmax(windows["mean_load"])) if len(windows["start"]) else None
+    report = {
+        "memory": {**ops.summary(), "verify": ops.verify()},
+        "logs": {
+            "samples": len(logs),
+            "by_state": logs.by_state(),
+            "windows_10min": len(windows["start"]),
+            "busiest_10min": None if busiest is None else {
+                "start": round(float(windows["start"][busiest]), 3),
+                "mean_load": round(float(windows["mean_load"][busiest]), 4),
+                "state": windows["state"][busiest]
+            }
+        }
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
@@ -0,0 +1,164 @@
+# core/hd_writer.py
+# ============================================================
+# HD VIRTUAL — FILA DE ESCRITA EM SEGUNDO PLANO (WRITE-BEHIND)
+# ============================================================
+# - O loop principal apenas enfileira; um único worker escreve
+# - Rajadas são agrupadas num único append_many/flush
+# - Fila limitada com métricas de contrapressão; fila cheia vira
+#   escrita síncrona no chamador (nada é descartado em silêncio)
+# - close() drena tudo antes de fechar o armazenamento
+# ============================================================
+
+import queue
+import threading
+import time
+from typing import Dict
+
+from core.hd_storage import HDStorage
+
+_STOP = object()
+
+
+class HDWriter:
+    """Worker único de persistência para o HDStorage"""
+
+    def __init__(self, storage: HDStorage, max_queue: int = 1024,
+                 max_batch: int = 256):
+        self.storage = storage
+        self.max_batch = max(1, int(max_batch))
+        self._queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()  # único acesso ao storage por vez
+        self._closed = False
+
+        self.metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "max_depth": 0,
+            "blocked_puts": 0,
+            "sync_writes": 0,
+            "dropped": 0,
+            "errors": 0,
+            "last_flush_ms": 0.0
+        }
+
+        self._thread = threading.Thread(target=self._run, name="hd-writer", daemon=True)
+        self._thread.start()
+
+    # ======================= PRODUTORES =====================
+
+    def submit(self, entry: Dict) -> bool:
+        """Enfileira uma entrada; só toca no disco se a fila estiver cheia"""
+        if self._closed:
+            with self._lock:
+                self.metrics["dropped"] += 1
+            return False
+
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Contrapressão: o chamador escreve ele mesmo (como antes do
+            # write-behind). A entrada pode ganhar seq antes das que ainda
+            # estão na fila; o timestamp guarda a ordem real
+            with self._lock:
+                self.metrics["blocked_puts"] += 1
+            with self._io_lock:
+                written = self._guard(self.storage.append_many, [entry])
+            with self._lock:
+                self.metrics["sync_writes" if written else "dropped"] += 1
+                if written:
+                    self.metrics["written"] += 1
+            return written
+
+        with self._lock:
+            self.metrics["enqueued"] += 1
+            depth = self._queue.qsize()
+            if depth > self.metrics["max_depth"]:
+                self.metrics["max_depth"] = depth
+        return True
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    # ======================= WORKER =========================
+
+    def _run(self):
+        """Loop do worker: agrupa rajadas e escreve em lote"""
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.storage.fsync_interval)
+            except queue.Empty:
+                # Ocioso: garante que nada fique sem fsync
+                if self.storage.pending:
+                    with self._io_lock:
+                        self._guard(self.storage.sync)
+                continue
+
+            batch = []
+            if item is _STOP:
+                stopping = True
+            else:
+                batch.append(item)
+
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    continue
+                batch.append(item)
+
+            if batch:
+                self._flush(batch)
+
+        with self._io_lock:
+            self._guard(self.storage.close)
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+        with self._io_lock:
+            written = self._guard(self.storage.append_many, batch)
+        if not written:
+            with self._lock:
+                self.metrics["dropped"] += len(batch)
+            return
+        with self._lock:
+            self.metrics["written"] += len(batch)
+            self.metrics["batches"] += 1
+            self.metrics["max_batch"] = max(self.metrics["max_batch"], len(batch))
+            self.metrics["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    def _guard(self, fn, *args) -> bool:
+        try:
+            fn(*args)
+            return True
+        except Exception as e:
+            with self._lock:
+                self.metrics["errors"] += 1
+            print(f"Erro ao escrever no HD: {e}")
+            return False
+
+    # ======================= ENCERRAMENTO ===================
+
+    def close(self, timeout: float = 10.0):
+        """Drena a fila, sincroniza e fecha o armazenamento"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self.metrics["dropped"]:
+            print(f"HD: {self.metrics['dropped']} entradas perdidas (erro de escrita ou HD fechado)")
+
+    def snapshot(self) -> Dict:
+        """Cópia das métricas de contrapressão"""
+        with self._lock:
+            data = dict(self.metrics)
+        data["depth"] = self._queue.qsize()
+        return data
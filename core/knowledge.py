@@ -0,0 +1,251 @@
+# core/knowledge.py
+# ============================================================
+# BASE DE CONHECIMENTO — ÍNDICE INVERTIDO DAS MATÉRIAS
+# ============================================================
+# - Carrega os *.json de matéria ({"area", "topicos": [{"nome",
+#   "conteudos": [...]}]}); outros JSON do diretório são ignorados
+# - Documentos: a área, cada tópico e cada conteúdo
+# - Tokens sem acento/maiúsculas (mesmo tokenize do roteador),
+#   sem stopwords PT/EN e com plural simples removido
+# - Ranking tf-idf com peso por tipo e bônus de nome exato
+# - Termos fora do índice corrigidos por trigramas (erros de digitação)
+# - Cache do índice em disco, refeito só quando uma matéria muda,
+#   some ou aparece; config/permissões/caches reescritos a cada
+#   execução não invalidam (JSON novo ou alterado só é sondado)
+# ============================================================
+
+import glob
+import json
+import math
+import os
+from typing import Dict, List, Optional, Sequence
+
+from core.command_router import tokenize
+from core.fuzzy import TrigramIndex
+
+CACHE_VERSION = 1
+
+STOPWORDS = frozenset("""
+a o as os um uma uns umas de do da dos das e em no na nos nas por para com
+que qual quais quem como se ao aos sobre cobre cobrem trata estuda esta sao
+the of and is are an in on to what which who covers cover about does do
+""".split())
+
+# Perguntas reconhecidas (também registradas no roteador)
+WHAT_PREFIXES = ["o que e", "o que sao", "what is", "what are", "whats", "define", "explique"]
+AREA_PREFIXES = ["qual area", "qual a area", "que area", "which area", "what area",
+                 "em que area", "which subject"]
+
+KIND_WEIGHT = {"area": 1.5, "topic": 1.2, "content": 1.0}
+
+
+def stem(token: str) -> str:
+    """Plural simples: 'celulas' -> 'celula', 'leis' -> 'lei'"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def terms(text: str) -> List[str]:
+    return [stem(t) for t in tokenize(text) if t not in STOPWORDS]
+
+
+def question_subject(tokens: Sequence[str], prefixes: Sequence[str]) -> List[str]:
+    """Tokens depois da primeira pergunta reconhecida (ou todos)"""
+    tokens = list(tokens)
+    for prefix in sorted((tokenize(p) for p in prefixes), key=len, reverse=True):
+        n = len(prefix)
+        for start in range(len(tokens) - n + 1):
+            if tokens[start:start + n] == prefix:
+                rest = tokens[start + n:]
+                while rest and rest[0] in STOPWORDS:
+                    rest = rest[1:]
+                return rest
+    return tokens
+
+
+def _is_subject_file(path: str) -> bool:
+    """Confere só o começo do arquivo (hd_virtual.json pode ser enorme)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            head = f.read(512)
+    except (OSError, UnicodeDecodeError):
+        return False
+    return '"area"' in head
+
+
+class KnowledgeBase:
+    """Índice invertido das matérias com cache em disco"""
+
+    def __init__(self, directory: str = ".", cache_path: Optional[str] = "knowledge_index.json"):
+        self.directory = directory
+        self.cache_path = cache_path
+        self.docs: List[Dict] = []
+        self.postings: Dict[str, List[List]] = {}
+        self.sources: Dict[str, List] = {}
+        self.from_cache = False
+        self._fuzzy: Optional[TrigramIndex] = None
+        self.load()
+
+    # ======================= CARGA ==========================
+
+    def _scan(self) -> Dict[str, List]:
+        """{arquivo: [mtime, tamanho]} de todos os JSON do diretório"""
+        found = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.json"))):
+            if self.cache_path and os.path.abspath(path) == os.path.abspath(self.cache_path):
+                continue
+            st = os.stat(path)
+            found[os.path.basename(path)] = [st.st_mtime, st.st_size]
+        return found
+
+    def _fresh(self, cached: Dict[str, List], scanned: Dict[str, List]) -> bool:
+        """Cache vale se as matérias são as mesmas e nenhum JSON novo
+        ou alterado virou matéria (não-matérias podem mudar à vontade)"""
+        for name, (mtime, size, subject) in cached.items():
+            if subject and scanned.get(name) != [mtime, size]:
+                return False
+        for name, stamp in scanned.items():
+            known = cached.get(name)
+            if known is not None and (known[2] or known[:2] == stamp):
+                continue
+            if _is_subject_file(os.path.join(self.directory, name)):
+                return False
+        return True
+
+    def load(self):
+        self._fuzzy = None
+        scanned = self._scan()
+        cache = self._read_cache()
+        if cache is not None and self._fresh(cache["sources"], scanned):
+            self.docs = cache["docs"]
+            self.postings = cache["postings"]
+            self.sources = cache["sources"]
+            self.from_cache = True
+            return
+
+        self.build(scanned)
+        self.from_cache = False
+        self._write_cache()
+
+    def build(self, scanned: Dict[str, List]):
+        """Lê as matérias e monta documentos + índice invertido"""
+        self.docs = []
+        self.sources = {}
+        for name, (mtime, size) in scanned.items():
+            path = os.path.join(self.directory, name)
+            subject = False
+            if _is_subject_file(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    data = None
+                if isinstance(data, dict) and "area" in data:
+                    self._add_subject(data, name)
+                    subject = True
+            # Não-matérias também entram: evita reler quando nada mudou
+            self.sources[name] = [mtime, size, subject]
+
+        index: Dict[str, Dict[int, float]] = {}
+        for doc_id, doc in enumerate(self.docs):
+            words = terms(doc["name"])
+            # Contexto (tópico/área) ajuda, mas pesa menos que o nome
+            context = terms(" ".join(doc["path"][:-1]))
+            for term in words:
+                index.setdefault(term, {})
+                index[term][doc_id] = index[term].get(doc_id, 0.0) + 1.0 / len(words)
+            for term in context:
+                index.setdefault(term, {})
+                index[term][doc_id] = index[term].get(doc_id, 0.0) + 0.25 / len(context)
+        self.postings = {term: [[doc_id, round(w, 4)] for doc_id, w in sorted(docs.items())]
+                         for term, docs in index.items()}
+
+    def _add_subject(self, data: Dict, source: str):
+        area = str(data["area"])
+        self.docs.append({"kind": "area", "name": area, "path": [area], "source": source,
+                          "children": [str(t.get("nome", "")) for t in data.get("topicos", [])]})
+        for topico in data.get("topicos", []):
+            topic = str(topico.get("nome", ""))
+            conteudos = [str(c) for c in topico.get("conteudos", [])]
+            self.docs.append({"kind": "topic", "name": topic, "path": [area, topic],
+                              "source": source, "children": conteudos})
+            for conteudo in conteudos:
+                self.docs.append({"kind": "content", "name": conteudo,
+                                  "path": [area, topic, conteudo], "source": source,
+                                  "children": []})
+
+    def _read_cache(self) -> Optional[Dict]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cache.get("version") != CACHE_VERSION:
+            return None
+        return cache
+
+    def _write_cache(self):
+        if not self.cache_path:
+            return
+        tmp = self.cache_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "sources": self.sources,
+                           "docs": self.docs, "postings": self.postings},
+                          f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"Erro ao gravar índice de conhecimento: {e}")
+
+    # ======================= BUSCA ==========================
+
+    def search(self, query: str, limit: int = 3) -> List[Dict]:
+        """Documentos ordenados por relevância (com 'score')"""
+        query_terms = terms(query)
+        if not query_terms or not self.docs:
+            return []
+        query_terms = [self._correct(term) for term in query_terms]
+
+        n_docs = len(self.docs)
+        scores: Dict[int, float] = {}
+        hits: Dict[int, int] = {}
+        for term in set(query_terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + n_docs / len(postings))
+            for doc_id, weight in postings:
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+                hits[doc_id] = hits.get(doc_id, 0) + 1
+
+        wanted = " ".join(query_terms)
+        ranked = []
+        for doc_id, score in scores.items():
+            doc = self.docs[doc_id]
+            score *= KIND_WEIGHT.get(doc["kind"], 1.0)
+            # Todos os termos da pergunta presentes / nome idêntico
+            score *= 1.0 + hits[doc_id] / len(set(query_terms))
+            if " ".join(terms(doc["name"])) == wanted:
+                score *= 2.0
+            ranked.append((score, doc_id))
+
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [dict(self.docs[doc_id], score=round(score, 4)) for score, doc_id in ranked[:limit]]
+
+    def _correct(self, term: str) -> str:
+        """Termo fora do índice -> termo indexado mais parecido ("relatividde")"""
+        if term in self.postings or len(term) < 4:
+            return term
+        if self._fuzzy is None:
+            self._fuzzy = TrigramIndex(self.postings)
+        best = self._fuzzy.best(term, 0.75)
+        return best[0] if best else term
+
+    def areas(self) -> List[str]:
+        return [doc["name"] for doc in self.docs if doc["kind"] == "area"]
+
+    def __len__(self) -> int:
+        return len(self.docs)
@@ -0,0 +1,169 @@
+# core/profiler.py
+# ============================================================
+# PROFILER POR FRAME (INSTRUMENTAÇÃO DOS CAMINHOS QUENTES)
+# ============================================================
+# - lap("fase") mede o tempo desde a marca anterior do frame;
+#   lap_split() separa partes medidas por quem chamou (camadas
+#   do compositor) do restante da fase
+# - Um ring buffer (array de doubles) por fase, sem alocação
+# - p50/p95/p99 calculados sob demanda (overlay / exportação)
+# - Amostragem: só 1 a cada N frames é medido; N = 0 desliga
+# - StartupTimer: fases da partida até o primeiro comando
+# ============================================================
+
+import json
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+class RingHistogram:
+    """Janela circular de amostras (ms) com percentis sob demanda"""
+
+    __slots__ = ("samples", "index", "count")
+
+    def __init__(self, capacity: int):
+        self.samples = array("d", bytes(8 * capacity))
+        self.index = 0
+        self.count = 0
+
+    def add(self, value: float):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        if self.count < len(self.samples):
+            self.count += 1
+
+    def values(self) -> List[float]:
+        if self.count < len(self.samples):
+            return list(self.samples[:self.count])
+        return list(self.samples[self.index:]) + list(self.samples[:self.index])
+
+    def percentiles(self, ps=(50, 95, 99)) -> Dict[str, float]:
+        data = sorted(self.values())
+        if not data:
+            return {f"p{p}": 0.0 for p in ps}
+        last = len(data) - 1
+        return {f"p{p}": data[min(last, int(round(p / 100 * last)))] for p in ps}
+
+
+class FrameProfiler:
+    """Tempos por fase do loop principal"""
+
+    def __init__(self, capacity: int = 600, sample_every: int = 1):
+        self.capacity = max(1, int(capacity))
+        self.sample_every = max(0, int(sample_every))
+        self.histograms: Dict[str, RingHistogram] = {}
+        self.order: List[str] = []
+        self.frames = 0
+        self.sampled = 0
+        self._active = False
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_every > 0
+
+    def begin_frame(self):
+        """Decide se este frame será medido"""
+        self.frames += 1
+        self._active = self.sample_every > 0 and self.frames % self.sample_every == 0
+        if self._active:
+            self._frame_start = self._last = time.perf_counter()
+
+    def lap(self, phase: str):
+        """Fecha a fase atual (tempo desde a marca anterior)"""
+        if not self._active:
+            return
+        now = time.perf_counter()
+        self._record(phase, (now - self._last) * 1000.0)
+        self._last = now
+
+    @property
+    def active(self) -> bool:
+        """Este frame está sendo medido"""
+        return self._active
+
+    def lap_split(self, phase: str, parts: Dict[str, float]):
+        """Como lap(), mas as partes (ms, medidas à parte) viram fases
+        próprias e `phase` fica só com o restante"""
+        if not self._active:
+            return
+        now = time.perf_counter()
+        total = (now - self._last) * 1000.0
+        self._record(phase, max(0.0, total - sum(parts.values())))
+        for name, ms in parts.items():
+            self._record(name, ms)
+        self._last = now
+
+    def end_frame(self):
+        if not self._active:
+            return
+        self._record("frame", (time.perf_counter() - self._frame_start) * 1000.0)
+        self.sampled += 1
+        self._active = False
+
+    def _record(self, phase: str, ms: float):
+        hist = self.histograms.get(phase)
+        if hist is None:
+            hist = self.histograms[phase] = RingHistogram(self.capacity)
+            self.order.append(phase)
+        hist.add(ms)
+
+    # ======================= RELATÓRIOS =====================
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{fase: {p50, p95, p99}} em milissegundos"""
+        return {phase: self.histograms[phase].percentiles() for phase in self.order}
+
+    def export(self, path: str, raw: bool = True) -> str:
+        """Grava resumo (e amostras cruas) em JSON"""
+        data = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frames": self.frames,
+            "sampled_frames": self.sampled,
+            "sample_every": self.sample_every,
+            "unit": "ms",
+            "phases": self.summary()
+        }
+        if raw:
+            data["samples"] = {phase: self.histograms[phase].values() for phase in self.order}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def overlay_lines(self, top: Optional[int] = None) -> List[str]:
+        """Linhas de texto para o overlay do HUD"""
+        lines = [f"{'phase':<16}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for phase, p in list(self.summary().items())[:top]:
+            lines.append(f"{phase[:16]:<16}{p['p50']:>7.2f}{p['p95']:>7.2f}{p['p99']:>7.2f}")
+        return lines
+
+
+class StartupTimer:
+    """Marcas da partida (import, config, ..., primeiro comando) em ms"""
+
+    def __init__(self, t0: Optional[float] = None, out=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.out = out  # arquivo do relatório (ex.: sys.stderr); None = só guarda
+        self.marks: List[Tuple[str, float]] = []
+        self.result: Optional[Dict] = None
+
+    def mark(self, phase: str):
+        self.marks.append((phase, time.perf_counter()))
+
+    def report(self) -> Dict:
+        phases = {}
+        prev = self.t0
+        for phase, at in self.marks:
+            phases[phase] = round((at - prev) * 1000, 3)
+            prev = at
+        return {"phases_ms": phases, "total_ms": round((prev - self.t0) * 1000, 3)}
+
+    def finish(self) -> Dict:
+        """Fecha o relatório (uma linha JSON em `out`, se houver)"""
+        self.result = self.report()
+        if self.out is not None:
+            self.out.write(json.dumps({"startup": self.result}) + "\n")
+            self.out.flush()
+        return self.result
@@ -0,0 +1,46 @@
+# core/rate_limit.py
+# ============================================================
+# TOKEN BUCKET (LIMITE DE TAXA POR SESSÃO)
+# ============================================================
+# - `rate` fichas por segundo, no máximo `burst` acumuladas
+# - Cada comando gasta uma ficha; sem ficha, é rejeitado
+# - Reposição calculada na consulta (nada roda em segundo plano)
+# - rate=1/0.6 e burst=1 reproduzem o antigo cooldown de 0.6 s
+# - Relógio injetável (tempo virtual nos testes de longa duração)
+# ============================================================
+
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "stamp", "clock")
+
+    def __init__(self, rate: float, burst: float = 1.0, now: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.rate = max(0.0, float(rate))
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.stamp = self.clock() if now is None else now
+
+    def _refill(self, now: float):
+        if now > self.stamp:
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+
+    def allow(self, now: Optional[float] = None, cost: float = 1.0) -> bool:
+        """Gasta `cost` fichas se houver; False = limite atingido"""
+        self._refill(self.clock() if now is None else now)
+        if self.tokens + 1e-9 >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+    def retry_after(self, now: Optional[float] = None, cost: float = 1.0) -> float:
+        """Segundos até haver `cost` fichas (0 se já há)"""
+        self._refill(self.clock() if now is None else now)
+        missing = cost - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate else float("inf")
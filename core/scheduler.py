@@ -0,0 +1,269 @@
+# core/scheduler.py
+# ============================================================
+# AGENDADOR ÚNICO DE TAREFAS (HEAP DE PRAZOS)
+# ============================================================
+# - Tarefas periódicas (every) e atrasadas (after) num só heap
+# - Cancelamento preguiçoso: a entrada cancelada é descartada
+#   quando chega ao topo (cancel é O(1))
+# - Jitter por tarefa (espalha tarefas de mesmo intervalo)
+# - Política de atraso quando o processo ficou parado:
+#     "skip"  -> pula os disparos perdidos, volta à grade
+#     "burst" -> executa os perdidos em sequência (até MAX_BURST)
+#     "delay" -> próximo disparo = fim da execução + intervalo
+# - Estatísticas por tarefa: execuções, erros, tempo, atraso
+# - Dois modos de uso:
+#     run_pending()  -> chamado pelo loop de frames (sem thread)
+#     start()/stop() -> thread própria que dorme até o próximo
+#                       prazo e encerra na hora (sem sleep fixo)
+# - Relógio, acaso (jitter) e cronômetro injetáveis: com o relógio
+#   virtual (core/sim_clock.py) os prazos viram eventos discretos
+# ============================================================
+
+import heapq
+import itertools
+import math
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+CATCH_UP_POLICIES = ("skip", "burst", "delay")
+MAX_BURST = 16
+
+
+def _stale(entry) -> bool:
+    """Entrada cancelada ou substituída por um reagendamento"""
+    return entry[2].cancelled or entry[1] != entry[2]._entry
+
+
+class ScheduledTask:
+    __slots__ = ("name", "fn", "interval", "jitter", "catch_up", "base", "due",
+                 "cancelled", "runs", "errors", "missed", "total_s", "max_s",
+                 "last_s", "max_late_s", "last_error", "_burst", "_entry", "_scheduler")
+
+    def __init__(self, scheduler: "Scheduler", name: str, fn: Callable[[], None],
+                 interval: Optional[float], jitter: float, catch_up: str):
+        self._scheduler = scheduler
+        self.name = name
+        self.fn = fn
+        self.interval = interval  # None = execução única
+        self.jitter = jitter
+        self.catch_up = catch_up
+        self.base = 0.0  # prazo ideal (sem jitter): a grade não deriva
+        self.due = 0.0
+        self.cancelled = False
+        self.runs = 0
+        self.errors = 0
+        self.missed = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.last_s = 0.0
+        self.max_late_s = 0.0
+        self.last_error: Optional[str] = None
+        self._burst = 0
+        self._entry = -1  # seq da entrada válida no heap (as outras são velhas)
+
+    def cancel(self):
+        """Cancela a tarefa (não interrompe uma execução em andamento)"""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self._scheduler._cancelled()
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled
+
+    def stats(self) -> Dict:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "missed": self.missed,
+            "avg_ms": round(self.total_s / self.runs * 1000, 4) if self.runs else 0.0,
+            "max_ms": round(self.max_s * 1000, 4),
+            "last_ms": round(self.last_s * 1000, 4),
+            "max_late_ms": round(self.max_late_s * 1000, 3),
+            "last_error": self.last_error
+        }
+
+
+class Scheduler:
+    """Heap de prazos (due, seq, tarefa) protegido por uma Condition"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 rng: Optional[random.Random] = None,
+                 timer: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.timer = timer  # duração das execuções (estatísticas)
+        self._heap: List = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._dead = 0  # entradas canceladas ainda no heap
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    # ======================= AGENDAMENTO ====================
+
+    def every(self, interval: float, fn: Callable[[], None], name: Optional[str] = None,
+              first: Optional[float] = None, jitter: float = 0.0,
+              catch_up: str = "skip") -> ScheduledTask:
+        """Executa fn a cada `interval` s (primeira vez em `first` s; padrão: um intervalo)"""
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"catch_up must be one of {CATCH_UP_POLICIES}")
+        task = ScheduledTask(self, name or fn.__name__, fn, float(interval),
+                             max(0.0, jitter), catch_up)
+        self._push(task, self.clock() + (interval if first is None else first))
+        return task
+
+    def after(self, delay: float, fn: Callable[[], None],
+              name: Optional[str] = None) -> ScheduledTask:
+        """Executa fn uma vez daqui a `delay` s"""
+        task = ScheduledTask(self, name or fn.__name__, fn, None, 0.0, "skip")
+        self._push(task, self.clock() + max(0.0, delay))
+        return task
+
+    def reschedule(self, task: ScheduledTask, delay: float) -> ScheduledTask:
+        """Reagenda (ou reativa) a tarefa para daqui a `delay` s, mantendo
+        as estatísticas; o prazo anterior, se pendente, deixa de valer"""
+        if not task.cancelled:
+            with self._cond:
+                self._dead += 1
+        task.cancelled = False
+        self._push(task, self.clock() + max(0.0, delay))
+        return task
+
+    def _push(self, task: ScheduledTask, base: float):
+        task.base = base
+        task.due = base + (self.rng.uniform(0.0, task.jitter) if task.jitter else 0.0)
+        with self._cond:
+            self._tasks[task.name] = task
+            earliest = not self._heap or task.due < self._heap[0][0]
+            task._entry = next(self._seq)
+            heapq.heappush(self._heap, (task.due, task._entry, task))
+            if earliest:
+                self._cond.notify()
+
+    def _cancelled(self):
+        with self._cond:
+            self._dead += 1
+            # Muitas canceladas: reconstrói o heap só com as vivas
+            if self._dead > 64 and self._dead * 2 > len(self._heap):
+                self._heap = [e for e in self._heap if not _stale(e)]
+                heapq.heapify(self._heap)
+                self._dead = 0
+            self._cond.notify()
+
+    # ======================= EXECUÇÃO =======================
+
+    def next_due(self) -> Optional[float]:
+        """Segundos até o próximo prazo (None = nada agendado)"""
+        deadline = self.next_deadline()
+        return None if deadline is None else deadline - self.clock()
+
+    def next_deadline(self) -> Optional[float]:
+        """Instante (no relógio do agendador) do próximo prazo"""
+        with self._cond:
+            self._drop_cancelled()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_cancelled(self):
+        while self._heap and _stale(self._heap[0]):
+            heapq.heappop(self._heap)
+            self._dead = max(0, self._dead - 1)
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Executa as tarefas vencidas; devolve quantas rodaram"""
+        now = self.clock() if now is None else now
+        ran = 0
+        while True:
+            with self._cond:
+                self._drop_cancelled()
+                if not self._heap or self._heap[0][0] > now:
+                    return ran
+                _, _, task = heapq.heappop(self._heap)
+            self._run(task, now)
+            ran += 1
+
+    def _run(self, task: ScheduledTask, now: float):
+        task.max_late_s = max(task.max_late_s, now - task.due)
+        once = task.interval is None
+        if once:
+            task.cancelled = True  # concluída; reschedule() dentro de fn reativa
+        t0 = self.timer()
+        try:
+            task.fn()
+        except Exception as e:
+            task.errors += 1
+            task.last_error = repr(e)
+            print(f"Erro na tarefa {task.name}: {e}")
+        elapsed = self.timer() - t0
+        task.runs += 1
+        task.total_s += elapsed
+        task.last_s = elapsed
+        task.max_s = max(task.max_s, elapsed)
+
+        if once or task.cancelled:
+            return
+        self._push(task, self._next_base(task, now))
+
+    def _next_base(self, task: ScheduledTask, now: float) -> float:
+        interval = task.interval
+        nxt = task.base + interval
+        if nxt > now:
+            task._burst = 0
+            return nxt
+        if task.catch_up == "delay":
+            return self.clock() + interval
+        if task.catch_up == "burst" and task._burst < MAX_BURST:
+            task._burst += 1
+            return nxt
+        # skip: próximo ponto da grade depois de agora
+        behind = math.floor((now - task.base) / interval)
+        task.missed += behind
+        task._burst = 0
+        return task.base + (behind + 1) * interval
+
+    # ======================= THREAD =========================
+
+    def start(self, name: str = "scheduler") -> "Scheduler":
+        """Thread própria: dorme até o próximo prazo (ou até ser acordada)"""
+        if self._thread is None:
+            self._stopped = False
+            self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+            self._thread.start()
+        return self
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    self._drop_cancelled()
+                    delay = self._heap[0][0] - self.clock() if self._heap else None
+                    if delay is not None and delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if self._stopped:
+                    return
+            self.run_pending()
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Encerra a thread na hora (espera só a tarefa em execução)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    # ======================= LEITURA ========================
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._dead
+
+    def stats(self) -> Dict[str, Dict]:
+        """Estatísticas por tarefa (pelo nome; o último agendamento vence)"""
+        return {name: task.stats() for name, task in self._tasks.items()}
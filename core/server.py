@@ -0,0 +1,281 @@
+# core/server.py
+# ============================================================
+# SERVIDOR LOCAL MULTISSESSÃO (ASYNCIO + JSON LINES)
+# ============================================================
+# - TCP em localhost ou socket Unix; uma linha JSON por mensagem
+# - Cada sessão é um DarvisAssistant leve aberto pelo host:
+#   emoção, RAM, luz, mensagens e token bucket próprios; HD,
+#   índices, conhecimento e trie de comandos são compartilhados
+# - Conexão nova abre uma sessão; {"session": "nome"} endereça
+#   (ou cria) outra sessão pela mesma conexão. Cada conexão só
+#   fala com as sessões que ela abriu; ao desconectar, todas são
+#   encerradas
+# - Comandos rodam no próprio loop (~0.1 ms cada): sem locks,
+#   sem threads por cliente
+# - Manutenção periódica (tarefa no agendador do host, executada
+#   dentro do loop): decaimento emocional, limpeza de RAM das
+#   sessões e encerramento das ociosas
+#
+# Protocolo (uma linha por mensagem):
+#   -> {"cmd": "status", "id": 7}            (ou só o texto)
+#   <- {"id": 7, "session": "s1", "response": "...",
+#       "messages": [...], "rejected": false, "elapsed_ms": 0.08}
+#   -> {"op": "stats"} | {"op": "close"}
+# ============================================================
+
+import asyncio
+import itertools
+import json
+import signal
+import time
+from typing import Dict, Optional
+
+MAX_LINE = 64 * 1024
+
+
+class DarvisServer:
+    """Sessões isoladas sobre um DarvisAssistant host (headless)"""
+
+    def __init__(self, host, max_sessions: Optional[int] = None,
+                 idle_timeout: Optional[float] = None, maintenance_interval: float = 30.0):
+        self.host = host
+        self.max_sessions = max_sessions or host.config["server_max_sessions"]
+        self.idle_timeout = idle_timeout or host.config["server_idle_timeout"]
+        self.maintenance_interval = maintenance_interval
+        self.sessions: Dict[str, object] = {}
+        self._ids = itertools.count(1)
+        self._servers = []
+        self._maintenance_task = None
+        self.connections = 0
+        self.commands = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    # ======================= SESSÕES ========================
+
+    def open_session(self, name: Optional[str] = None):
+        """Sessão existente pelo nome, ou uma nova (None se lotado)"""
+        if name is not None and name in self.sessions:
+            return name, self.sessions[name]
+        if len(self.sessions) >= self.max_sessions:
+            return None, None
+        session_id = name
+        while session_id is None or session_id in self.sessions:
+            # Nome automático não pode cair numa sessão nomeada por outro cliente
+            session_id = f"s{next(self._ids)}"
+        session = self.host.open_session(session_id)
+        self.sessions[session_id] = session
+        return session_id, session
+
+    def close_session(self, session_id: str):
+        session = self.sessions.pop(session_id, None)
+        if session is not None and session.running:
+            session.shutdown()
+
+    def execute(self, session_id: str, session, cmd: str) -> Dict:
+        """Processa um comando na sessão (síncrono, no loop)"""
+        first_msg = len(session.mensagens)
+        t0 = time.perf_counter()
+        resp = session.processar_comando(cmd)
+        elapsed = time.perf_counter() - t0
+
+        said = [m.text for m in session.mensagens[first_msg:]]
+        # Sem tela para exibir: mensagens vão na resposta, não acumulam
+        del session.mensagens[first_msg:]
+
+        self.commands += 1
+        rejected = resp is None and session.running
+        reply = {
+            "session": session_id,
+            "response": resp,
+            "messages": said,
+            "rejected": rejected,
+            "elapsed_ms": round(elapsed * 1000, 4)
+        }
+        if rejected:
+            self.rejected += 1
+            retry = session.rate_limiter.retry_after()
+            if retry:
+                reply["retry_after"] = round(retry, 3)
+        if not session.running:
+            # "desligar" encerra só a sessão
+            self.sessions.pop(session_id, None)
+            reply["closed"] = True
+        return reply
+
+    def stats(self) -> Dict:
+        return {
+            "sessions": len(self.sessions),
+            "connections": self.connections,
+            "commands": self.commands,
+            "rejected": self.rejected,
+            "evicted": self.evicted
+        }
+
+    # ======================= REDE ===========================
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 8765):
+        server = await asyncio.start_server(self._client, host, port,
+                                            limit=MAX_LINE, backlog=4096)
+        self._started(server)
+        return server
+
+    async def start_unix(self, path: str):
+        server = await asyncio.start_unix_server(self._client, path,
+                                                 limit=MAX_LINE, backlog=4096)
+        self._started(server)
+        return server
+
+    def _started(self, server):
+        self._servers.append(server)
+        if self._maintenance_task is None:
+            loop = asyncio.get_running_loop()
+            # O agendador do host marca a hora; a passada roda no loop (sem locks)
+            self._maintenance_task = self.host.scheduler.every(
+                self.maintenance_interval, lambda: loop.call_soon_threadsafe(self.maintain),
+                name="server_maintenance", jitter=1.0)
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+        for session_id in list(self.sessions):
+            self.close_session(session_id)
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        default_id, default = self.open_session()
+        # Sessões desta conexão (id -> objeto): só elas são endereçáveis por ela
+        owned: Dict[str, object] = {}
+        if default is not None:
+            owned[default_id] = default
+        try:
+            if default is None:
+                await self._send(writer, {"error": "server full"})
+                return
+            await self._send(writer, {"event": "hello", "session": default_id})
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self._send(writer, {"error": "line too long"})
+                    break
+                if not line:
+                    break
+                reply = self._handle_line(line, default_id, owned)
+                if reply is not None:
+                    writer.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+                    # Só espera o socket quando o buffer de saída enche
+                    if writer.transport.get_write_buffer_size() > MAX_LINE:
+                        await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            for session_id, session in owned.items():
+                if self.sessions.get(session_id) is session:
+                    self.close_session(session_id)
+            writer.close()
+
+    def _owned(self, session_id: str, owned: Dict[str, object]) -> Optional[bool]:
+        """True = sessão viva desta conexão; False = livre (fechada ou
+        inexistente); None = pertence a outra conexão"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return False
+        return True if owned.get(session_id) is session else None
+
+    def _handle_line(self, line: bytes, default_id: str,
+                     owned: Dict[str, object]) -> Optional[Dict]:
+        text = line.decode("utf-8", "replace").strip()
+        if not text:
+            return None
+        request = None
+        if text.startswith("{"):
+            try:
+                request = json.loads(text)
+            except ValueError:
+                return {"error": "invalid json"}
+        if not isinstance(request, dict):
+            request = {"cmd": text}
+
+        session_id = request.get("session", default_id)
+        if not isinstance(session_id, str):
+            session_id = str(session_id)
+        op = request.get("op")
+        if op == "stats":
+            reply = self.stats()
+        elif self._owned(session_id, owned) is None:
+            reply = {"error": "session not owned", "session": session_id}
+        elif op == "close":
+            self.close_session(session_id)
+            owned.pop(session_id, None)
+            reply = {"session": session_id, "closed": True}
+        elif isinstance(request.get("cmd"), str):
+            session_id, session = self.open_session(session_id)
+            if session is None:
+                reply = {"error": "server full"}
+            else:
+                owned[session_id] = session
+                reply = self.execute(session_id, session, request["cmd"])
+        else:
+            reply = {"error": "expected 'cmd' or 'op'"}
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, payload: Dict):
+        writer.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    # ======================= MANUTENÇÃO =====================
+
+    def maintain(self, now: Optional[float] = None):
+        """Uma passada pelas sessões (também chamada pelos testes de carga)"""
+        now = self.host.clock.time() if now is None else now
+        for session_id, session in list(self.sessions.items()):
+            if now - session.last_activity >= self.idle_timeout:
+                self.close_session(session_id)
+                self.evicted += 1
+                continue
+            session.decay_emocao()
+            session.ram_maintenance()
+
+
+async def serve(host, address: str, ready=None) -> None:
+    """Roda o servidor até SIGTERM/SIGINT (ou cancelamento).
+
+    address: "HOST:PORTA" (TCP) ou "unix:CAMINHO". ready(endereço real)
+    é chamado quando o socket está ouvindo (porta 0 = porta livre).
+    """
+    # HD aberto (thread hd-init) antes de aceitar clientes: nenhuma sessão
+    # espera a migração/índice dentro do loop
+    await asyncio.get_running_loop().run_in_executor(None, host.ensure_hd)
+    server = DarvisServer(host)
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        await server.start_unix(path)
+        bound = f"unix:{path}"
+    else:
+        name, _, port = address.rpartition(":")
+        listener = await server.start_tcp(name or "127.0.0.1", int(port))
+        sockname = listener.sockets[0].getsockname()
+        bound = f"{sockname[0]}:{sockname[1]}"
+    if ready is not None:
+        ready(bound)
+
+    # SIGTERM/SIGINT encerram com limpeza (sessões fechadas, HD drenado)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
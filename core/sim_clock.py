@@ -0,0 +1,85 @@
+# core/sim_clock.py
+# ============================================================
+# RELÓGIO E ACASO INJETÁVEIS (TEMPO REAL OU VIRTUAL)
+# ============================================================
+# - SystemClock: time.time / time.monotonic / time.perf_counter
+# - VirtualClock: o tempo só anda quando alguém manda
+#     advance(dt), advance_to(t), sleep(dt) (não bloqueia);
+#     time(), monotonic() e perf_counter() são o mesmo instante
+# - fast_forward(): pula direto de um prazo do agendador para o
+#   próximo (uma semana de operação em segundos)
+# - make_rng(seed): random.Random semeado; com o relógio virtual,
+#   a mesma semente reproduz a execução bit a bit
+# ============================================================
+
+import random
+import time
+from typing import Optional, Tuple
+
+# Início padrão do tempo virtual (fixo: datas no HD reproduzíveis)
+VIRTUAL_EPOCH = 1_700_000_000.0
+
+
+class SystemClock:
+    """Relógio real (padrão de todos os subsistemas)"""
+    virtual = False
+
+    def __init__(self):
+        self.time = time.time
+        self.monotonic = time.monotonic
+        self.perf_counter = time.perf_counter
+        self.sleep = time.sleep
+
+
+class VirtualClock:
+    """Tempo simulado: parado até advance()/sleep(); nunca volta atrás"""
+    virtual = True
+
+    def __init__(self, start: float = VIRTUAL_EPOCH):
+        self.now = float(start)
+        self.start = self.now
+
+    def time(self) -> float:
+        return self.now
+
+    monotonic = time
+    # Duração medida em tempo virtual: execuções "instantâneas" (estatísticas reproduzíveis)
+    perf_counter = time
+
+    def advance(self, dt: float) -> float:
+        if dt < 0:
+            raise ValueError("dt must be >= 0")
+        self.now += dt
+        return self.now
+
+    def advance_to(self, t: float) -> float:
+        if t > self.now:
+            self.now = float(t)
+        return self.now
+
+    sleep = advance
+
+    @property
+    def elapsed(self) -> float:
+        return self.now - self.start
+
+
+def make_rng(seed: Optional[int] = None) -> Tuple[random.Random, int]:
+    """RNG semeado; sem semente, sorteia uma e a devolve (para o replay)"""
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    return random.Random(seed), seed
+
+
+def fast_forward(scheduler, clock: VirtualClock, until: float) -> int:
+    """Executa as tarefas do agendador até o instante `until`, saltando o
+    relógio de prazo em prazo; devolve quantas execuções houve"""
+    ran = 0
+    while True:
+        deadline = scheduler.next_deadline()
+        if deadline is None or deadline > until:
+            clock.advance_to(until)
+            return ran
+        # Prazo exato (sem somar deltas): run_pending vê a tarefa vencida
+        clock.advance_to(deadline)
+        ran += scheduler.run_pending(clock.now)
@@ -0,0 +1,105 @@
+# core/soak.py
+# ============================================================
+# TESTE DE LONGA DURAÇÃO EM TEMPO VIRTUAL (SOAK)
+# ============================================================
+# - DarvisAssistant headless sobre um VirtualClock: dias de
+#   operação em segundos (o relógio salta de prazo em prazo)
+# - Comandos chegam como processo de Poisson (intervalo médio
+#   mean_gap), sorteados de um RNG derivado da semente
+# - Tarefas periódicas (RAM, autosave, sonhos, carga, emoção)
+#   rodam nos seus prazos virtuais, entre um comando e outro
+# - Digest SHA-256 das respostas e do estado final: a mesma
+#   semente reproduz o mesmo digest (replay de incidentes)
+# ============================================================
+
+import hashlib
+import json
+import random
+import time
+from typing import IO, Dict, List, Optional, Sequence
+
+from core.darvis_config import SystemState
+from core.sim_clock import fast_forward
+
+SOAK_COMMANDS = ["status", "luz ligar 70", "luz desligar", "luz", "emoção", "oi",
+                 "descansar", "ajuda", "o que é relatividade", "qual área fotossíntese",
+                 "integridade", "stauts", "sim"]
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_duration(text: str) -> float:
+    """"90", "45m", "36h", "7d", "2w" -> segundos"""
+    text = text.strip().lower()
+    unit = DURATION_UNITS.get(text[-1:])
+    if unit is None:
+        return float(text)
+    return float(text[:-1]) * unit
+
+
+def final_state(darvis) -> Dict:
+    """Estado comparável entre execuções (sem tempos de parede)"""
+    return {
+        "registradores": darvis.registradores,
+        "emotion": darvis.emotion_snapshot(),
+        "luz": darvis.luz_quarto,
+        "ram": darvis.ram.stats(),
+        "tasks": {name: s["runs"] for name, s in darvis.scheduler.stats().items()}
+    }
+
+
+def run_soak(darvis, seconds: float, mean_gap: float = 300.0,
+             commands: Sequence[str] = SOAK_COMMANDS, out: Optional[IO] = None) -> Dict:
+    """Simula `seconds` de operação; escreve um registro por comando em `out`"""
+    clock = darvis.clock
+    if not clock.virtual:
+        raise ValueError("soak requires a VirtualClock")
+    # Fluxo de comandos separado do RNG do assistente: o roteiro não
+    # muda quando um subsistema passa a sortear mais ou menos
+    rng = random.Random(darvis.rng.getrandbits(64))
+    # Como o loop da janela: em operação (ociosidade vira IDLE pelo sim_tick)
+    darvis.registradores["STATE"] = SystemState.ACTIVE.value
+    digest = hashlib.sha256()
+    end = clock.now + seconds
+    processed = 0
+    rejected = 0
+    task_runs = 0
+    started = time.perf_counter()
+
+    while darvis.running:
+        at = clock.now + rng.expovariate(1.0 / mean_gap)
+        if at > end:
+            break
+        task_runs += fast_forward(darvis.scheduler, clock, at)
+
+        cmd = rng.choice(commands)
+        first_msg = len(darvis.mensagens)
+        resp = darvis.processar_comando(cmd)
+        said: List[str] = [m.text for m in darvis.mensagens[first_msg:]]
+        del darvis.mensagens[first_msg:]
+
+        processed += 1
+        if resp is None:
+            rejected += 1
+        line = json.dumps({"t": round(clock.elapsed, 6), "cmd": cmd, "response": resp,
+                           "messages": said}, ensure_ascii=False, sort_keys=True)
+        digest.update(line.encode("utf-8") + b"\n")
+        if out is not None:
+            out.write(line + "\n")
+
+    if darvis.running:
+        task_runs += fast_forward(darvis.scheduler, clock, end)
+    wall = time.perf_counter() - started
+
+    final = final_state(darvis)
+    digest.update(json.dumps(final, sort_keys=True, default=str).encode("utf-8"))
+    return {
+        "virtual_seconds": round(clock.elapsed, 3),
+        "wall_seconds": round(wall, 3),
+        "speedup": round(clock.elapsed / wall, 1) if wall > 0 else 0.0,
+        "commands": processed,
+        "rejected": rejected,
+        "task_runs": task_runs,
+        "final": final,
+        "digest": digest.hexdigest()
+    }
@@ -0,0 +1,261 @@
+# core/speech.py
+# ============================================================
+# VOZ — WORKER ÚNICO COM FILA DE PRIORIDADE
+# ============================================================
+# - Uma thread de fala de longa duração (nada de thread por frase)
+# - Fila limitada: frases repetidas são fundidas, as vencidas
+#   (mesma duração da Message na tela) são descartadas
+# - Prioridade URGENT (erros, desligamento) fura a fila e
+#   interrompe a frase em andamento
+# - Frases fixas (sonhos/respostas) são sintetizadas uma vez em
+#   WAV no tempo ocioso e depois tocadas pelo pygame.mixer
+# ============================================================
+
+import hashlib
+import heapq
+import itertools
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+@dataclass(order=True)
+class Utterance:
+    priority: int
+    seq: int
+    text: str = field(compare=False)
+    expires: float = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class SpeechWorker:
+    """Fila de fala consumida por um único worker"""
+
+    def __init__(self, engine, max_queue: int = 8, cache_dir: Optional[str] = None,
+                 cache_tag: str = ""):
+        self.engine = engine
+        self.max_queue = max(1, int(max_queue))
+        self.cache_dir = cache_dir
+        self.cache_tag = cache_tag
+
+        self._heap: List[Utterance] = []
+        self._pending: Dict[str, Utterance] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._interrupt = threading.Event()
+        self._current: Optional[Utterance] = None
+        self._to_cache: List[str] = []
+        self._closing = False
+
+        self.metrics = {
+            "enqueued": 0,
+            "spoken": 0,
+            "coalesced": 0,
+            "dropped_full": 0,
+            "dropped_expired": 0,
+            "preempted": 0,
+            "cache_hits": 0,
+            "cached": 0,
+            "errors": 0
+        }
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+        self._thread.start()
+
+    # ======================= PRODUTORES =====================
+
+    def say(self, text: str, priority: int = PRIORITY_NORMAL, ttl: float = 6.0) -> bool:
+        """Enfileira uma frase; False se foi descartada ou fundida"""
+        if not text:
+            return False
+        expires = time.time() + ttl
+
+        with self._cond:
+            if self._closing:
+                return False
+
+            # Mesma frase já tocando ou na fila: funde
+            current = self._current
+            if current is not None and current.text == text:
+                self.metrics["coalesced"] += 1
+                return False
+            queued = self._pending.get(text)
+            if queued is not None:
+                self.metrics["coalesced"] += 1
+                queued.expires = max(queued.expires, expires)
+                if priority >= queued.priority:
+                    return False
+                # Subiu de prioridade: reinsere
+                queued.cancelled = True
+                expires = queued.expires
+
+            elif len(self._pending) >= self.max_queue:
+                worst = max(self._pending.values())
+                if priority >= worst.priority:
+                    self.metrics["dropped_full"] += 1
+                    return False
+                worst.cancelled = True
+                del self._pending[worst.text]
+                self.metrics["dropped_full"] += 1
+
+            item = Utterance(priority, next(self._seq), text, expires)
+            heapq.heappush(self._heap, item)
+            self._pending[text] = item
+            self.metrics["enqueued"] += 1
+
+            if current is not None and priority < current.priority:
+                self._preempt()
+            self._cond.notify()
+        return True
+
+    def precache(self, phrases: Iterable[str]):
+        """Frases fixas a sintetizar em WAV quando o worker estiver ocioso"""
+        if not self.cache_dir:
+            return
+        with self._cond:
+            for text in phrases:
+                if text not in self._to_cache and not os.path.exists(self.cache_path(text)):
+                    self._to_cache.append(text)
+            self._cond.notify()
+
+    def cache_path(self, text: str) -> str:
+        key = hashlib.sha1(f"{self.cache_tag}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    @property
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    # ======================= WORKER =========================
+
+    def _next_locked(self) -> Optional[Utterance]:
+        now = time.time()
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            if item.cancelled:
+                continue
+            del self._pending[item.text]
+            if self._closing and item.priority > PRIORITY_URGENT:
+                continue
+            if item.expires < now:
+                self.metrics["dropped_expired"] += 1
+                continue
+            return item
+        return None
+
+    def _run(self):
+        while True:
+            phrase = None
+            with self._cond:
+                item = self._next_locked()
+                while item is None:
+                    if self._closing:
+                        return
+                    if self._to_cache and _mixer_ready():
+                        phrase = self._to_cache.pop(0)
+                        break
+                    self._cond.wait(0.5)
+                    item = self._next_locked()
+                self._current = item
+                self._interrupt.clear()
+
+            if item is None:
+                self._synthesize(phrase)
+                continue
+
+            self._speak(item)
+            with self._cond:
+                self._current = None
+
+    def _speak(self, item: Utterance):
+        try:
+            path = self.cache_path(item.text) if self.cache_dir else None
+            if path and os.path.exists(path) and self._play(path):
+                with self._cond:
+                    self.metrics["cache_hits"] += 1
+                    self.metrics["spoken"] += 1
+                return
+            self.engine.say(item.text)
+            self.engine.runAndWait()
+            with self._cond:
+                self.metrics["spoken"] += 1
+        except Exception as e:
+            with self._cond:
+                self.metrics["errors"] += 1
+            print(f"Erro TTS: {e}")
+
+    def _play(self, path: str) -> bool:
+        """Toca o WAV em cache; interrompível por _preempt"""
+        if not _mixer_ready():
+            return False
+        import pygame
+
+        sound = pygame.mixer.Sound(path)
+        channel = sound.play()
+        if channel is None:
+            return False
+        if self._interrupt.wait(sound.get_length()):
+            channel.stop()
+        return True
+
+    def _synthesize(self, text: str):
+        path = self.cache_path(text)
+        tmp = path + ".tmp.wav"
+        try:
+            self.engine.save_to_file(text, tmp)
+            self.engine.runAndWait()
+            if os.path.exists(tmp) and os.path.getsize(tmp) > 0:
+                os.replace(tmp, path)
+                with self._cond:
+                    self.metrics["cached"] += 1
+        except Exception as e:
+            with self._cond:
+                self.metrics["errors"] += 1
+            print(f"Erro TTS (cache): {e}")
+
+    def _preempt(self):
+        """Interrompe a frase atual (chamado com o lock)"""
+        self.metrics["preempted"] += 1
+        self._interrupt.set()
+        try:
+            self.engine.stop()
+        except Exception:
+            pass
+
+    # ======================= ENCERRAMENTO ===================
+
+    def close(self, timeout: float = 3.0):
+        """Fala só o que for URGENT (ex.: despedida) e encerra o worker"""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            current = self._current
+            if current is not None and current.priority > PRIORITY_URGENT:
+                self._preempt()
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def snapshot(self) -> Dict:
+        with self._cond:
+            data = dict(self.metrics)
+            data["depth"] = len(self._pending)
+        return data
+
+
+def _mixer_ready() -> bool:
+    try:
+        import pygame
+    except ImportError:
+        return False
+    return bool(pygame.mixer.get_init())
@@ -0,0 +1,138 @@
+# core/text_cache.py
+# ============================================================
+# CACHE DE SUPERFÍCIES DE TEXTO + POOL DE FUNDOS ALFA
+# ============================================================
+# - font.render é caro; a maioria dos textos do HUD se repete
+# - Cache LRU por (fonte, texto, cor, antialias)
+# - Fundo semitransparente reaproveitado em vez de um
+#   pygame.Surface(SRCALPHA) novo por mensagem por frame
+# - FontCache: SysFont varre as fontes do sistema; o arquivo
+#   resolvido fica salvo e a próxima partida abre direto
+# ============================================================
+
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+
+class TextCache:
+    """Cache LRU de superfícies de texto renderizadas"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text: str, color, antialias: bool = True) -> "pygame.Surface":
+        key = (font, text, tuple(color), antialias)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._entries[key] = surface
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class AlphaSurfacePool:
+    """Uma superfície SRCALPHA reaproveitada; cresce só quando necessário"""
+
+    def __init__(self, width: int = 256, height: int = 32):
+        self._surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+    def filled(self, size: Tuple[int, int], color) -> Tuple["pygame.Surface", "pygame.Rect"]:
+        """(superfície, área) com a região size pintada em color"""
+        width, height = size
+        if width > self._surface.get_width() or height > self._surface.get_height():
+            self._surface = pygame.Surface(
+                (max(width, self._surface.get_width()), max(height, self._surface.get_height())),
+                pygame.SRCALPHA)
+        area = pygame.Rect(0, 0, width, height)
+        self._surface.fill(color, area)
+        return self._surface, area
+
+
+class FontCache:
+    """Fontes por arquivo resolvido ("nome|negrito" -> [caminho, negrito sintético])"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.files: Dict[str, list] = {}
+        self._fonts: Dict[tuple, "pygame.font.Font"] = {}
+        self._resolved: Dict[str, tuple] = {}  # inclui "sem arquivo" (fonte padrão)
+        self.scans = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.files = json.load(f)
+            except (OSError, ValueError):
+                self.files = {}
+
+    def get(self, name: str, size: int, bold: bool = False) -> "pygame.font.Font":
+        key = (name, size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = self._open(name, size, bold)
+        return font
+
+    def _open(self, name: str, size: int, bold: bool) -> "pygame.font.Font":
+        key = f"{name}|{int(bold)}"
+        if key in self._resolved:
+            path, set_bold = self._resolved[key]
+            return _construct(path, size, set_bold)
+        entry = self.files.get(key)
+        if entry and os.path.exists(entry[0]):
+            self._resolved[key] = tuple(entry)
+            return _construct(entry[0], size, entry[1])
+
+        # Nome novo (ou arquivo sumiu): resolve uma vez pelo SysFont
+        resolved = []
+
+        def capture(path, size, set_bold, set_italic):
+            resolved.append((path, set_bold))
+            return _construct(path, size, set_bold)
+
+        self.scans += 1
+        font = pygame.font.SysFont(name, size, bold, constructor=capture)
+        path, set_bold = self._resolved[key] = resolved[0]
+        # Sem arquivo (fonte padrão do pygame) não vale guardar: nada a pular
+        if path:
+            self.files[key] = [path, set_bold]
+            self._save()
+        return font
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.files, f, indent=2)
+        except OSError:
+            pass
+
+
+def _construct(path: Optional[str], size: int, bold: bool) -> "pygame.font.Font":
+    font = pygame.font.Font(path, size)
+    if bold:
+        font.set_bold(True)
+    return font
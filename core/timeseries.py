@@ -0,0 +1,196 @@
+# core/timeseries.py
+# ============================================================
+# SÉRIES TEMPORAIS COMPACTAS (DOPAMINA, LOAD, RAM)
+# ============================================================
+# - Anéis de capacidade fixa sobre array("d"): nenhum dict/tupla
+#   por amostra, memória constante
+# - Camadas de redução: bruto -> por segundo -> por minuto -> por
+#   hora; cada balde guarda média, mínimo e máximo
+# - Resumos vetorizados com NumPy quando disponível (frombuffer,
+#   sem cópia); sem NumPy, cai para min/max/sum sobre o array.
+#   NumPy só é importado no primeiro resumo (~100 ms de import)
+# - sparkline(): últimos N pontos de uma camada para o HUD
+# ============================================================
+
+import math
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+_np = None  # módulo numpy, False se indisponível; ver _numpy()
+
+
+def _numpy():
+    """NumPy (opcional) importado sob demanda"""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np or None
+
+# (resolução em segundos, capacidade em baldes)
+DEFAULT_TIERS = ((1, 3600), (60, 1440), (3600, 720))
+
+
+class Ring:
+    """Colunas paralelas de doubles num anel de capacidade fixa"""
+
+    __slots__ = ("capacity", "columns", "index", "count")
+
+    def __init__(self, capacity: int, columns: int):
+        self.capacity = max(1, int(capacity))
+        self.columns = [array("d", bytes(8 * self.capacity)) for _ in range(columns)]
+        self.index = 0
+        self.count = 0
+
+    def append(self, *values: float):
+        i = self.index
+        for column, value in zip(self.columns, values):
+            column[i] = value
+        self.index = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def ordered(self, column: int, last: Optional[int] = None) -> array:
+        """Coluna em ordem cronológica (opcionalmente só os últimos N)"""
+        data = self.columns[column]
+        if self.count < self.capacity:
+            out = data[:self.count]
+        else:
+            out = data[self.index:] + data[:self.index]
+        if last is not None and last < len(out):
+            out = out[len(out) - last:]
+        return out
+
+    def last(self, column: int) -> float:
+        return self.columns[column][(self.index - 1) % self.capacity] if self.count else math.nan
+
+
+class Tier:
+    """Camada de redução: um balde (média/mín/máx) a cada `resolution` s"""
+
+    __slots__ = ("resolution", "ring", "bucket", "total", "n", "low", "high")
+
+    # Colunas do anel
+    TIME, MEAN, MIN, MAX = range(4)
+
+    def __init__(self, resolution: float, capacity: int):
+        self.resolution = resolution
+        self.ring = Ring(capacity, 4)
+        self.bucket = None
+        self.total = 0.0
+        self.n = 0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, t: float, value: float):
+        bucket = t - (t % self.resolution)
+        if bucket != self.bucket:
+            self.flush()
+            self.bucket = bucket
+        self.total += value
+        self.n += 1
+        if value < self.low:
+            self.low = value
+        if value > self.high:
+            self.high = value
+
+    def flush(self):
+        """Fecha o balde corrente no anel"""
+        if self.n:
+            self.ring.append(self.bucket, self.total / self.n, self.low, self.high)
+        self.total = 0.0
+        self.n = 0
+        self.low = math.inf
+        self.high = -math.inf
+
+
+class TimeSeries:
+    """Série bruta + camadas reduzidas"""
+
+    def __init__(self, raw_capacity: int = 600, tiers=DEFAULT_TIERS):
+        self.raw = Ring(raw_capacity, 2)
+        self.tiers = [Tier(resolution, capacity) for resolution, capacity in tiers]
+
+    def add(self, t: float, value: float):
+        self.raw.append(t, value)
+        for tier in self.tiers:
+            tier.add(t, value)
+
+    def tier(self, resolution: Optional[float]) -> Tuple[Ring, int, int, int, int]:
+        """(anel, colunas de tempo, média, mínimo e máximo) da camada pedida"""
+        if resolution is None:
+            return self.raw, 0, 1, 1, 1
+        for tier in self.tiers:
+            if tier.resolution == resolution:
+                return tier.ring, Tier.TIME, Tier.MEAN, Tier.MIN, Tier.MAX
+        raise KeyError(f"camada inexistente: {resolution}s")
+
+
+class TimeSeriesStore:
+    """Conjunto de séries nomeadas com resumos e sparklines"""
+
+    def __init__(self, names=(), raw_capacity: int = 600, tiers=DEFAULT_TIERS):
+        self.raw_capacity = raw_capacity
+        self.tier_spec = tuple(tiers)
+        self.series: Dict[str, TimeSeries] = {}
+        for name in names:
+            self.series[name] = TimeSeries(raw_capacity, self.tier_spec)
+
+    def record(self, name: str, t: float, value: float):
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = TimeSeries(self.raw_capacity, self.tier_spec)
+        series.add(t, value)
+
+    def last(self, name: str) -> float:
+        return self.series[name].raw.last(1)
+
+    def summary(self, name: str, resolution: Optional[float] = None,
+                since: Optional[float] = None) -> Dict[str, float]:
+        """count/mean/min/max/last de uma camada (None = amostras brutas)"""
+        ring, tcol, vcol, mincol, maxcol = self.series[name].tier(resolution)
+        count = ring.count
+        empty = {"count": 0, "mean": math.nan, "min": math.nan, "max": math.nan,
+                 "last": ring.last(vcol)}
+        if not count:
+            return empty
+
+        np = _numpy()
+        if np is not None:
+            cols = [np.frombuffer(ring.columns[c], dtype=np.float64)[:count]
+                    for c in (vcol, mincol, maxcol)]
+            if since is not None:
+                mask = np.frombuffer(ring.columns[tcol], dtype=np.float64)[:count] >= since
+                cols = [c[mask] for c in cols]
+            means, lows, highs = cols
+            if not means.size:
+                return empty
+            return {"count": int(means.size), "mean": float(means.mean()),
+                    "min": float(lows.min()), "max": float(highs.max()),
+                    "last": ring.last(vcol)}
+
+        cols = [ring.columns[c][:count] for c in (vcol, mincol, maxcol)]
+        if since is not None:
+            keep = [t >= since for t in ring.columns[tcol][:count]]
+            cols = [array("d", (v for v, k in zip(c, keep) if k)) for c in cols]
+        means, lows, highs = cols
+        if not means:
+            return empty
+        return {"count": len(means), "mean": sum(means) / len(means),
+                "min": min(lows), "max": max(highs), "last": ring.last(vcol)}
+
+    def sparkline(self, name: str, points: int, resolution: Optional[float] = 1) -> array:
+        """Últimos `points` valores (média por balde) em ordem cronológica"""
+        ring, _, vcol, _, _ = self.series[name].tier(resolution)
+        return ring.ordered(vcol, points)
+
+    def version(self, name: str, resolution: Optional[float] = 1) -> Tuple[int, int]:
+        """Muda quando um balde novo é fechado (chave de redesenho)"""
+        ring = self.series[name].tier(resolution)[0]
+        return ring.index, ring.count
+
+    def names(self) -> List[str]:
+        return list(self.series)
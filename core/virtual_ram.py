@@ -0,0 +1,176 @@
+# core/virtual_ram.py
+# ============================================================
+# RAM VIRTUAL — ALOCADOR SIMULADO COM CLASSES DE TAMANHO
+# ============================================================
+# - Blocos com __slots__ numa OrderedDict (lista duplamente
+#   encadeada + hash): alocar, liberar e tocar são O(1)
+# - Tamanho arredondado para a classe (potência de 2): a diferença
+#   é a fragmentação interna, contabilizada de verdade
+# - used_mb é sempre a soma exata dos blocos vivos
+# - acquire(): bloco nomeado pelo motivo; pedir o mesmo motivo de
+#   novo reaproveita o bloco vivo (touch) em vez de alocar outro
+# - Despejo pela frente da fila:
+#     "time" -> mais antigo primeiro (ordem de alocação)
+#     "lru"  -> menos usado recentemente (touch() move ao fim)
+# ============================================================
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+POLICIES = ("time", "lru")
+
+
+class RAMBlock:
+    """Bloco alocado (registro enxuto, sem __dict__)"""
+
+    __slots__ = ("id", "reason", "size_mb", "class_mb", "timestamp", "last_access")
+
+    def __init__(self, block_id: int, reason: str, size_mb: int, class_mb: int, timestamp: float):
+        self.id = block_id
+        self.reason = reason
+        self.size_mb = size_mb
+        self.class_mb = class_mb
+        self.timestamp = timestamp
+        self.last_access = timestamp
+
+
+def size_class(mb: int) -> int:
+    """Menor potência de 2 >= mb (mínimo 1 MB)"""
+    mb = max(1, int(mb))
+    return 1 << (mb - 1).bit_length()
+
+
+class VirtualRAM:
+    """Alocador simulado com contabilidade exata e políticas de despejo"""
+
+    def __init__(self, total_mb: int, max_blocks: int = 50, policy: str = "time",
+                 clock: Callable[[], float] = time.time):
+        if policy not in POLICIES:
+            raise ValueError(f"política de RAM desconhecida: {policy!r} (use {POLICIES})")
+        self.clock = clock
+        self.total_mb = total_mb
+        self.max_blocks = max(1, int(max_blocks))
+        self.policy = policy
+        self.blocks: "OrderedDict[int, RAMBlock]" = OrderedDict()
+        self.used_mb = 0
+        self.requested_mb = 0
+        self.peak_mb = 0
+        self._next_id = 1
+        self.allocations = 0
+        self.reuses = 0
+        self._named: Dict[str, int] = {}  # motivo -> bloco de acquire()
+        self.evictions = {"count": 0, "age": 0, "pressure": 0, "manual": 0}
+
+    # ======================= ALOCAÇÃO =======================
+
+    def allocate(self, mb: int, reason: str, now: Optional[float] = None) -> int:
+        """Aloca um bloco e devolve seu id"""
+        now = self.clock() if now is None else now
+        class_mb = size_class(mb)
+
+        # Limite de blocos vivos: despeja pela política
+        if len(self.blocks) >= self.max_blocks:
+            self._evict_front("count")
+        while self.blocks and self.used_mb + class_mb > self.total_mb:
+            self._evict_front("pressure")
+
+        block = RAMBlock(self._next_id, reason, mb, class_mb, now)
+        self._next_id += 1
+        self.blocks[block.id] = block
+        self.used_mb += class_mb
+        self.requested_mb += mb
+        self.allocations += 1
+        if self.used_mb > self.peak_mb:
+            self.peak_mb = self.used_mb
+        return block.id
+
+    def acquire(self, mb: int, reason: str, now: Optional[float] = None) -> int:
+        """Bloco do motivo `reason`: reaproveita (touch) se ainda vivo, senão aloca"""
+        block_id = self._named.get(reason)
+        if block_id is not None and self.touch(block_id, now):
+            self.reuses += 1
+            return block_id
+        block_id = self.allocate(mb, reason, now)
+        self._named[reason] = block_id
+        return block_id
+
+    def touch(self, block_id: int, now: Optional[float] = None) -> bool:
+        """Marca o bloco como usado (relevante na política lru)"""
+        block = self.blocks.get(block_id)
+        if block is None:
+            return False
+        block.last_access = self.clock() if now is None else now
+        if self.policy == "lru":
+            self.blocks.move_to_end(block_id)
+        return True
+
+    def free(self, block_id: int) -> bool:
+        block = self.blocks.pop(block_id, None)
+        if block is None:
+            return False
+        self._account_free(block)
+        return True
+
+    # ======================= DESPEJO ========================
+
+    def _age_key(self, block: RAMBlock) -> float:
+        return block.last_access if self.policy == "lru" else block.timestamp
+
+    def _evict_front(self, cause: str):
+        _, block = self.blocks.popitem(last=False)
+        self._account_free(block)
+        self.evictions[cause] += 1
+
+    def _account_free(self, block: RAMBlock):
+        if self._named.get(block.reason) == block.id:
+            del self._named[block.reason]
+        self.used_mb -= block.class_mb
+        self.requested_mb -= block.size_mb
+
+    def evict_older_than(self, max_age: float, now: Optional[float] = None) -> int:
+        """Despeja blocos mais velhos que max_age; O(k) nos despejados"""
+        cutoff = (self.clock() if now is None else now) - max_age
+        evicted = 0
+        while self.blocks:
+            block = next(iter(self.blocks.values()))
+            if self._age_key(block) >= cutoff:
+                break
+            self._evict_front("age")
+            evicted += 1
+        return evicted
+
+    def shrink_to(self, target_mb: float) -> int:
+        """Despeja pela frente até used_mb <= target_mb"""
+        evicted = 0
+        while self.blocks and self.used_mb > target_mb:
+            self._evict_front("manual")
+            evicted += 1
+        return evicted
+
+    # ======================= MÉTRICAS =======================
+
+    def usage_percent(self) -> float:
+        return round(self.used_mb / self.total_mb * 100, 1)
+
+    def fragmentation(self) -> float:
+        """Fração reservada e não pedida (fragmentação interna)"""
+        if not self.used_mb:
+            return 0.0
+        return (self.used_mb - self.requested_mb) / self.used_mb
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def stats(self) -> Dict:
+        return {
+            "policy": self.policy,
+            "blocks": len(self.blocks),
+            "used_mb": self.used_mb,
+            "requested_mb": self.requested_mb,
+            "peak_mb": self.peak_mb,
+            "fragmentation": round(self.fragmentation(), 4),
+            "allocations": self.allocations,
+            "reuses": self.reuses,
+            "evictions": dict(self.evictions)
+        }
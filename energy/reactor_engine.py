@@ -0,0 +1,285 @@
+# energy/reactor_engine.py
+# Motor de simulação contínua de reatores (NumPy): N reatores integrados
+# juntos, passo fixo (RK4) ou adaptativo (Bogacki-Shampine 3(2)),
+# limites de estabilidade com desarme (trip) e saída em blocos.
+#
+# Modelo (por segundo), u = aceleração de partículas em [-1, 1]:
+#   dP/dt = ganho_acel*u+ - ganho_desac*u- - vazamento*(P - P_base)
+#   dS/dt = -perda_acel*u+ + ganho_estab*u- + recuperação*(1 - S)
+#           - estresse*(max(P - P_nominal, 0)/P_nominal)^2
+# Os ganhos são os mesmos degraus do ArcReactorSim (+10/-0.05, -5/+0.03).
+# Desarmado: u = 0 e a potência cai com constante scram_tau.
+from dataclasses import dataclass
+
+import numpy as np
+
+# Folga de tempo (s): t acumula dt em float (1200 x 0.05 s -> 59.9999999999987)
+TIME_EPS = 1e-9
+
+
+@dataclass
+class ReactorParams:
+    base_output: float = 100.0
+    nominal_output: float = 150.0
+    max_output: float = 400.0
+    min_stability: float = 0.2
+    accel_output: float = 10.0
+    accel_stability: float = 0.05
+    decel_output: float = 5.0
+    decel_stability: float = 0.03
+    leak: float = 0.05
+    recovery: float = 0.02
+    stress: float = 0.5
+    scram_tau: float = 2.0
+
+
+class ReactorBank:
+    """N reatores; estado empilhado (linha 0 = energia, linha 1 = estabilidade)"""
+
+    def __init__(self, n, params=None, output=100.0, stability=1.0):
+        self.params = params or ReactorParams()
+        self.n = int(n)
+        self.t = 0.0
+        self.state = np.empty((2, self.n))
+        self.state[0] = output
+        self.state[1] = stability
+        self.throttle = np.zeros(self.n)
+        self.tripped = np.zeros(self.n, dtype=bool)
+        self.tripped_any = False
+        self.trip_time = np.full(self.n, np.nan)
+        self.events = []  # (tempo, reator, motivo)
+        self.steps = 0
+        self.rejected = 0
+
+    @property
+    def output(self):
+        return self.state[0]
+
+    @output.setter
+    def output(self, value):
+        self.state[0] = value
+
+    @property
+    def stability(self):
+        return self.state[1]
+
+    @stability.setter
+    def stability(self, value):
+        self.state[1] = value
+
+    # Compatível com ArcReactorSim (degraus discretos)
+    def accelerate_particles(self, idx=None):
+        sel = slice(None) if idx is None else idx
+        self.output[sel] += self.params.accel_output
+        self.stability[sel] -= self.params.accel_stability
+
+    def decelerate_particles(self, idx=None):
+        sel = slice(None) if idx is None else idx
+        self.output[sel] -= self.params.decel_output
+        self.stability[sel] += self.params.decel_stability
+
+    def status(self, i=0):
+        estado = {
+            "Energia Gerada": float(self.output[i]),
+            "Estabilidade": round(float(self.stability[i]), 2)
+        }
+        if self.tripped[i]:
+            estado["Desarmado em (s)"] = round(float(self.trip_time[i]), 3)
+        return estado
+
+    def reset(self, idx=None):
+        """Rearma reatores desarmados (estado físico é mantido)"""
+        sel = slice(None) if idx is None else idx
+        self.tripped[sel] = False
+        self.trip_time[sel] = np.nan
+        self.tripped_any = bool(self.tripped.any())
+
+    # ======================= DINÂMICA =======================
+
+    def drive(self, control=None):
+        """Termos que não dependem do estado (fixos durante um passo):
+
+        dP = drive[0] - k_p * P
+        dS = drive[1] - recuperação * S - estresse' * max(P - P_nominal, 0)^2
+        """
+        p = self.params
+        u = np.where(self.tripped, 0.0, self._control(control))
+        up = np.maximum(u, 0.0)
+        down = np.maximum(-u, 0.0)
+        drive = np.empty((2, self.n))
+        drive[0] = p.accel_output * up - p.decel_output * down + p.leak * p.base_output
+        drive[0][self.tripped] = 0.0
+        drive[1] = p.decel_stability * down - p.accel_stability * up + p.recovery
+        k = np.empty((2, self.n))
+        k[0] = np.where(self.tripped, 1.0 / p.scram_tau, p.leak)
+        k[1] = p.recovery
+        # Limites por reator: desarmados não disparam de novo
+        limits = (np.where(self.tripped, -np.inf, p.min_stability),
+                  np.where(self.tripped, np.inf, p.max_output))
+        return drive, k, limits
+
+    def derivatives(self, y, drive):
+        p = self.params
+        base, k, _ = drive
+        over = y[0] - p.nominal_output
+        np.maximum(over, 0.0, out=over)
+        over *= over
+        over *= p.stress / (p.nominal_output * p.nominal_output)
+        dy = k * y
+        np.subtract(base, dy, out=dy)
+        dy[1] -= over
+        return dy
+
+    def _control(self, control):
+        if control is None:
+            return self.throttle
+        if callable(control):
+            control = control(self.t, self)
+        return np.broadcast_to(np.asarray(control, dtype=np.float64), (self.n,))
+
+    def _rk4(self, dt, drive):
+        y = self.state
+        h = 0.5 * dt
+        k1 = self.derivatives(y, drive)
+        k2 = self.derivatives(y + h * k1, drive)
+        k3 = self.derivatives(y + h * k2, drive)
+        k4 = self.derivatives(y + dt * k3, drive)
+        k2 += k3
+        k1 += k4
+        k1 += 2.0 * k2
+        k1 *= dt / 6.0
+        return y + k1
+
+    def _bs23(self, dt, drive):
+        """Bogacki-Shampine: solução de 3ª ordem + estimativa de erro"""
+        y = self.state
+        k1 = self.derivatives(y, drive)
+        k2 = self.derivatives(y + (0.5 * dt) * k1, drive)
+        k3 = self.derivatives(y + (0.75 * dt) * k2, drive)
+        y3 = y + dt * (2 / 9 * k1 + 1 / 3 * k2 + 4 / 9 * k3)
+        k4 = self.derivatives(y3, drive)
+        err = dt * (-5 / 72 * k1 + 1 / 12 * k2 + 1 / 9 * k3 - 1 / 8 * k4)
+        return y3, err
+
+    def _commit(self, y, dt, drive):
+        """Aceita o passo e dispara desarmes; devolve True se houve desarme"""
+        p = self.params
+        min_stability, max_output = drive[2]
+        if self.tripped_any:
+            # Sem subnormais: o decaimento do desarme tende a zero
+            y[0][y[0] < 1e-9] = 0.0
+        else:
+            np.maximum(y[0], 0.0, out=y[0])
+        low = y[1] < min_stability
+        high = y[0] > max_output
+        fired = bool(low.any() or high.any())
+        if fired:
+            new = low | high
+            idx = np.flatnonzero(new)
+            # Fração do passo em que o limite foi cruzado (interpolação linear)
+            s0, s1 = self.state[1][idx], y[1][idx]
+            p0, p1 = self.state[0][idx], y[0][idx]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                fs = np.where(low[idx], (s0 - p.min_stability) / (s0 - s1), 1.0)
+                fp = np.where(high[idx], (p.max_output - p0) / (p1 - p0), 1.0)
+            frac = np.clip(np.nan_to_num(np.minimum(fs, fp), nan=1.0), 0.0, 1.0)
+            when = self.t + frac * dt
+            self.tripped[idx] = True
+            self.tripped_any = True
+            self.trip_time[idx] = when
+            for i, at, is_low in zip(idx.tolist(), when.tolist(), low[idx].tolist()):
+                self.events.append((at, i, "stability" if is_low else "overpower"))
+        self.state = y
+        self.t += dt
+        self.steps += 1
+        return fired
+
+    # ======================= PASSOS =========================
+
+    def step(self, dt, control=None, drive=None):
+        """Um passo RK4 de tamanho fixo; devolve True se houve desarme"""
+        if drive is None:
+            drive = self.drive(control)
+        return self._commit(self._rk4(dt, drive), dt, drive)
+
+    def step_adaptive(self, dt, control=None, rtol=1e-4, atol=1e-6, dt_max=60.0, drive=None):
+        """Um passo aceito com controle de erro; devolve (dt usado, próximo dt, desarmou)"""
+        if drive is None:
+            drive = self.drive(control)
+        while True:
+            y, err = self._bs23(dt, drive)
+            scale = np.maximum(np.abs(y), np.abs(self.state))
+            scale *= rtol
+            scale += atol
+            np.abs(err, out=err)
+            err /= scale
+            norm = float(err.max(initial=0.0))
+            factor = 0.9 * norm ** (-1 / 3) if norm > 0 else 5.0
+            if norm <= 1.0:
+                fired = self._commit(y, dt, drive)
+                return dt, min(dt_max, dt * min(5.0, max(0.2, factor))), fired
+            self.rejected += 1
+            dt *= max(0.2, factor)
+
+    def simulate(self, ticks, dt=1.0, control=None):
+        """N reatores por `ticks` passos fixos numa chamada; devolve desarmes novos"""
+        first = len(self.events)
+        # Controle constante: os termos de entrada só mudam quando alguém desarma
+        cached = None if callable(control) else self.drive(control)
+        for _ in range(int(ticks)):
+            if self.step(dt, control, cached) and cached is not None:
+                cached = self.drive(control)
+        return self.events[first:]
+
+    def run(self, duration, dt=1.0, method="rk4", control=None,
+            record_every=None, chunk_size=3600, rtol=1e-4, atol=1e-6):
+        """Gera blocos {"t", "output", "stability", "tripped", "events"}.
+
+        Uma amostra a cada record_every segundos (padrão: dt); cada bloco
+        tem até chunk_size amostras, então a memória não cresce com a duração.
+        Controle constante (None = self.throttle) é relido a cada bloco;
+        para variar dentro do bloco, passe uma função control(t, bank).
+        """
+        record_every = record_every or dt
+        end = self.t + duration
+        next_record = self.t
+        samples_t, samples = [], []
+        first_event = len(self.events)
+        step_dt = dt
+        cached = None if callable(control) else self.drive(control)
+
+        def flush():
+            nonlocal first_event
+            block = np.array(samples)
+            chunk = {
+                "t": np.array(samples_t),
+                "output": block[:, 0],
+                "stability": block[:, 1],
+                "tripped": self.tripped.copy(),
+                "events": self.events[first_event:]
+            }
+            first_event = len(self.events)
+            samples_t.clear()
+            samples.clear()
+            return chunk
+
+        while self.t < end - TIME_EPS:
+            if self.t >= next_record - TIME_EPS:
+                samples_t.append(self.t)
+                samples.append(self.state.copy())
+                next_record += record_every
+                if len(samples_t) >= chunk_size:
+                    yield flush()
+                    if cached is not None:
+                        cached = self.drive(control)
+            if method == "adaptive":
+                _, step_dt, fired = self.step_adaptive(
+                    min(step_dt, end - self.t), control, rtol, atol, drive=cached)
+            else:
+                fired = self.step(min(dt, end - self.t), control, cached)
+            if fired and cached is not None:
+                cached = self.drive(control)
+
+        samples_t.append(self.t)
+        samples.append(self.state.copy())
+        yield flush()
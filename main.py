@@ -1,17 +1,95 @@
 # main.py
+#   python main.py                         demonstração rápida
+#   python main.py --hours 72 --seed 7     missão em tempo virtual (repetível)
+
+import argparse
+import hashlib
+import json
 
 from armor.mark_5 import MarkV
+from core.scheduler import Scheduler
+from core.sim_clock import VirtualClock, fast_forward, make_rng
 from energy.arc_reactor_sim import ArcReactorSim
 from navigation.auto_follow_sim import AutoFollowSim
 
-armor = MarkV()
-reactor = ArcReactorSim()
-nav = AutoFollowSim()
 
-print(armor.activate())
-reactor.accelerate_particles()
-nav.update_target(5, 5)
+def demo():
+    armor = MarkV()
+    reactor = ArcReactorSim()
+    nav = AutoFollowSim()
+
+    print(armor.activate())
+    reactor.accelerate_particles()
+    nav.update_target(5, 5)
+
+    print(armor.status())
+    print(reactor.status())
+    print(nav.follow())
+
+
+def simular_missao(hours, seed=None):
+    """Armadura, reator e navegação num relógio virtual: o agendador salta
+    de evento em evento e todo sorteio sai do RNG semeado"""
+    clock = VirtualClock()
+    rng, seed = make_rng(seed)
+    agenda = Scheduler(clock=clock.monotonic, rng=rng, timer=clock.perf_counter)
+    armor, reactor, nav = MarkV(), ArcReactorSim(), AutoFollowSim()
+    log = hashlib.sha256()
+    counts = {"recharges": 0, "targets": 0, "unreachable": 0}
+
+    def evento(nome, **dados):
+        log.update(json.dumps([round(clock.elapsed, 6), nome, dados], sort_keys=True).encode())
+
+    def consumo():
+        # Gasto proporcional à potência do reator
+        armor.consume_energy(rng.uniform(0.2, 1.0) * reactor.output / 100.0)
+        if armor.energy_level < 20:
+            armor.energy_level = 100.0
+            counts["recharges"] += 1
+            evento("recarga")
+
+    def reator():
+        # Desacelera para recuperar a estabilidade; senão, acelera às vezes
+        if reactor.stability < 0.6 or reactor.output > 150:
+            reactor.decelerate_particles()
+        elif rng.random() < 0.5:
+            reactor.accelerate_particles()
+        evento("reator", **reactor.status())
+
+    def novo_alvo():
+        x, y = round(rng.uniform(0, 50), 1), round(rng.uniform(0, 50), 1)
+        nav.update_target(x, y)
+        resultado = nav.follow()
+        counts["targets"] += 1
+        if nav.engine.unreachable[0]:
+            counts["unreachable"] += 1
+        evento("alvo", alvo=[x, y], resultado=resultado)
+        agenda.reschedule(tarefa_alvo, rng.expovariate(1 / 1800))
+
+    armor.activate()
+    agenda.every(60, consumo, jitter=5.0)
+    agenda.every(300, reator)
+    tarefa_alvo = agenda.after(rng.expovariate(1 / 1800), novo_alvo)
+    runs = fast_forward(agenda, clock, clock.now + hours * 3600)
+
+    return {
+        "seed": seed,
+        "virtual_hours": hours,
+        "task_runs": runs,
+        **counts,
+        "armor": armor.status(),
+        "reactor": reactor.status(),
+        "nav": nav.armor_position,
+        "digest": log.hexdigest()
+    }
+
 
-print(armor.status())
-print(reactor.status())
-print(nav.follow())
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulações de armadura, reator e navegação")
+    parser.add_argument("--hours", type=float, help="missão simulada em tempo virtual")
+    parser.add_argument("--seed", type=int, help="semente (mesma semente, mesma missão)")
+    args = parser.parse_args()
+    if args.hours is None:
+        demo()
+    else:
+        print(json.dumps(simular_missao(args.hours, args.seed), ensure_ascii=False, indent=2))
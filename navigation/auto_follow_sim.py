@@ -1,13 +1,42 @@
 # navigation/auto_follow_sim.py
+from navigation.follow_engine import FollowerSwarm
+
 
 class AutoFollowSim:
-    def __init__(self):
+    """Uma armadura seguindo o alvo (mesmo motor do enxame, com N = 1)"""
+
+    def __init__(self, max_speed=5.0, max_accel=10.0, grid=None, dt=0.05):
         self.target_position = (0, 0)
-        self.armor_position = (10, 10)
+        self.dt = dt
+        self.engine = FollowerSwarm([(10, 10)], max_speed, max_accel, grid=grid)
+
+    @property
+    def armor_position(self):
+        x, y = self.engine.position[0]
+        return (round(float(x), 2), round(float(y), 2))
+
+    @property
+    def arrived(self):
+        return bool(self.engine.arrived[0])
 
     def update_target(self, x, y):
         self.target_position = (x, y)
+        self.engine.set_target((x, y), 0)
+
+    def add_waypoint(self, x, y):
+        """Enfileira um ponto depois dos que já estão na rota"""
+        return self.engine.queue(0, (x, y))
+
+    def step(self, dt=None):
+        self.engine.step(dt or self.dt)
+        return self.armor_position
 
-    def follow(self):
-        self.armor_position = self.target_position
+    def follow(self, max_time=600.0):
+        """Simula a perseguição até chegar (ou estourar max_time)"""
+        if self.engine.unreachable[0]:
+            return f"Sem caminho até {self.target_position}; armadura em {self.armor_position}"
+        steps = int(max_time / self.dt)
+        while steps and not self.arrived:
+            self.engine.step(self.dt)
+            steps -= 1
         return f"Posição simulada da armadura: {self.armor_position}"
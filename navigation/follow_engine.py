@@ -0,0 +1,268 @@
+# navigation/follow_engine.py
+# Perseguição com limite de velocidade e aceleração para N seguidores ao
+# mesmo tempo (NumPy): posições/velocidades em arrays (N, 2) e filas de
+# waypoints em um array (N, K, 2) com cursor por seguidor. Um passo é um
+# punhado de operações vetoriais, sem laço Python por unidade.
+import math
+
+import numpy as np
+
+
+def corner_speeds(points, max_speed, max_accel, margin=math.inf):
+    """Velocidade máxima ao passar por cada waypoint.
+
+    Na curva de ângulo θ, a componente lateral v·sen θ precisa ser anulada
+    com a aceleração disponível antes de sair da margem do corredor:
+    (v·sen θ)² / (2·a) <= margem. Curva de 90° ou mais e último ponto: 0.
+    """
+    speeds = []
+    for k in range(1, len(points)):
+        if k == len(points) - 1:
+            speeds.append(0.0)
+            continue
+        ax, ay = points[k][0] - points[k - 1][0], points[k][1] - points[k - 1][1]
+        bx, by = points[k + 1][0] - points[k][0], points[k + 1][1] - points[k][1]
+        na, nb = math.hypot(ax, ay), math.hypot(bx, by)
+        if not na or not nb:
+            speeds.append(max_speed)
+            continue
+        cos = (ax * bx + ay * by) / (na * nb)
+        if cos <= 0.0:
+            speeds.append(0.0)
+            continue
+        sin = math.sqrt(max(0.0, 1.0 - cos * cos))
+        limit = math.sqrt(2.0 * max_accel * margin) / sin if sin > 1e-9 else math.inf
+        speeds.append(min(max_speed, limit))
+    return speeds
+
+
+def _norm(v):
+    # sqrt(x² + y²) por linha; mais rápido que hypot nas colunas de (N, 2)
+    return np.sqrt(np.einsum("ij,ij->i", v, v))
+
+
+def _unit(v, norm):
+    """v / |v| com vetor nulo -> 0 (sem máscara: 0 * 1e12 = 0)"""
+    return v * (1.0 / np.maximum(norm, 1e-12))[:, None]
+
+
+class FollowerSwarm:
+    def __init__(self, positions, max_speed=5.0, max_accel=10.0, arrive_radius=0.05,
+                 grid=None, method="jps"):
+        self.position = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        n = len(self.position)
+        self.velocity = np.zeros((n, 2))
+        self.max_speed = np.broadcast_to(np.asarray(max_speed, dtype=np.float64), (n,)).copy()
+        self.max_accel = np.broadcast_to(np.asarray(max_accel, dtype=np.float64), (n,)).copy()
+        self.arrive_radius = float(arrive_radius)
+        self.grid = grid
+        self.method = method
+        # Folga lateral nas curvas: do centro da célula até quase a borda;
+        # com grade, mira um ponto à frente no trecho (não no waypoint) para
+        # corrigir o desvio lateral antes de encostar na parede
+        self.margin = 0.25 * grid.cell_size if grid is not None else math.inf
+        self.lookahead = grid.cell_size if grid is not None else math.inf
+        # Fila de waypoints: parado = um único waypoint na própria posição;
+        # corner = velocidade de passagem em cada waypoint
+        self.waypoints = self.position[:, None, :].copy()
+        self.corner = np.zeros((n, 1))
+        self.anchor = self.position.copy()  # início do trecho atual
+        self.length = np.ones(n, dtype=np.int64)
+        self.cursor = np.zeros(n, dtype=np.int64)
+        self.unreachable = np.zeros(n, dtype=bool)
+        self.t = 0.0
+        self._rows = np.arange(n)
+        self._occupancy = None  # (versão da grade, mapa livre, passo da linha)
+
+    def __len__(self):
+        return len(self.position)
+
+    # ======================= ROTAS ==========================
+
+    def _reserve(self, k):
+        """Cresce a capacidade da fila (amortizado: dobra)"""
+        capacity = self.waypoints.shape[1]
+        if k <= capacity:
+            return
+        new = max(k, capacity * 2)
+        pad = new - capacity
+        self.waypoints = np.concatenate(
+            [self.waypoints, np.repeat(self.waypoints[:, -1:, :], pad, axis=1)], axis=1)
+        self.corner = np.concatenate([self.corner, np.zeros((len(self), pad))], axis=1)
+
+    def set_path(self, i, points, append=False):
+        """Troca (ou estende) a fila de waypoints do seguidor i"""
+        points = [tuple(p) for p in points]
+        if append:
+            pending = self.waypoints[i, self.cursor[i]:self.length[i]].tolist()
+            points = [tuple(p) for p in pending] + points
+        points = points or [tuple(self.position[i])]
+        start = [tuple(self.position[i])]
+        self._reserve(len(points))
+        self.waypoints[i, :len(points)] = points
+        self.waypoints[i, len(points):] = points[-1]
+        self.corner[i, :len(points)] = corner_speeds(
+            start + points, float(self.max_speed[i]), float(self.max_accel[i]), self.margin)
+        self.corner[i, len(points):] = 0.0
+        self.length[i] = len(points)
+        self.cursor[i] = 0
+        self.anchor[i] = self.position[i]
+
+    def _plan(self, start, goal):
+        if self.grid is None:
+            return [goal]
+        return self.grid.find_path(start, goal, self.method)
+
+    def set_target(self, target, idx=None):
+        """Alvo comum (x, y) ou um alvo por seguidor ((m, 2)); com grade, o
+        caminho contorna obstáculos (planejado só aqui, não a cada passo)."""
+        idx = self._rows if idx is None else np.atleast_1d(np.arange(len(self))[idx])
+        targets = np.broadcast_to(np.asarray(target, dtype=np.float64), (len(idx), 2))
+        if self.grid is None:
+            # Sem obstáculos: tudo vetorizado
+            self._reserve(1)
+            self.waypoints[idx] = targets[:, None, :]
+            self.corner[idx] = 0.0
+            self.length[idx] = 1
+            self.cursor[idx] = 0
+            self.anchor[idx] = self.position[idx]
+            self.unreachable[idx] = False
+            return
+        for i, goal in zip(idx.tolist(), targets.tolist()):
+            path = self._plan(tuple(self.position[i]), tuple(goal))
+            self.unreachable[i] = path is None
+            self.set_path(i, path if path is not None else [tuple(self.position[i])])
+
+    def queue(self, i, point):
+        """Acrescenta um waypoint ao fim da fila do seguidor i"""
+        last = tuple(self.waypoints[i, self.length[i] - 1])
+        path = self._plan(last, tuple(point))
+        if path is None:
+            self.unreachable[i] = True
+            return False
+        self.set_path(i, path, append=True)
+        return True
+
+    # ======================= PASSO ==========================
+
+    def step(self, dt):
+        rows = self._rows
+        pos, vel = self.position, self.velocity
+        wp = self.waypoints[rows, self.cursor]
+        delta = wp - pos
+        dist = _norm(delta)
+        final = self.cursor >= self.length - 1
+
+        # Velocidade que ainda permite frear até a do waypoint: v² = vc² + 2·a·d
+        v_corner = self.corner[rows, self.cursor]
+        desired_speed = np.sqrt(v_corner * v_corner + 2.0 * self.max_accel * dist)
+        np.minimum(desired_speed, self.max_speed, out=desired_speed)
+        # No último ponto, não passar dele no próximo passo
+        np.minimum(desired_speed, np.where(final, dist / dt, np.inf), out=desired_speed)
+
+        # Mira: projeção no trecho anchor -> wp mais o lookahead (sem passar de wp)
+        seg = wp - self.anchor
+        seg_len = _norm(seg)
+        unit = _unit(seg, seg_len)
+        along = np.einsum("ij,ij->i", pos - self.anchor, unit)
+        np.clip(along + self.lookahead, 0.0, seg_len, out=along)
+        aim = self.anchor + unit * along[:, None] - pos
+        desired = _unit(aim, _norm(aim))
+        desired *= desired_speed[:, None]
+
+        # Aceleração limitada |Δv| <= a·dt, com prioridade para a correção
+        # lateral (sair da parede) sobre a longitudinal (ganhar velocidade)
+        dv = desired - vel
+        limit = self.max_accel * dt
+        dv_long = np.einsum("ij,ij->i", dv, unit)
+        dv_lat = dv - unit * dv_long[:, None]
+        lat_norm = _norm(dv_lat)
+        scale = np.minimum(1.0, limit / np.maximum(lat_norm, 1e-12))
+        dv_lat *= scale[:, None]
+        lat_norm *= scale
+        budget = np.sqrt(np.maximum(limit * limit - lat_norm * lat_norm, 0.0))
+        np.clip(dv_long, -budget, budget, out=dv_long)
+        vel += dv_lat
+        vel += unit * dv_long[:, None]
+        if self.grid is None:
+            pos += vel * dt
+        else:
+            self._move_clipped(dt)
+
+        # Chegada: intermediário avança a fila; final encaixa e para
+        remaining = wp - pos
+        left = _norm(remaining)
+        speed = _norm(vel)
+        passed = np.einsum("ij,ij->i", pos - self.anchor, unit) >= seg_len
+        reached = (left <= np.maximum(self.arrive_radius, speed * dt)) | passed
+        advance = reached & ~final
+        self.cursor[advance] += 1
+        self.anchor[advance] = wp[advance]
+        settle = final & (left <= self.arrive_radius)
+        if settle.any():
+            pos[settle] = wp[settle]
+            vel[settle] = 0.0
+        self.t += dt
+        return self
+
+    def _free_at(self, cx, cy):
+        """Células (cx, cy) livres? Fora da grade conta como bloqueada"""
+        grid = self.grid
+        if self._occupancy is None or self._occupancy[0] != grid.version:
+            free, stride = grid.occupancy()
+            self._occupancy = (grid.version, np.frombuffer(free, dtype=np.uint8), stride)
+        _, free, stride = self._occupancy
+        cx = np.clip(cx, -1, grid.width).astype(np.int64)
+        cy = np.clip(cy, -1, grid.height).astype(np.int64)
+        return free[(cy + 1) * stride + cx + 1] == 1
+
+    def _move_clipped(self, dt):
+        """pos += vel·dt com colisão eixo a eixo contra a grade: o eixo que
+        entraria numa célula bloqueada para na borda e perde a velocidade
+        nesse eixo (na quina, x e depois y: desliza em vez de atravessar).
+        Supõe deslocamento por passo menor que uma célula."""
+        pos, vel, grid = self.position, self.velocity, self.grid
+        size = grid.cell_size
+        eps = 1e-9 * size
+        cell = np.floor((pos - grid.origin) / size)
+        # Quem já está numa célula bloqueada (posição inicial) não é contido
+        inside = self._free_at(cell[:, 0], cell[:, 1])
+        for axis in (0, 1):
+            moved = pos[:, axis] + vel[:, axis] * dt
+            target = cell.copy()
+            target[:, axis] = np.floor((moved - grid.origin[axis]) / size)
+            hit = inside & (target[:, axis] != cell[:, axis]) & ~self._free_at(target[:, 0], target[:, 1])
+            if hit.any():
+                low = grid.origin[axis] + cell[hit, axis] * size
+                moved[hit] = np.where(vel[hit, axis] > 0, low + size - eps, low + eps)
+                vel[hit, axis] = 0.0
+                target[hit, axis] = cell[hit, axis]
+            pos[:, axis] = moved
+            cell = target
+
+    def run(self, ticks, dt):
+        for _ in range(int(ticks)):
+            self.step(dt)
+        return self
+
+    # ======================= LEITURA ========================
+
+    @property
+    def arrived(self):
+        final = self.cursor >= self.length - 1
+        at = self.waypoints[self._rows, self.length - 1]
+        return final & np.all(self.position == at, axis=1) & ~np.any(self.velocity, axis=1)
+
+    def speed(self):
+        return _norm(self.velocity)
+
+    def status(self):
+        arrived = self.arrived
+        return {
+            "Seguidores": len(self),
+            "Chegaram": int(np.count_nonzero(arrived)),
+            "Em rota": int(np.count_nonzero(~arrived & ~self.unreachable)),
+            "Sem caminho": int(np.count_nonzero(self.unreachable)),
+            "Velocidade média": round(float(self.speed().mean()) if len(self) else 0.0, 3),
+            "Tempo (s)": round(self.t, 3)
+        }
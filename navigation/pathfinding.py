@@ -0,0 +1,304 @@
+# navigation/pathfinding.py
+# Grade de navegação com cache e busca de caminho em 8 direções:
+# A* clássico e Jump Point Search (mesmo custo, bem menos nós abertos).
+# Diagonal só quando as duas células ortogonais estão livres (não corta quina).
+import heapq
+import math
+from collections import OrderedDict
+
+SQRT2 = math.sqrt(2.0)
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def octile(ax, ay, bx, by):
+    dx, dy = abs(ax - bx), abs(ay - by)
+    return max(dx, dy) + (SQRT2 - 1.0) * min(dx, dy)
+
+
+class NavGrid:
+    """Células livres/bloqueadas sobre o mundo (cell_size unidades por célula)"""
+
+    def __init__(self, width, height, cell_size=1.0, origin=(0.0, 0.0), cache_size=256):
+        self.width = int(width)
+        self.height = int(height)
+        self.cell_size = float(cell_size)
+        self.origin = (float(origin[0]), float(origin[1]))
+        # Borda de uma célula bloqueada em volta: sem teste de limites na busca
+        self._stride = self.width + 2
+        self._free = bytearray(self._stride * (self.height + 2))
+        for cy in range(self.height):
+            start = (cy + 1) * self._stride + 1
+            self._free[start:start + self.width] = b"\x01" * self.width
+        self.version = 0
+        self.cache_size = cache_size
+        self._paths = OrderedDict()
+        self.searches = 0
+        self.cache_hits = 0
+        self.expanded = 0
+
+    # ======================= GRADE ==========================
+
+    def to_cell(self, x, y):
+        return (int(math.floor((x - self.origin[0]) / self.cell_size)),
+                int(math.floor((y - self.origin[1]) / self.cell_size)))
+
+    def to_world(self, cx, cy):
+        """Centro da célula"""
+        return (self.origin[0] + (cx + 0.5) * self.cell_size,
+                self.origin[1] + (cy + 0.5) * self.cell_size)
+
+    def inside(self, cx, cy):
+        return 0 <= cx < self.width and 0 <= cy < self.height
+
+    def walkable(self, cx, cy):
+        return self.inside(cx, cy) and self._free[(cy + 1) * self._stride + cx + 1] == 1
+
+    def set_blocked(self, cx, cy, blocked=True):
+        if not self.inside(cx, cy):
+            return
+        self._free[(cy + 1) * self._stride + cx + 1] = 0 if blocked else 1
+        self._changed()
+
+    def add_obstacle(self, x0, y0, x1, y1):
+        """Bloqueia as células tocadas pelo retângulo (coordenadas do mundo)"""
+        ax, ay = self.to_cell(min(x0, x1), min(y0, y1))
+        bx, by = self.to_cell(max(x0, x1), max(y0, y1))
+        ax, ay = max(ax, 0), max(ay, 0)
+        bx, by = min(bx, self.width - 1), min(by, self.height - 1)
+        if ax > bx or ay > by:
+            return
+        for cy in range(ay, by + 1):
+            start = (cy + 1) * self._stride + ax + 1
+            self._free[start:start + bx - ax + 1] = bytes(bx - ax + 1)
+        self._changed()
+
+    def occupancy(self):
+        """(cópia do mapa livre=1/bloqueado=0 com a borda bloqueada, passo da linha);
+        célula (cx, cy) no índice (cy + 1) * passo + cx + 1"""
+        return bytes(self._free), self._stride
+
+    def clear(self):
+        for cy in range(self.height):
+            start = (cy + 1) * self._stride + 1
+            self._free[start:start + self.width] = b"\x01" * self.width
+        self._changed()
+
+    def _changed(self):
+        # Qualquer mudança na grade invalida os caminhos guardados
+        self.version += 1
+        self._paths.clear()
+
+    def clear_cache(self):
+        self._paths.clear()
+
+    # ======================= BUSCA ==========================
+
+    def find_path(self, start, goal, method="jps"):
+        """Waypoints no mundo de start até goal (centros das células de
+        virada + o próprio goal), ou None se não houver caminho."""
+        cells = self.find_cells(self.to_cell(*start), self.to_cell(*goal), method)
+        if cells is None:
+            return None
+        points = [self.to_world(cx, cy) for cx, cy in cells[1:-1]]
+        points.append((float(goal[0]), float(goal[1])))
+        return points
+
+    def find_cells(self, start, goal, method="jps"):
+        """Células de virada de start até goal (inclusive), com cache LRU"""
+        key = (start, goal, method)
+        cached = self._paths.get(key)
+        if cached is not None:
+            self._paths.move_to_end(key)
+            self.cache_hits += 1
+            return list(cached)
+        if not self.walkable(*start) or not self.walkable(*goal):
+            return None
+
+        self.searches += 1
+        s = (start[1] + 1) * self._stride + start[0] + 1
+        g = (goal[1] + 1) * self._stride + goal[0] + 1
+        if method == "jps":
+            found = self._search(s, g, self._jps_successors)
+        elif method == "astar":
+            found = self._search(s, g, self._astar_successors)
+        else:
+            raise ValueError(f"método de busca desconhecido: {method}")
+        if found is None:
+            return None
+
+        path = _compress([self._cell(i) for i in found])
+        self._paths[key] = tuple(path)
+        if len(self._paths) > self.cache_size:
+            self._paths.popitem(last=False)
+        return path
+
+    def path_length(self, cells):
+        return sum(octile(ax, ay, bx, by) for (ax, ay), (bx, by) in zip(cells, cells[1:]))
+
+    def _cell(self, index):
+        cy, cx = divmod(index, self._stride)
+        return cx - 1, cy - 1
+
+    def _search(self, start, goal, successors):
+        stride = self._stride
+        gx, gy = goal % stride, goal // stride
+        g_cost = {start: 0.0}
+        parent = {start: None}
+        heap = [(0.0, 0.0, start)]
+        closed = set()
+        while heap:
+            _, neg_g, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            if node == goal:
+                path = [node]
+                while parent[node] is not None:
+                    node = parent[node]
+                    path.append(node)
+                path.reverse()
+                return path
+            closed.add(node)
+            self.expanded += 1
+            for nxt, cost in successors(node, parent[node], goal):
+                if nxt in closed:
+                    continue
+                ng = cost - neg_g
+                if ng < g_cost.get(nxt, math.inf):
+                    g_cost[nxt] = ng
+                    parent[nxt] = node
+                    nx, ny = nxt % stride, nxt // stride
+                    # Desempate por g maior: segue em frente em áreas abertas
+                    heapq.heappush(heap, (ng + octile(nx, ny, gx, gy), -ng, nxt))
+        return None
+
+    def _neighbors(self, node):
+        free, stride = self._free, self._stride
+        for dx, dy in DIRECTIONS:
+            nxt = node + dx + dy * stride
+            if not free[nxt]:
+                continue
+            if dx and dy:
+                if not (free[node + dx] and free[node + dy * stride]):
+                    continue
+                yield nxt, dx, dy, SQRT2
+            else:
+                yield nxt, dx, dy, 1.0
+
+    def _astar_successors(self, node, _parent, _goal):
+        for nxt, _, _, cost in self._neighbors(node):
+            yield nxt, cost
+
+    # Jump Point Search (variante sem cortar quinas)
+
+    def _jps_directions(self, node, parent):
+        free, stride = self._free, self._stride
+        if parent is None:
+            return [(dx, dy) for _, dx, dy, _ in self._neighbors(node)]
+        px, py = parent % stride, parent // stride
+        x, y = node % stride, node // stride
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        dirs = []
+        if dx and dy:
+            vertical = free[node + dy * stride]
+            horizontal = free[node + dx]
+            if vertical:
+                dirs.append((0, dy))
+            if horizontal:
+                dirs.append((dx, 0))
+            if vertical and horizontal:
+                dirs.append((dx, dy))
+        elif dx:
+            up, down = free[node + stride], free[node - stride]
+            if free[node + dx]:
+                dirs.append((dx, 0))
+                if up:
+                    dirs.append((dx, 1))
+                if down:
+                    dirs.append((dx, -1))
+            if up:
+                dirs.append((0, 1))
+            if down:
+                dirs.append((0, -1))
+        else:
+            right, left = free[node + 1], free[node - 1]
+            if free[node + dy * stride]:
+                dirs.append((0, dy))
+                if right:
+                    dirs.append((1, dy))
+                if left:
+                    dirs.append((-1, dy))
+            if right:
+                dirs.append((1, 0))
+            if left:
+                dirs.append((-1, 0))
+        return dirs
+
+    def _jump_straight(self, node, dx, dy, goal):
+        free, stride = self._free, self._stride
+        step = dx + dy * stride
+        while True:
+            node += step
+            if not free[node]:
+                return None
+            if node == goal:
+                return node
+            # Vizinho forçado: parede atrás ao lado que se abre aqui
+            if dx:
+                if (free[node + stride] and not free[node - dx + stride]) or \
+                        (free[node - stride] and not free[node - dx - stride]):
+                    return node
+            else:
+                back = node - dy * stride
+                if (free[node + 1] and not free[back + 1]) or \
+                        (free[node - 1] and not free[back - 1]):
+                    return node
+
+    def _jump(self, node, dx, dy, goal):
+        if not (dx and dy):
+            return self._jump_straight(node, dx, dy, goal)
+        free, stride = self._free, self._stride
+        step = dx + dy * stride
+        while True:
+            node += step
+            if not free[node]:
+                return None
+            if node == goal:
+                return node
+            if self._jump_straight(node, dx, 0, goal) is not None or \
+                    self._jump_straight(node, 0, dy, goal) is not None:
+                return node
+            if not (free[node + dx] and free[node + dy * stride]):
+                return None
+
+    def _jps_successors(self, node, parent, goal):
+        stride = self._stride
+        x, y = node % stride, node // stride
+        for dx, dy in self._jps_directions(node, parent):
+            jump = self._jump(node, dx, dy, goal)
+            if jump is not None:
+                jx, jy = jump % stride, jump // stride
+                yield jump, octile(x, y, jx, jy)
+
+    def stats(self):
+        return {
+            "buscas": self.searches,
+            "cache_hits": self.cache_hits,
+            "nos_expandidos": self.expanded,
+            "caminhos_em_cache": len(self._paths),
+            "versao": self.version
+        }
+
+
+def _compress(cells):
+    """Remove células intermediárias de trechos retos (fica só a virada)"""
+    if len(cells) <= 2:
+        return cells
+    out = [cells[0]]
+    for prev, cur, nxt in zip(cells, cells[1:], cells[2:]):
+        d1 = ((cur[0] > prev[0]) - (cur[0] < prev[0]), (cur[1] > prev[1]) - (cur[1] < prev[1]))
+        d2 = ((nxt[0] > cur[0]) - (nxt[0] < cur[0]), (nxt[1] > cur[1]) - (nxt[1] < cur[1]))
+        if d1 != d2:
+            out.append(cur)
+    out.append(cells[-1])
+    return out
@@ -0,0 +1,31 @@
+import os
+import random
+import shutil
+
+import pytest
+
+from core.sim_clock import VirtualClock
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KNOWLEDGE_FILES = ["fisica.json", "quimica.json", "biologia.json",
+                   "matematica.json", "filosofia.json"]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Diretório de trabalho isolado com as bases de conhecimento do repo"""
+    for name in KNOWLEDGE_FILES:
+        shutil.copy(os.path.join(REPO, name), tmp_path / name)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def darvis(workdir):
+    """Assistente headless em tempo virtual (sem threads de agendamento)"""
+    from core.darvis_core import DarvisAssistant
+
+    assistant = DarvisAssistant(headless=True, ignore_cooldown=True,
+                                clock=VirtualClock(), rng=random.Random(7))
+    yield assistant
+    assistant.hd_close()
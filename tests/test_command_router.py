@@ -0,0 +1,82 @@
+import pytest
+
+from core.command_router import CommandRouter, first_int, normalize, tokenize
+from core.fuzzy import TrigramIndex, edit_distance, similarity
+
+
+def _router():
+    router = CommandRouter()
+    router.register("light_on", [["luz", "lampada"], ["ligar", "acender"]],
+                    lambda m: f"on {m.params['level']}", priority=50,
+                    params={"level": first_int})
+    router.register("light_status", [["luz"]], lambda m: "luz?", priority=40)
+    router.register("status", [["status", "estado"]], lambda m: "status", priority=30)
+    router.register("confirm", [["sim", "confirmar"]], lambda m: "ok", priority=90, exact=True)
+    return router
+
+
+def test_normalize_and_tokenize():
+    assert normalize("Emoção") == "emocao"
+    assert tokenize("Ligar a LUZ, 70%!") == ["ligar", "a", "luz", "70"]
+    assert first_int(["luz", "x", "70"]) == 70
+    assert first_int(["luz"]) is None
+
+
+def test_all_groups_must_match_in_any_order():
+    router = _router()
+    match = router.match("acender a lâmpada 70")
+    assert match.intent.name == "light_on"
+    assert match.params == {"level": 70}
+    assert match() == "on 70"
+    assert router.match("ligar") is None
+
+
+def test_priority_picks_the_more_specific_intent():
+    router = _router()
+    assert router.match("luz ligar").intent.name == "light_on"
+    assert router.match("luz").intent.name == "light_status"
+    assert router.match("como está a luz").intent.name == "light_status"
+
+
+def test_exact_intent_needs_the_whole_command():
+    router = _router()
+    assert router.match("sim").intent.name == "confirm"
+    assert router.match("Sim!").intent.name == "confirm"
+    assert router.match("sim status").intent.name == "status"
+    assert router.match("nada disso") is None
+
+
+def test_suggest_corrects_typos():
+    router = _router()
+    assert router.match("stauts") is None
+    match = router.suggest("stauts")
+    assert match.intent.name == "status"
+    assert match.similarity == pytest.approx(1 - 1 / 6)
+    assert router.suggest("status") is None
+    assert router.suggest("xyzzyq") is None
+
+
+def test_rebind_shares_the_compiled_trie():
+    router = _router()
+    router.compile()
+    clone = router.rebind(lambda intent: (lambda m, name=intent.name: name.upper()))
+    assert clone.match("estado")() == "STATUS"
+    assert router.match("estado")() == "status"
+    assert clone._trie is router._trie
+
+
+def test_edit_distance_counts_transpositions_once():
+    assert edit_distance("stauts", "status") == 1
+    assert edit_distance("luz", "luz") == 0
+    assert edit_distance("", "abc") == 3
+    assert edit_distance("kitten", "sitting") == 3
+    assert similarity("abc", "abc") == 1.0
+
+
+def test_trigram_index_best():
+    index = TrigramIndex(["status", "estado", "emocao", "luz"])
+    assert "luz" in index and len(index) == 4
+    assert index.best("status") == ("status", 1.0)
+    word, score = index.best("emocoa")
+    assert word == "emocao" and score == pytest.approx(1 - 1 / 6)
+    assert index.best("qwerty") is None
@@ -0,0 +1,96 @@
+import pytest
+
+
+def say(darvis, cmd):
+    darvis.clock.advance(5)
+    return darvis.processar_comando(cmd)
+
+
+@pytest.mark.parametrize("cmd, intent", [
+    ("what is the system status", "status"),
+    ("o que é o status do sistema", "status"),
+    ("what is your emotion", "emotion"),
+    ("qual a sua emoção", "emotion"),
+    ("what is the light", "light_status"),
+    ("o que é a luz ligar 40", "light_on"),
+    ("what is help", "help"),
+])
+def test_builtins_win_over_knowledge_questions(darvis, cmd, intent):
+    assert darvis.router.match(cmd).intent.name == intent
+
+
+def test_status_question_runs_status(darvis):
+    assert say(darvis, "what is the system status").startswith("CPU:")
+    assert say(darvis, "what is your emotion").startswith("Current emotional state")
+
+
+def test_knowledge_questions_still_answer(darvis):
+    assert darvis.router.match("o que é relatividade").intent.name == "knowledge_what"
+    assert darvis.router.match("qual área fotossíntese").intent.name == "knowledge_area"
+    resp = say(darvis, "o que é relatividade")
+    assert "no knowledge" not in resp
+    assert "Relatividade" in resp or "relatividade" in resp.lower()
+
+
+def test_integrity_after_commands(darvis):
+    for cmd in ("status", "luz ligar 40", "emoção"):
+        say(darvis, cmd)
+    assert say(darvis, "integridade").startswith("HD integrity OK.")
+
+
+def test_each_command_is_routed_once(darvis, monkeypatch):
+    calls = {"match": 0, "suggest": 0}
+    router = darvis.router
+    match, suggest = router.match, router.suggest
+
+    def counted(name, fn):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(router, "match", counted("match", match))
+    monkeypatch.setattr(router, "suggest", counted("suggest", suggest))
+    say(darvis, "status")
+    assert calls == {"match": 1, "suggest": 0}
+    assert say(darvis, "stauts").startswith("Did you mean 'status'")
+    assert calls == {"match": 3, "suggest": 1}  # suggest casa o texto corrigido
+    assert say(darvis, "sim").startswith("CPU:")
+    assert say(darvis, "xyzzy qwerty") is None
+
+
+def test_busy_system_postpones_dreams(darvis):
+    from core.darvis_config import DREAM_RETRY_SECONDS
+
+    task = darvis._tarefa_sonho
+    darvis.registradores["LOAD"] = 0.5
+    darvis.tarefa_sonho()
+    assert darvis.hd_index.count(type="dream") == 0
+    assert task.due == pytest.approx(darvis.clock.monotonic() + DREAM_RETRY_SECONDS)
+
+    darvis.registradores["LOAD"] = 0.1
+    darvis.tarefa_sonho()
+    assert darvis.hd_index.count(type="dream") == 1
+    assert task.due == pytest.approx(darvis.clock.monotonic() + darvis.config["dream_interval"])
+
+
+def test_headless_session_status_samples_cpu(darvis):
+    session = darvis.open_session("s1")
+    assert not session.carga_amostrada
+    resp = session.processar_comando("status")
+    assert resp.startswith("CPU:") and not resp.startswith("CPU: 0.0%")
+    assert session.registradores["LOAD"] > 0
+
+
+def test_typo_offers_a_suggestion_that_sim_confirms(darvis):
+    resp = say(darvis, "stauts")
+    assert resp == "Did you mean 'status'? Say 'sim' to confirm."
+    assert say(darvis, "sim").startswith("CPU:")
+    assert say(darvis, "sim") == "Nothing to confirm."
+
+
+def test_suggestion_is_only_valid_for_the_next_command(darvis):
+    assert say(darvis, "ligar luzz").startswith("Did you mean")
+    say(darvis, "emoção")
+    assert say(darvis, "sim") == "Nothing to confirm."
+    assert not darvis.luz_quarto["ligada"]
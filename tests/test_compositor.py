@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from core.compositor import LayeredCompositor  # noqa: E402
+from core.profiler import FrameProfiler  # noqa: E402
+
+
+@pytest.fixture
+def screen():
+    pygame.display.init()
+    yield pygame.display.set_mode((200, 100))
+    pygame.display.quit()
+
+
+def _compositor(screen, state):
+    comp = LayeredCompositor(screen)
+    comp.set_base(lambda base: base.fill((0, 0, 0)))
+    drawn = []
+
+    def painter(name, color, rect):
+        def draw(value):
+            drawn.append(name)
+            screen.fill(color, rect)
+        return draw
+
+    comp.add_layer("left", (0, 0, 50, 50), painter("left", (255, 0, 0), (0, 0, 50, 50)),
+                   key=lambda: state["left"])
+    comp.add_layer("right", (100, 0, 50, 50), painter("right", (0, 0, 255), (100, 0, 50, 50)),
+                   key=lambda: state["right"])
+    return comp, drawn
+
+
+def test_only_changed_layers_are_redrawn(screen):
+    state = {"left": 0, "right": 0}
+    comp, drawn = _compositor(screen, state)
+    assert comp.compose() == [screen.get_rect()]  # primeiro frame: tela toda
+    assert sorted(drawn) == ["left", "right"]
+
+    drawn.clear()
+    assert comp.compose() == []
+    assert drawn == []
+
+    state["right"] = 1
+    assert comp.compose() == [pygame.Rect(100, 0, 50, 50)]
+    assert drawn == ["right"]
+    assert screen.get_at((120, 20))[:3] == (0, 0, 255)
+    assert comp.stats()["full_frames"] == 1
+
+
+def test_profiler_gets_one_phase_per_layer(screen):
+    state = {"left": 0, "right": 0}
+    comp, _ = _compositor(screen, state)
+    prof = FrameProfiler(capacity=8)
+    for frame in range(3):
+        state["left"] = frame
+        prof.begin_frame()
+        comp.compose(prof)
+        prof.end_frame()
+
+    assert prof.order[:3] == ["fill", "render_left", "render_right"]
+    assert prof.histograms["render_left"].count == 3
+    # "right" só foi desenhada no primeiro frame: depois conta zero
+    assert prof.histograms["render_right"].values()[1:] == [0.0, 0.0]
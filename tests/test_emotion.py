@@ -0,0 +1,48 @@
+import math
+
+import pytest
+
+from core.emotion import EmotionModel
+
+BANDS = [(0.3, "LOW"), (0.7, "CALM"), (1.01, "HIGH")]
+
+
+def _model(value=0.9, rate=0.01):
+    return EmotionModel(value, rate, BANDS, now=0.0, clock=lambda: 0.0)
+
+
+def test_linear_decay_with_floor():
+    model = _model()
+    assert model.value_at(0.0) == pytest.approx(0.9)
+    assert model.value_at(10.0) == pytest.approx(0.8)
+    assert model.value_at(1000.0) == 0.0
+    assert model.band_for(model.value_at(50.0)) == "CALM"
+
+
+def test_transitions_fire_only_when_due():
+    model = _model()
+    assert model.next_transition == pytest.approx(20.0)
+    assert model.poll(19.0) == []
+    fired = model.poll(65.0)
+    assert [(a, b) for _, a, b in fired] == [("HIGH", "CALM"), ("CALM", "LOW")]
+    assert fired[0][0] == pytest.approx(20.0)
+    assert fired[1][0] == pytest.approx(60.0)
+    assert model.next_transition == math.inf  # LOW termina no piso
+
+
+def test_adjust_restarts_decay():
+    model = _model(value=0.5)
+    fired = model.adjust(+0.4, now=10.0)  # 0.4 decaído + 0.4
+    assert [(a, b) for _, a, b in fired] == [("CALM", "HIGH")]
+    assert model.value_at(10.0) == pytest.approx(0.8)
+    assert model.value_at(15.0) == pytest.approx(0.75)
+    assert model.next_transition == pytest.approx(20.0)
+    assert model.adjust(+5, now=10.0) == []
+    assert model.value_at(10.0) == 1.0  # teto
+
+
+def test_no_decay_no_transition():
+    model = _model(rate=0.0)
+    assert model.next_transition == math.inf
+    assert model.value_at(1e9) == pytest.approx(0.9)
+    assert model.snapshot(5.0)["state"] == "HIGH"
@@ -0,0 +1,48 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from armor.fleet import ArmorFleet  # noqa: E402
+from armor.mark_2 import MarkII  # noqa: E402
+from armor.mark_5 import MarkV  # noqa: E402
+
+
+def test_batch_ops_match_individual_suits():
+    fleet = ArmorFleet.build({"Mark II": 3, MarkV: 2})
+    suits = [MarkII() for _ in range(3)] + [MarkV() for _ in range(2)]
+
+    assert fleet.activate(fleet.select(model="Mark V")) == 2
+    for suit in suits[3:]:
+        suit.activate()
+    fleet.consume_energy(30.0)
+    fleet.consume_energy(90.0, idx=[0, 4])
+    for i, suit in enumerate(suits):
+        suit.consume_energy(30.0)
+        if i in (0, 4):
+            suit.consume_energy(90.0)
+
+    for i, suit in enumerate(suits):
+        view = fleet[i]
+        assert (view.name, view.energy_level, view.active) == \
+            (suit.name, suit.energy_level, suit.active)
+    assert fleet.status()["Mark V"] == {
+        "Armaduras": 2, "Ativas": 2, "Energia média (%)": 35.0,
+        "Integridade média (%)": 100.0, "Sem energia": 1
+    }
+    assert fleet.status()["Mark II"]["Sem energia"] == 1
+
+
+def test_suit_view_writes_through_and_keeps_model_traits():
+    fleet = ArmorFleet.build({"Mark II": 1, "Mark V": 1})
+    mark2, mark5 = fleet[0], fleet[-1]
+    mark5.integrity = 40.0
+    assert fleet.integrity[1] == 40.0
+    assert mark5.activate() == "Mark V ativada." and fleet.active[1]
+    assert mark2.flight_stability == 0.7 and mark5.deploy_time == 2.5
+    # Traço que o modelo não tem: como na classe original
+    with pytest.raises(AttributeError):
+        mark2.deploy_time
+    with pytest.raises(IndexError):
+        fleet[2]
+    assert fleet.deactivate() == 1
+    assert len(fleet.select(active=False).nonzero()[0]) == 2
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from navigation.follow_engine import FollowerSwarm
+from navigation.pathfinding import NavGrid
+
+
+def _grid(rng):
+    grid = NavGrid(48, 48)
+    for _ in range(60):
+        x, y = rng.integers(0, 46, 2)
+        grid.add_obstacle(x, y, x + rng.integers(0, 4), y + rng.integers(0, 4))
+    return grid
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_swarm_never_enters_blocked_cells(seed):
+    rng = np.random.default_rng(seed)
+    grid = _grid(rng)
+    free = [(cx, cy) for cx in range(48) for cy in range(48) if grid.walkable(cx, cy)]
+    n = 200
+    starts = [grid.to_world(*free[i]) for i in rng.choice(len(free), n)]
+    goals = [grid.to_world(*free[i]) for i in rng.choice(len(free), n)]
+    swarm = FollowerSwarm(starts, max_speed=rng.uniform(2, 6, n),
+                          max_accel=rng.uniform(4, 12, n), grid=grid)
+    swarm.set_target(np.array(goals))
+    assert not swarm.unreachable.any()
+
+    for _ in range(1200):
+        swarm.step(0.05)
+        cells = np.floor(swarm.position / grid.cell_size)
+        inside = swarm._free_at(cells[:, 0], cells[:, 1])
+        assert inside.all(), np.flatnonzero(~inside)
+    assert swarm.arrived.all()
+
+
+def test_corner_overshoot_is_clipped():
+    grid = NavGrid(4, 4)
+    grid.set_blocked(2, 2)
+    swarm = FollowerSwarm([(1.9, 1.9)], max_speed=10.0, max_accel=100.0, grid=grid)
+    swarm.velocity[:] = (4.0, 4.0)  # rumo à quina da célula bloqueada
+    swarm._move_clipped(0.05)
+    x, y = swarm.position[0]
+    assert grid.walkable(*grid.to_cell(x, y))
+    assert x > 2.0 and y < 2.0  # x entrou na célula livre (2, 1); y parou na borda
+    assert swarm.velocity[0, 1] == 0.0 and swarm.velocity[0, 0] == 4.0
+
+
+def test_open_field_is_unchanged():
+    swarm = FollowerSwarm([(0.0, 0.0)], max_speed=5.0, max_accel=10.0)
+    swarm.set_target((3.0, 4.0))
+    swarm.run(200, 0.05)
+    assert swarm.arrived.all()
+    assert np.allclose(swarm.position[0], (3.0, 4.0))
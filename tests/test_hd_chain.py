@@ -0,0 +1,198 @@
+import json
+
+from core.hd_storage import HDStorage
+
+
+def _storage(path, **kw):
+    kw.setdefault("segment_entries", 50)
+    kw.setdefault("max_segments", 10)
+    kw.setdefault("checkpoint_every", 8)
+    return HDStorage(str(path), **kw)
+
+
+def _rewrite(hd, seq, change):
+    """Altera o corpo do registro seq direto no segmento (sem reselar)"""
+    for segment_id in hd.segments:
+        path = hd.segment_path(segment_id)
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+        for i, line in enumerate(lines):
+            entry = json.loads(line)
+            if entry["seq"] == seq:
+                change(entry)
+                lines[i] = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+                with open(path, "w", encoding="utf-8") as f:
+                    f.writelines(lines)
+                return
+    raise AssertionError(f"seq {seq} not found")
+
+
+def test_intact_chain_verifies(tmp_path):
+    hd = _storage(tmp_path)
+    hd.append_many([{"cmd": f"c{i}"} for i in range(40)])
+    result = hd.verify()
+    assert result["ok"] and result["anchored"]
+    assert result["checked"] == 40
+    assert result["blocks"] == 5
+
+
+def test_body_tamper_is_detected(tmp_path):
+    hd = _storage(tmp_path)
+    hd.append_many([{"cmd": f"c{i}"} for i in range(40)])
+    hd.close()
+    _rewrite(hd, 13, lambda e: e.update(cmd="forjado"))
+
+    result = _storage(tmp_path).verify()
+    assert not result["ok"]
+    assert result["first_bad"] == 13
+    assert result["reason"] == "hash mismatch"
+
+
+def test_deleted_record_is_a_gap(tmp_path):
+    hd = _storage(tmp_path)
+    hd.append_many([{"cmd": f"c{i}"} for i in range(20)])
+    hd.close()
+    path = hd.segment_path(hd.segments[-1])
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    del lines[5]
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    result = _storage(tmp_path).verify()
+    assert not result["ok"]
+    assert result["first_bad"] == 6
+    assert result["reason"] == "sequence gap"
+
+
+def test_resealed_tail_fails_checkpoint(tmp_path):
+    """Reescrever um registro e recalcular os hashes seguintes passa na
+    cadeia, mas não na raiz Merkle gravada no checkpoint"""
+    from core.hd_chain import GENESIS, chain_digest, split_line
+
+    hd = _storage(tmp_path)
+    hd.append_many([{"cmd": f"c{i}"} for i in range(16)])
+    hd.close()
+    path = hd.segment_path(hd.segments[-1])
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    prev = GENESIS
+    out = []
+    for line in lines:
+        body, seq, _ = split_line(line)
+        if seq == 3:
+            body = body.replace("c3", "xx")
+        entry = json.loads(body)
+        digest = chain_digest(prev, seq, body)
+        entry.update(seq=seq, hash=digest)
+        out.append(json.dumps(entry, separators=(",", ":")) + "\n")
+        prev = digest
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(out)
+
+    result = _storage(tmp_path).verify()
+    assert not result["ok"]
+    assert result["reason"] == "checkpoint mismatch"
+    assert result["first_bad"] == 0
+
+
+def _rotated(path):
+    # 35 registros, segmentos de 10, retém 2: janela = seqs 20..34;
+    # checkpoints a cada 8 -> 20 não é fim de bloco (âncora vem da rotação)
+    hd = _storage(path, segment_entries=10, max_segments=2)
+    hd.append_many([{"cmd": f"c{i}"} for i in range(35)])
+    hd.close()
+    return hd
+
+
+def test_rotated_window_is_anchored(tmp_path):
+    hd = _rotated(tmp_path)
+    assert hd.chain.state["anchor"]["seq"] == 20
+    result = _storage(tmp_path, segment_entries=10, max_segments=2).verify()
+    assert result["ok"] and result["anchored"]
+    assert result["checked"] == 15 and result["unverified"] == 0
+    # 20..23 ficam fora de um bloco Merkle retido inteiro; 32..34 ainda sem checkpoint
+    assert result["blocks"] == 1 and result["unsealed"] == 7
+
+
+def test_first_retained_record_tamper_is_detected(tmp_path):
+    hd = _rotated(tmp_path)
+    _rewrite(hd, 20, lambda e: e.update(cmd="forjado"))
+    result = _storage(tmp_path, segment_entries=10, max_segments=2).verify()
+    assert not result["ok"]
+    assert result["first_bad"] == 20 and result["reason"] == "hash mismatch"
+
+
+def test_unanchored_first_record_is_reported_unverified(tmp_path):
+    hd = _rotated(tmp_path)
+    del hd.meta["chain"]["anchor"]  # HD gravado antes da âncora existir
+    hd._save_meta()
+    _rewrite(hd, 20, lambda e: e.update(cmd="forjado"))
+    result = _storage(tmp_path, segment_entries=10, max_segments=2).verify()
+    assert not result["anchored"]
+    assert result["unverified"] == 1
+    assert result["checked"] == 14
+
+
+def _truncate(hd, count):
+    """Apaga as últimas `count` linhas do segmento atual"""
+    path = hd.segment_path(hd.segments[-1])
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines[:-count])
+
+
+def test_truncated_unsealed_tail_is_detected(tmp_path):
+    # 200 registros, checkpoint a cada 128: o corte cai na cauda sem bloco
+    hd = _storage(tmp_path, segment_entries=500, checkpoint_every=128)
+    hd.append_many([{"cmd": f"c{i}"} for i in range(200)])
+    hd.close()
+    _truncate(hd, 30)
+
+    result = _storage(tmp_path, segment_entries=500, checkpoint_every=128).verify()
+    assert not result["ok"]
+    assert result["reason"] == "truncated tail"
+    assert result["first_bad"] == 170
+
+
+def test_truncation_inside_a_block_is_detected(tmp_path):
+    # 40 registros, blocos de 8: cortar 5 deixa o bloco 32..40 aberto
+    hd = _storage(tmp_path)
+    hd.append_many([{"cmd": f"c{i}"} for i in range(40)])
+    hd.close()
+    _truncate(hd, 5)
+
+    result = _storage(tmp_path).verify()
+    assert not result["ok"]
+    assert result["reason"] == "truncated block"
+    assert result["first_bad"] == 32
+
+
+def test_resealed_unsealed_tail_fails_head(tmp_path):
+    """Reescrever e reselar a cauda sem checkpoint passa na cadeia, mas o
+    último hash não bate com state["head"]"""
+    from core.hd_chain import chain_digest, split_line
+
+    hd = _storage(tmp_path)
+    hd.append_many([{"cmd": f"c{i}"} for i in range(20)])
+    hd.close()
+    path = hd.segment_path(hd.segments[-1])
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    prev = split_line(lines[15])[2]
+    for i in range(16, 20):
+        body, seq, _ = split_line(lines[i])
+        body = body.replace(f"c{seq}", "xx")
+        digest = chain_digest(prev, seq, body)
+        entry = json.loads(body)
+        entry.update(seq=seq, hash=digest)
+        lines[i] = json.dumps(entry, separators=(",", ":")) + "\n"
+        prev = digest
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    result = _storage(tmp_path).verify()
+    assert not result["ok"]
+    assert result["reason"] == "head mismatch"
+    assert result["first_bad"] == 16
@@ -0,0 +1,43 @@
+import random
+import threading
+import time
+
+from core.darvis_core import DarvisAssistant
+from core.sim_clock import VirtualClock
+
+
+def test_writes_never_wait_for_the_hd_to_open(workdir, monkeypatch):
+    release = threading.Event()
+    original = DarvisAssistant.hd_init
+
+    def slow_init(self):
+        release.wait(5)
+        original(self)
+
+    monkeypatch.setattr(DarvisAssistant, "hd_init", slow_init)
+    darvis = DarvisAssistant(headless=True, ignore_cooldown=True,
+                             clock=VirtualClock(), rng=random.Random(1))
+    try:
+        started = time.perf_counter()
+        for i in range(3):
+            darvis.hd_write({"type": "note", "n": i})
+        darvis.hd_write({"type": "error", "error": "boom"})
+        # status não espera a thread hd-init: erros vêm do sidecar + fila
+        assert darvis.processar_comando("status").endswith("Errors (total): 1 (HD loading)")
+        assert time.perf_counter() - started < 0.1
+        assert darvis._hd_writer is None and len(darvis._hd_pending) == 5
+
+        release.set()
+        assert darvis.hd_index.count(type="note") == 3
+    finally:
+        release.set()
+        darvis.hd_close()
+
+    notes = [e["n"] for e in darvis._hd.iter_entries() if e.get("type") == "note"]
+    assert notes == [0, 1, 2]
+
+
+def test_hd_opens_in_background_at_boot(darvis):
+    assert darvis._hd_thread is not None
+    assert darvis._hd_ready.wait(5)
+    assert darvis._hd_writer is not None
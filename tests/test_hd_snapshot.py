@@ -0,0 +1,54 @@
+import json
+
+from core.hd_snapshot import HDSnapshot, build_snapshot, open_snapshot, snapshot_is_fresh
+
+ROWS = [
+    {"A": 1, "B": 2, "ACTION": "ADD", "note": None},
+    {"A": 1.5, "B": 3},
+    {"A": 2, "tag": "x", "extra": {"k": [1, 2]}},
+    {"A": None, "tag": None, "flag": True},
+    {"tag": 7, "big": 2 ** 60},
+    {"big": 0.5, "huge": 2 ** 70, "text": "olá"},
+    {},
+]
+
+
+def _write(tmp_path, memory, logs=()):
+    path = tmp_path / "hd.json"
+    path.write_text(json.dumps({"version": "1", "memory": memory, "logs": list(logs)}))
+    return str(path), str(tmp_path / "hd.snap")
+
+
+def test_rows_round_trip_exactly(tmp_path):
+    source, snap = _write(tmp_path, ROWS, logs=[{"time": 1.0, "A": 3}])
+    snapshot = open_snapshot(source, snap)
+    rows = list(snapshot.iter_rows("memory"))
+    assert rows == ROWS
+    # Tipos também: 1 volta como int, não 1.0; null fica, ausente não aparece
+    assert [type(r.get("A")) for r in rows] == [int, float, int, type(None)] + [type(None)] * 3
+    assert "note" in rows[0] and rows[0]["note"] is None
+    assert "A" not in rows[4]
+    assert rows[4]["big"] == 2 ** 60 and isinstance(rows[4]["big"], int)
+    assert list(snapshot.iter_rows("logs")) == [{"time": 1.0, "A": 3}]
+    snapshot.close()
+
+
+def test_mixed_column_keeps_numeric_kind(tmp_path):
+    source, snap = _write(tmp_path, [{"A": 1}, {"A": 2.5}, {"B": 0}, {"A": 3}])
+    build_snapshot(source, snap)
+    snapshot = HDSnapshot(snap)
+    assert snapshot.column_info("memory", "A")["kind"] == "float"
+    assert list(snapshot.int_mask("memory", "A")) == [1, 0, 0, 1]
+    assert [r.get("A") for r in snapshot.iter_rows("memory")] == [1, 2.5, None, 3]
+    snapshot.close()
+
+
+def test_snapshot_from_older_format_is_rebuilt(tmp_path):
+    source, snap = _write(tmp_path, [{"A": 1}])
+    build_snapshot(source, snap)
+    assert snapshot_is_fresh(source, snap)
+    with open(snap, "r+b") as f:
+        data = f.read()
+        f.seek(0)
+        f.write(data.replace(b'"format": 2', b'"format": 1'))
+    assert not snapshot_is_fresh(source, snap)
@@ -0,0 +1,163 @@
+import json
+import os
+
+import pytest
+
+from core.hd_storage import HDStorage
+
+
+def _entries(n, start=0):
+    return [{"cmd": f"status {i}", "n": i} for i in range(start, start + n)]
+
+
+def test_round_trip_survives_reopen(tmp_path):
+    hd = HDStorage(str(tmp_path), version="t")
+    hd.append_many(_entries(5))
+    hd.append({"dream": "voar"})
+    hd.append({"error": "falhou"})
+    hd.close()
+
+    reopened = HDStorage(str(tmp_path), version="t")
+    rows = list(reopened.iter_entries())
+    assert [r["seq"] for r in rows] == list(range(7))
+    assert rows[0]["cmd"] == "status 0" and rows[4]["n"] == 4
+    assert rows[5]["dream"] == "voar"
+    assert all(len(r["hash"]) == 64 for r in rows)
+    assert reopened.stats == {"total_commands": 5, "total_dreams": 1, "total_errors": 1}
+    assert reopened.meta["total_entries"] == 7
+    assert reopened.chain.state["next_seq"] == 7
+
+
+def test_unsynced_tail_is_recovered(tmp_path):
+    hd = HDStorage(str(tmp_path), fsync_every=1000, fsync_interval=1e9)
+    hd.append_many(_entries(3))
+    hd.sync()
+    hd.append_many(_entries(2, 3))
+    hd._file.close()  # queda: sidecar ficou em next_seq=3
+
+    reopened = HDStorage(str(tmp_path))
+    assert reopened.chain.state["next_seq"] == 5
+    reopened.append({"cmd": "depois"})
+    assert [r["seq"] for r in reopened.iter_entries()] == list(range(6))
+    assert reopened.verify()["ok"]
+
+
+def test_rotation_keeps_last_segments(tmp_path):
+    hd = HDStorage(str(tmp_path), segment_entries=10, max_segments=2, checkpoint_every=4)
+    hd.append_many(_entries(35))
+    hd.close()
+
+    names = sorted(n for n in os.listdir(tmp_path) if n.startswith("seg-"))
+    assert names == ["seg-000003.jsonl", "seg-000004.jsonl"]
+    seqs = [r["seq"] for r in HDStorage(str(tmp_path), segment_entries=10,
+                                        max_segments=2).iter_entries()]
+    assert seqs == list(range(20, 35))
+    assert hd.meta["total_entries"] == 35
+    assert all(c["end"] >= 20 for c in hd.chain.checkpoints)
+
+
+def test_iter_lines_selects_seq_range(tmp_path):
+    hd = HDStorage(str(tmp_path), segment_entries=4, max_segments=10)
+    hd.append_many(_entries(18))
+    lines = list(hd.iter_lines(6, 11))
+    assert [json.loads(line)["seq"] for line in lines] == [6, 7, 8, 9, 10]
+
+
+def _legacy(tmp_path, n):
+    path = tmp_path / "hd_virtual.json"
+    path.write_text(json.dumps({
+        "created": "2024-01-01T00:00:00",
+        "stats": {"total_commands": n, "total_dreams": 0, "total_errors": 0},
+        "logs": [{"cmd": f"legado {i}", "n": i} for i in range(n)]
+    }))
+    return str(path)
+
+
+def test_migration_runs_once(tmp_path):
+    from core.hd_storage import migrate_legacy_hd
+
+    legacy = _legacy(tmp_path, 30)
+    hd = HDStorage(str(tmp_path / "hd"))
+    assert migrate_legacy_hd(legacy, hd) == 30
+    assert migrate_legacy_hd(legacy, hd) == 0
+    assert hd.meta["migrated_from"] == "hd_virtual.json"
+    assert "migrating" not in hd.meta
+    assert hd.meta["created"] == "2024-01-01T00:00:00"
+
+
+def test_migration_resumes_after_crash(tmp_path, monkeypatch):
+    from core.hd_storage import migrate_legacy_hd
+
+    legacy = _legacy(tmp_path, 50)
+    hd = HDStorage(str(tmp_path / "hd"), fsync_every=8)
+    real = HDStorage.append_many
+
+    def crash_midway(self, entries):
+        def until_crash():
+            for i, entry in enumerate(entries):
+                if i == 21:
+                    raise KeyboardInterrupt("queda")
+                yield entry
+        real(self, until_crash())
+
+    monkeypatch.setattr(HDStorage, "append_many", crash_midway)
+    with pytest.raises(KeyboardInterrupt):
+        migrate_legacy_hd(legacy, hd)
+    hd._file.flush()  # o que o SO já tinha recebido
+    hd._file.close()
+    monkeypatch.setattr(HDStorage, "append_many", real)
+
+    reopened = HDStorage(str(tmp_path / "hd"), fsync_every=8)
+    assert reopened.meta["migrated_from"] is None
+    assert migrate_legacy_hd(legacy, reopened) == 50
+    ns = [e["n"] for e in reopened.iter_entries()]
+    assert ns == list(range(50))
+    assert reopened.meta["total_entries"] == 50
+    assert reopened.verify()["ok"]
+
+
+def test_len_counts_real_segment_sizes(tmp_path):
+    from core.hd_storage import migrate_legacy_hd
+
+    hd = HDStorage(str(tmp_path / "hd"), segment_entries=10, max_segments=3)
+    hd.append_many(_entries(4))
+    hd._rotate()  # segmento fechado com 4 (ex.: migração retomada)
+    hd.append_many(_entries(13, start=4))
+    assert len(hd) == 17 == len(list(hd.iter_entries()))
+    hd.close()
+
+    reopened = HDStorage(str(tmp_path / "hd"), segment_entries=10, max_segments=3)
+    assert len(reopened) == 17
+    reopened.append_many(_entries(20, start=17))  # rotação descarta o de 4
+    assert len(reopened) == len(list(reopened.iter_entries()))
+
+    legacy = _legacy(tmp_path, 25)
+    fresh = HDStorage(str(tmp_path / "m"), segment_entries=10, max_segments=5)
+    migrate_legacy_hd(legacy, fresh)
+    assert len(fresh) == 25
+
+
+def test_migration_merges_legacy_stats(tmp_path):
+    from core.hd_storage import migrate_legacy_hd
+
+    hd = HDStorage(str(tmp_path / "hd"))
+    hd.append_many([{"cmd": "antes"}, {"error": "antes"}])
+    # Cabeçalho antigo: 100 comandos ao longo da vida, só 30 logs retidos
+    path = tmp_path / "hd_virtual.json"
+    path.write_text(json.dumps({
+        "stats": {"total_commands": 100, "total_errors": 0},
+        "logs": [{"cmd": f"legado {i}"} for i in range(30)] + [{"dream": "d"}]
+    }))
+    migrate_legacy_hd(str(path), hd)
+    assert hd.stats == {"total_commands": 101, "total_dreams": 1, "total_errors": 1}
+
+
+def test_migration_without_legacy_stats_keeps_counts(tmp_path):
+    from core.hd_storage import migrate_legacy_hd
+
+    hd = HDStorage(str(tmp_path / "hd"))
+    hd.append({"cmd": "antes"})
+    path = tmp_path / "hd_virtual.json"  # como o arquivo do repo: só memory/logs
+    path.write_text(json.dumps({"memory": [], "logs": [{"cmd": "a"}, {"error": "b"}]}))
+    migrate_legacy_hd(str(path), hd)
+    assert hd.stats == {"total_commands": 2, "total_dreams": 0, "total_errors": 1}
@@ -0,0 +1,44 @@
+import json
+
+import numpy as np
+
+from core.hd_snapshot import open_snapshot
+from core.hd_trace import OP_ADD, OP_SET, OP_SUB, OpTrace
+
+
+def _trace(tmp_path, memory):
+    path = tmp_path / "hd.json"
+    path.write_text(json.dumps({"memory": memory, "logs": []}))
+    snapshot = open_snapshot(str(path), str(tmp_path / "hd.snap"))
+    return OpTrace.from_snapshot(snapshot)
+
+
+def test_replay_segments_on_set():
+    trace = OpTrace([OP_ADD, OP_ADD, OP_SET, OP_SUB], [2, 3, 10, 4])
+    assert trace.replay().tolist() == [2, 5, 10, 6]
+
+
+def test_inferred_rows_are_not_counted_as_verified(tmp_path):
+    trace = _trace(tmp_path, [
+        {"A": 5, "B": 5, "ACTION": "ADD"},
+        {"A": 7, "B": 2},  # sem ACTION: ADD deduzido do próprio A
+        {"A": 4, "B": 3, "ACTION": "SUB"},
+        {"A": 9, "B": 9},  # sem ACTION e sem relação com B: SET deduzido
+    ])
+    assert trace.op.tolist() == [OP_ADD, OP_ADD, OP_SUB, OP_SET]
+    check = trace.verify()
+    assert check == {"ok": True, "verified": 2, "inferred": 2, "mismatches": 0,
+                     "first_bad": None}
+
+
+def test_labelled_mismatch_is_reported(tmp_path):
+    trace = _trace(tmp_path, [
+        {"A": 5, "B": 5, "ACTION": "ADD"},
+        {"A": 7, "B": 2},
+        {"A": 100, "B": 1, "ACTION": "ADD"},  # 7 + 1 != 100
+    ])
+    check = trace.verify()
+    assert not check["ok"]
+    assert check["verified"] == 2 and check["inferred"] == 1
+    assert check["mismatches"] == 1 and check["first_bad"] == 2
+    assert np.array_equal(trace.replay(), [5, 7, 8])
@@ -0,0 +1,59 @@
+import threading
+
+from core.hd_storage import HDStorage
+from core.hd_writer import HDWriter
+
+
+def _stalled_writer(tmp_path, release):
+    """Writer cujo worker fica preso no primeiro lote até `release`"""
+    hd = HDStorage(str(tmp_path))
+    original = hd.append_many
+
+    def append_many(entries):
+        if threading.current_thread().name == "hd-writer":
+            release.wait(5)
+        original(entries)
+
+    hd.append_many = append_many
+    return hd, HDWriter(hd, max_queue=1)
+
+
+def test_full_queue_falls_back_to_a_synchronous_write(tmp_path):
+    release = threading.Event()
+    hd, writer = _stalled_writer(tmp_path, release)
+    try:
+        writer.submit({"n": 0})
+        while writer.depth:  # worker pegou a primeira e travou
+            pass
+        writer.submit({"n": 1})  # ocupa a fila
+        result = []
+        caller = threading.Thread(target=lambda: result.append(writer.submit({"n": 2})))
+        caller.start()
+        release.set()
+        caller.join(5)
+    finally:
+        release.set()
+        writer.close()
+
+    assert result == [True]
+    metrics = writer.snapshot()
+    assert metrics["sync_writes"] == 1 and metrics["dropped"] == 0
+    assert metrics["written"] == 3
+    assert sorted(e["n"] for e in HDStorage(str(tmp_path)).iter_entries()) == [0, 1, 2]
+
+
+def test_submit_after_close_is_counted_as_dropped(tmp_path):
+    writer = HDWriter(HDStorage(str(tmp_path)))
+    writer.close()
+    assert not writer.submit({"n": 0})
+    assert writer.snapshot()["dropped"] == 1
+
+
+def test_shutdown_is_idempotent_and_drains(darvis):
+    darvis.hd_write({"type": "note"})
+    darvis.shutdown()
+    darvis.shutdown()  # fim de run() depois de 'desligar'
+    assert not darvis.running
+    entries = list(HDStorage(darvis._hd.directory).iter_entries())
+    assert [e["type"] for e in entries if e.get("type") in ("note", "shutdown")] == \
+        ["note", "shutdown"]
@@ -0,0 +1,53 @@
+import json
+import os
+
+from core.knowledge import KnowledgeBase
+
+
+def _kb(workdir):
+    return KnowledgeBase(str(workdir), str(workdir / "knowledge_index.json"))
+
+
+def _touch(path, text):
+    path.write_text(text, encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_index_answers_subject_questions(workdir):
+    kb = _kb(workdir)
+    assert not kb.from_cache
+    assert "Física" in kb.areas()
+    best = kb.search("relatividde")[0]  # erro de digitação corrigido
+    assert "relatividade" in best["name"].lower()
+
+
+def test_cache_survives_config_and_other_json_writes(workdir):
+    _kb(workdir)
+    # Reescritos a cada execução: não são matérias
+    _touch(workdir / "darvis_config.json", json.dumps({"volume": 0.5}))
+    _touch(workdir / "permissoes.json", json.dumps({"voice": True}))
+    assert _kb(workdir).from_cache
+    _touch(workdir / "darvis_config.json", json.dumps({"volume": 0.7}))
+    assert _kb(workdir).from_cache
+
+
+def test_cache_rebuilds_when_a_subject_changes_or_appears(workdir):
+    _kb(workdir)
+    data = json.loads((workdir / "quimica.json").read_text(encoding="utf-8"))
+    data["topicos"].append({"nome": "Radioquímica", "conteudos": ["Decaimento alfa"]})
+    _touch(workdir / "quimica.json", json.dumps(data, ensure_ascii=False))
+    kb = _kb(workdir)
+    assert not kb.from_cache
+    assert kb.search("decaimento alfa")[0]["name"] == "Decaimento alfa"
+
+    assert _kb(workdir).from_cache
+    _touch(workdir / "astronomia.json", json.dumps(
+        {"area": "Astronomia", "topicos": [{"nome": "Galáxias", "conteudos": ["Via Láctea"]}]},
+        ensure_ascii=False))
+    kb = _kb(workdir)
+    assert not kb.from_cache and "Astronomia" in kb.areas()
+
+    (workdir / "astronomia.json").unlink()
+    kb = _kb(workdir)
+    assert not kb.from_cache and "Astronomia" not in kb.areas()
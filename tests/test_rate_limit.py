@@ -0,0 +1,36 @@
+import pytest
+
+from core.rate_limit import TokenBucket
+
+
+def test_burst_then_refill():
+    bucket = TokenBucket(rate=2.0, burst=3, now=0.0)
+    assert [bucket.allow(0.0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.retry_after(0.0) == pytest.approx(0.5)
+    assert not bucket.allow(0.4)
+    assert bucket.allow(0.5)
+    assert not bucket.allow(0.5)
+
+
+def test_tokens_never_exceed_burst():
+    bucket = TokenBucket(rate=10.0, burst=2, now=0.0)
+    assert bucket.retry_after(100.0) == 0.0
+    assert bucket.tokens == 2
+    assert bucket.allow(100.0) and bucket.allow(100.0)
+    assert not bucket.allow(100.0)
+
+
+def test_legacy_cooldown_equivalent():
+    bucket = TokenBucket(rate=1 / 0.6, burst=1, now=0.0)
+    assert bucket.allow(0.0)
+    assert not bucket.allow(0.3)
+    assert bucket.allow(0.6)
+
+
+def test_zero_rate_and_injected_clock():
+    now = [0.0]
+    bucket = TokenBucket(rate=0.0, burst=1, clock=lambda: now[0])
+    assert bucket.allow()
+    now[0] = 1e6
+    assert not bucket.allow()
+    assert bucket.retry_after() == float("inf")
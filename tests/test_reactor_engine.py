@@ -0,0 +1,57 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from energy.arc_reactor_sim import ArcReactorSim  # noqa: E402
+from energy.reactor_engine import ReactorBank  # noqa: E402
+
+
+def test_discrete_steps_match_arc_reactor_sim():
+    bank, sim = ReactorBank(3), ArcReactorSim()
+    for op in ("accelerate_particles", "accelerate_particles", "decelerate_particles"):
+        getattr(bank, op)(idx=[1])
+        getattr(sim, op)()
+    assert bank.status(1) == sim.status()
+    assert bank.status(0) == {"Energia Gerada": 100.0, "Estabilidade": 1.0}
+
+
+def test_idle_relaxation_matches_closed_form():
+    # u = 0, abaixo do nominal: exponenciais puras em direção a (100, 1)
+    bank = ReactorBank(2, output=140.0, stability=0.6)
+    bank.simulate(60, dt=0.5)
+    p = bank.params
+    assert bank.output == pytest.approx(100 + 40 * math.exp(-p.leak * 30), rel=1e-8)
+    assert bank.stability == pytest.approx(1 - 0.4 * math.exp(-p.recovery * 30), rel=1e-8)
+    assert not bank.tripped.any()
+
+
+def test_full_throttle_trips_and_scrams():
+    bank = ReactorBank(4)
+    events = bank.simulate(200, dt=1.0, control=[1.0, 1.0, 0.0, -1.0])
+    assert {i for _, i, _ in events} == {0, 1}
+    assert bank.tripped.tolist() == [True, True, False, False]
+    at = bank.trip_time[0]
+    assert 0 < at < 200 and bank.trip_time[1] == at
+    # Desarmado: potência decai com scram_tau (sem voltar a subir)
+    assert bank.output[0] < 1e-6
+    bank.reset([0])
+    assert not bank.tripped[0] and math.isnan(bank.trip_time[0])
+
+
+def test_adaptive_agrees_with_fixed_step_and_chunks_output():
+    # Controle constante: o passo adaptivo cresce sem atravessar degraus
+    fixed, adaptive = ReactorBank(2), ReactorBank(2)
+    grid = np.concatenate([c["t"] for c in fixed.run(120, dt=0.05, control=[0.3, -0.2],
+                                                    record_every=10)])
+    chunks = list(adaptive.run(120, dt=1.0, method="adaptive", control=[0.3, -0.2],
+                               record_every=10, chunk_size=5, rtol=1e-7, atol=1e-9))
+    assert adaptive.state == pytest.approx(fixed.state, rel=1e-5)
+    assert adaptive.steps < fixed.steps
+    assert grid == pytest.approx(np.arange(0, 121, 10))
+    # Adaptivo amostra no primeiro passo depois de cada marca de 10 s
+    assert [len(c["t"]) for c in chunks] == [5, 5, 3]
+    times = np.concatenate([c["t"] for c in chunks])
+    assert (times[1:-1] >= np.arange(10, 120, 10) - 1e-9).all()
+    assert times[-1] == pytest.approx(120.0)
@@ -0,0 +1,89 @@
+import pytest
+
+from core.scheduler import MAX_BURST, Scheduler
+from core.sim_clock import VirtualClock, fast_forward
+
+
+def _scheduler():
+    clock = VirtualClock(start=0.0)
+    return Scheduler(clock=clock.monotonic, timer=clock.perf_counter), clock
+
+
+def _recorder(clock, log):
+    def task():
+        log.append(clock.now)
+    return task
+
+
+def test_every_runs_on_its_grid():
+    sched, clock = _scheduler()
+    log = []
+    sched.every(10, _recorder(clock, log), name="t")
+    assert fast_forward(sched, clock, 35) == 3
+    assert log == [10, 20, 30]
+    assert sched.next_deadline() == 40
+
+
+@pytest.mark.parametrize("policy, runs, missed, next_due", [
+    ("skip", 1, 4, 60.0),
+    ("burst", 5, 0, 60.0),
+    ("delay", 1, 0, 65.0),
+])
+def test_catch_up_policies(policy, runs, missed, next_due):
+    sched, clock = _scheduler()
+    log = []
+    task = sched.every(10, _recorder(clock, log), name="t", catch_up=policy)
+    clock.advance_to(55)  # processo parado: perdeu 10, 20, 30, 40 e 50
+    assert sched.run_pending() == runs
+    assert task.missed == missed
+    assert sched.next_deadline() == next_due
+
+
+def test_burst_is_capped():
+    sched, clock = _scheduler()
+    task = sched.every(1, lambda: None, name="t", catch_up="burst")
+    clock.advance_to(1000)
+    assert sched.run_pending() == MAX_BURST + 1
+    assert task.missed > 0
+    assert sched.next_deadline() > 1000
+
+
+def test_after_cancel_and_reschedule():
+    sched, clock = _scheduler()
+    log = []
+    once = sched.after(5, _recorder(clock, log), name="once")
+    dropped = sched.after(3, lambda: log.append("x"), name="dropped")
+    dropped.cancel()
+    fast_forward(sched, clock, 10)
+    assert log == [5]
+    assert len(sched) == 0
+    sched.reschedule(once, 2)
+    fast_forward(sched, clock, 20)
+    assert log == [5, 12]
+    assert sched.stats()["once"]["runs"] == 2
+
+
+def test_errors_are_counted_not_raised():
+    sched, clock = _scheduler()
+
+    def boom():
+        raise RuntimeError("falha")
+
+    sched.every(1, boom, name="boom")
+    fast_forward(sched, clock, 3)
+    stats = sched.stats()["boom"]
+    assert stats["runs"] == 3 and stats["errors"] == 3
+    assert "falha" in stats["last_error"]
+
+
+def test_jitter_is_seeded():
+    import random
+
+    def deadlines(seed):
+        clock = VirtualClock(start=0.0)
+        sched = Scheduler(clock=clock.monotonic, rng=random.Random(seed))
+        sched.every(60, lambda: None, jitter=5.0)
+        return sched.next_deadline()
+
+    assert deadlines(1) == deadlines(1)
+    assert 60 <= deadlines(1) <= 65
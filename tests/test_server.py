@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+
+from core.server import DarvisServer
+
+
+@pytest.fixture
+def host(darvis):
+    darvis.ignore_cooldown = False  # sessões herdam: token bucket ativo
+    return darvis
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+
+    @classmethod
+    async def connect(cls, port):
+        client = cls(*await asyncio.open_connection("127.0.0.1", port))
+        client.hello = await client.recv()
+        return client
+
+    async def recv(self):
+        return json.loads(await self.reader.readline())
+
+    async def send(self, **request):
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        return await self.recv()
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def run_server(host, scenario):
+    async def main():
+        server = DarvisServer(host)
+        listener = await server.start_tcp("127.0.0.1", 0)
+        try:
+            return await scenario(server, listener.sockets[0].getsockname()[1])
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+async def _settle(server, count):
+    """Espera o servidor processar as desconexões"""
+    for _ in range(100):
+        if server.connections == count:
+            return
+        await asyncio.sleep(0.01)
+
+
+def test_sessions_are_isolated(host):
+    async def scenario(server, port):
+        a, b = await Client.connect(port), await Client.connect(port)
+        sa, sb = a.hello["session"], b.hello["session"]
+        assert sa != sb
+
+        # b não comanda nem fecha a sessão de a
+        reply = await b.send(session=sa, cmd="light on")
+        assert reply["error"] == "session not owned"
+        reply = await b.send(session=sa, op="close")
+        assert reply["error"] == "session not owned"
+        assert sa in server.sessions
+
+        await a.send(cmd="light on")
+        assert server.sessions[sa].luz_quarto["ligada"]
+        assert not server.sessions[sb].luz_quarto["ligada"]
+
+        # Sessão nomeada pertence a quem a criou
+        assert "error" not in await a.send(session="extra", cmd="status")
+        reply = await b.send(session="extra", cmd="status")
+        assert reply["error"] == "session not owned"
+        await a.close()
+        await b.close()
+
+    run_server(host, scenario)
+
+
+def test_disconnect_closes_every_owned_session(host):
+    async def scenario(server, port):
+        a = await Client.connect(port)
+        for name in ("n1", "n2"):
+            assert (await a.send(session=name, cmd="status"))["session"] == name
+        assert {a.hello["session"], "n1", "n2"} <= set(server.sessions)
+        await a.close()
+        await _settle(server, 0)
+        assert server.sessions == {}
+
+        # Nome liberado pode ser usado por outra conexão
+        b = await Client.connect(port)
+        assert (await b.send(session="n1", cmd="status"))["session"] == "n1"
+        await b.close()
+
+    run_server(host, scenario)
+
+
+def test_rate_limit_is_per_session(host):
+    burst = host.config["rate_limit_burst"]
+
+    async def scenario(server, port):
+        a, b = await Client.connect(port), await Client.connect(port)
+        replies = [await a.send(cmd="status") for _ in range(burst + 1)]
+        assert [r["rejected"] for r in replies] == [False] * burst + [True]
+        assert replies[-1]["retry_after"] > 0
+        # O limite de a não consome as fichas de b
+        assert not (await b.send(cmd="status"))["rejected"]
+        assert server.rejected == 1
+        await a.close()
+        await b.close()
+
+    run_server(host, scenario)
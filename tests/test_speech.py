@@ -0,0 +1,143 @@
+import sys
+import threading
+import types
+
+
+class FakeEngine:
+    """Motor pyttsx3 de mentira: registra o que foi falado"""
+
+    def __init__(self):
+        self.props = {"voice": "pt", "voices": []}
+        self.spoken = []
+        self.done = threading.Event()
+
+    def setProperty(self, name, value):
+        self.props[name] = value
+
+    def getProperty(self, name):
+        return self.props.get(name)
+
+    def say(self, text):
+        self.spoken.append(text)
+
+    def runAndWait(self):
+        self.done.set()
+
+    def stop(self):
+        pass
+
+
+def test_voice_init_runs_off_the_caller_thread(darvis, monkeypatch):
+    engine = FakeEngine()
+    release = threading.Event()
+
+    def init(driverName=None):
+        release.wait(5)  # sondagem lenta do espeak
+        return engine
+
+    monkeypatch.setitem(sys.modules, "pyttsx3", types.SimpleNamespace(init=init))
+    darvis.config["tts_cache"] = False
+    darvis.permissoes["voice"] = True
+
+    darvis.falar("System online.")  # primeira fala: não espera o motor
+    assert darvis.speech is None and darvis._voz_thread.name == "voice-init"
+    assert [p[0] for p in darvis._voz_pendente] == ["System online."]
+
+    release.set()
+    darvis._voz_thread.join(5)
+    assert engine.done.wait(5)
+    assert engine.spoken == ["System online."]
+    darvis.speech.close()
+
+
+class GatedEngine(FakeEngine):
+    """Cada frase só termina quando o portão abre (ou stop() interrompe)"""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.started = []
+        self.stops = 0
+        self._stop = threading.Event()
+
+    def say(self, text):
+        self.started.append(text)
+
+    def runAndWait(self):
+        while not (self.gate.is_set() or self._stop.wait(0.001)):
+            pass
+        if not self._stop.is_set():
+            self.spoken.append(self.started[-1])
+        self._stop.clear()
+
+    def stop(self):
+        self.stops += 1
+        self._stop.set()
+
+
+def _until(condition, timeout=5.0):
+    import time
+
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timeout"
+        time.sleep(0.001)
+
+
+def _busy_worker(max_queue=8):
+    from core.speech import SpeechWorker
+
+    engine = GatedEngine()
+    worker = SpeechWorker(engine, max_queue=max_queue)
+    worker.say("primeira")
+    _until(lambda: engine.started == ["primeira"])
+    return engine, worker
+
+
+def test_queue_orders_by_priority_and_coalesces():
+    from core.speech import PRIORITY_LOW, PRIORITY_NORMAL
+
+    engine, worker = _busy_worker(max_queue=2)
+    assert worker.say("sonho", PRIORITY_LOW)
+    assert worker.say("resposta", PRIORITY_NORMAL)
+    assert not worker.say("resposta", PRIORITY_NORMAL)  # fundida
+    assert not worker.say("outro sonho", PRIORITY_LOW)  # fila cheia
+    assert not worker.say("primeira")  # já tocando
+
+    engine.gate.set()
+    _until(lambda: len(engine.spoken) == 3)
+    worker.close()
+    assert engine.spoken == ["primeira", "resposta", "sonho"]
+    metrics = worker.snapshot()
+    assert metrics["coalesced"] == 2 and metrics["dropped_full"] == 1
+
+
+def test_urgent_preempts_and_stale_phrases_expire():
+    import time
+
+    from core.speech import PRIORITY_URGENT
+
+    engine, worker = _busy_worker()
+    worker.say("vencida", ttl=0.01)
+    time.sleep(0.02)
+    worker.say("alerta", PRIORITY_URGENT)  # interrompe "primeira"
+    _until(lambda: engine.started[-1] == "alerta")
+    engine.gate.set()
+    _until(lambda: engine.spoken == ["alerta"])
+    worker.close()
+    metrics = worker.snapshot()
+    assert metrics["preempted"] == 1 and engine.stops == 1
+    assert metrics["dropped_expired"] == 1
+
+
+def test_close_speaks_only_urgent():
+    from core.speech import PRIORITY_URGENT
+
+    engine, worker = _busy_worker()
+    worker.say("resposta")
+    worker.say("adeus", PRIORITY_URGENT)
+    _until(lambda: engine.started[-1] == "adeus")
+    engine.gate.set()
+    worker.close()
+    assert engine.spoken == ["adeus"]
+    assert not worker.say("depois")
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from core.text_cache import AlphaSurfacePool, FontCache, TextCache  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    yield pygame.font.Font(None, 16)
+    pygame.font.quit()
+
+
+def test_repeated_text_is_rendered_once(font):
+    cache = TextCache(max_entries=2)
+    first = cache.render(font, "CPU: 12%", (255, 255, 255))
+    assert cache.render(font, "CPU: 12%", [255, 255, 255]) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Cor diferente é outra superfície
+    assert cache.render(font, "CPU: 12%", (255, 0, 0)) is not first
+
+
+def test_least_recently_used_is_evicted(font):
+    cache = TextCache(max_entries=2)
+    a = cache.render(font, "a", (0, 0, 0))
+    cache.render(font, "b", (0, 0, 0))
+    cache.render(font, "a", (0, 0, 0))  # "a" volta a ser recente
+    cache.render(font, "c", (0, 0, 0))  # despeja "b"
+    assert len(cache) == 2
+    assert cache.render(font, "a", (0, 0, 0)) is a
+    misses = cache.misses
+    cache.render(font, "b", (0, 0, 0))
+    assert cache.misses == misses + 1
+
+
+def test_alpha_pool_reuses_and_grows():
+    pygame.display.init()
+    try:
+        pool = AlphaSurfacePool(32, 8)
+        surface, area = pool.filled((20, 8), (0, 0, 0, 128))
+        assert area.size == (20, 8) and surface.get_at((0, 0)) == (0, 0, 0, 128)
+        again, _ = pool.filled((10, 4), (1, 2, 3, 4))
+        assert again is surface
+        bigger, area = pool.filled((64, 8), (0, 0, 0, 0))
+        assert bigger is not surface and bigger.get_size() == (64, 8)
+    finally:
+        pygame.display.quit()
+
+
+def test_font_cache_skips_sysfont_after_first_run(tmp_path, font):
+    path = str(tmp_path / "font_cache.json")
+    fonts = FontCache(path)
+    fonts.get("dejavusans", 14)
+    fonts.get("dejavusans", 20)
+    assert fonts.scans == 1
+    if not fonts.files:
+        pytest.skip("nenhuma fonte do sistema encontrada")
+    reopened = FontCache(path)
+    assert reopened.get("dejavusans", 14) is not None
+    assert reopened.scans == 0
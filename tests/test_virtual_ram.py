@@ -0,0 +1,63 @@
+import pytest
+
+from core.virtual_ram import VirtualRAM, size_class
+
+
+def _ram(policy, max_blocks=3):
+    return VirtualRAM(1024, max_blocks=max_blocks, policy=policy, clock=lambda: 0.0)
+
+
+def test_size_classes_and_exact_accounting():
+    ram = _ram("time", max_blocks=10)
+    assert [size_class(mb) for mb in (0, 1, 3, 24, 64)] == [1, 1, 4, 32, 64]
+    a = ram.allocate(24, "a")
+    ram.allocate(3, "b")
+    assert ram.used_mb == 36 and ram.requested_mb == 27
+    assert ram.fragmentation() == pytest.approx(9 / 36)
+    assert ram.free(a) and not ram.free(a)
+    assert ram.used_mb == 4
+
+
+def test_acquire_reuses_the_live_block():
+    ram = _ram("time", max_blocks=10)
+    first = ram.acquire(24, "command_status", now=1.0)
+    assert ram.acquire(24, "command_status", now=2.0) == first
+    assert len(ram) == 1 and ram.used_mb == 32
+    assert ram.stats()["reuses"] == 1
+    ram.free(first)
+    assert ram.acquire(24, "command_status", now=3.0) != first
+
+
+@pytest.mark.parametrize("policy, survivor, evicted", [
+    ("time", "b", "hot"),
+    ("lru", "hot", "b"),
+])
+def test_policy_decides_who_is_evicted(policy, survivor, evicted):
+    ram = _ram(policy)
+    ram.acquire(8, "hot", now=1.0)
+    ram.allocate(8, "b", now=2.0)
+    ram.allocate(8, "c", now=3.0)
+    ram.acquire(8, "hot", now=4.0)  # reuso: toca o bloco
+    ram.allocate(8, "d", now=5.0)  # cheio: despeja a frente da fila
+    reasons = {block.reason for block in ram.blocks.values()}
+    assert survivor in reasons and evicted not in reasons
+    assert ram.evictions["count"] == 1
+
+
+@pytest.mark.parametrize("policy, left", [("time", []), ("lru", ["hot"])])
+def test_age_eviction_follows_last_access_under_lru(policy, left):
+    ram = _ram(policy, max_blocks=10)
+    ram.acquire(8, "hot", now=0.0)
+    ram.allocate(8, "cold", now=10.0)
+    ram.acquire(8, "hot", now=95.0)
+    ram.evict_older_than(50, now=100.0)
+    assert [block.reason for block in ram.blocks.values()] == left
+
+
+def test_repeated_command_reuses_its_block(darvis):
+    for _ in range(3):
+        darvis.clock.advance(1)
+        darvis.processar_comando("status")
+    blocks = [b for b in darvis.ram.blocks.values() if b.reason == "command_status"]
+    assert len(blocks) == 1
+    assert darvis.ram.reuses >= 2